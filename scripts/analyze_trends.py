@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+키워드 트렌드 분석
+keyword_timeseries → keyword_changes (7일/30일 검색량 변화 + 트렌드 + 알림 레벨)
+
+- 키워드별 반복문 없이 윈도우 함수 한 번으로 전체 키워드 계산
+  (keyword_id 파티션 안에서 record_date 순으로 N일 전 스냅샷 조회)
+- 실행마다 기간별로 마지막 분석 이후 바뀐 record_date부터 다시 계산 (증분)
+  keyword_timeseries 트리거가 INSERT/UPDATE/DELETE된 record_date를 keyword_trend_dirty에
+  버전 번호와 함께 기록 → 기간별로 처리한 버전(keyword_trend_state) 이후 가장 이른 날짜부터 재분석
+  (같은 날짜의 두 번째 엑셀, 이미 분석한 날짜의 값 수정, 그 날짜의 신규 키워드도 반영)
+- INSERT ... SELECT 한 문장으로 일괄 저장
+
+사용법:
+    python3 scripts/analyze_trends.py
+    python3 scripts/analyze_trends.py --period 7
+    python3 scripts/analyze_trends.py --full
+"""
+
+import argparse
+import sqlite3
+import time
+from typing import Optional
+
+from keyword_db import DB_PATH, connect, prepare_for_write
+
+DEFAULT_PERIODS = (7, 30)
+
+# 변화율 기준 (keyword_persona_system_design.md)
+# - 50% 이상 증가: high (긴급 포스팅)
+# - 20~50% 증가: medium (포스팅 고려)
+# - 그 외: low (모니터링)
+ALERT_HIGH_PCT = 50
+ALERT_MEDIUM_PCT = 20
+
+# |변화율|이 이 값 미만이면 stable
+TREND_THRESHOLD_PCT = 20
+
+
+def _analysis_sql(period_days: int) -> str:
+    """
+    기간별 분석 INSERT 문
+
+    기준 스냅샷: 분석일로부터 period_days일 이상 지난 스냅샷 중 가장 최근 것
+    (수집이 빠진 날을 감안해 최대 2 * period_days일 전까지 허용)
+    RANGE 프레임 오프셋은 상수여야 하므로 기간별로 SQL을 만든다.
+    """
+    lookback_days = period_days * 2
+
+    return f"""
+        INSERT INTO keyword_changes
+        (keyword_id, analysis_date, period_days,
+         volume_change_pct, volume_change_abs, trend, alert_level)
+        SELECT keyword_id, record_date, {period_days},
+               change_pct, change_abs,
+               CASE
+                   WHEN change_pct IS NULL THEN
+                       CASE WHEN change_abs > 0 THEN 'increasing' ELSE 'stable' END
+                   WHEN change_pct >= {TREND_THRESHOLD_PCT} THEN 'increasing'
+                   WHEN change_pct <= -{TREND_THRESHOLD_PCT} THEN 'decreasing'
+                   ELSE 'stable'
+               END,
+               CASE
+                   WHEN change_pct >= {ALERT_HIGH_PCT} THEN 'high'
+                   WHEN change_pct >= {ALERT_MEDIUM_PCT} THEN 'medium'
+                   WHEN change_pct IS NULL AND change_abs > 0 THEN 'medium'
+                   ELSE 'low'
+               END
+        FROM (
+            SELECT keyword_id, record_date,
+                   current_volume - base_volume AS change_abs,
+                   CASE WHEN base_volume > 0
+                        THEN ROUND((current_volume - base_volume) * 100.0 / base_volume, 2)
+                   END AS change_pct
+            FROM (
+                SELECT keyword_id, record_date,
+                       search_volume_total AS current_volume,
+                       LAST_VALUE(search_volume_total) OVER (
+                           PARTITION BY keyword_id
+                           ORDER BY julianday(record_date)
+                           RANGE BETWEEN {lookback_days} PRECEDING AND {period_days} PRECEDING
+                       ) AS base_volume
+                FROM keyword_timeseries
+                WHERE :since IS NULL
+                   OR record_date >= date(:since, '-{lookback_days} days')
+            )
+            WHERE (:since IS NULL OR record_date >= :since)
+            AND base_volume IS NOT NULL
+        )
+    """
+
+
+def _mark_dirty(record_date: str) -> str:
+    """트리거 본문: record_date를 새 버전으로 기록"""
+    return f"""
+        INSERT INTO keyword_trend_dirty (record_date, version)
+        VALUES ({record_date}, (SELECT COALESCE(MAX(version), 0) + 1 FROM keyword_trend_dirty))
+        ON CONFLICT(record_date) DO UPDATE SET version = excluded.version;
+    """
+
+
+# 시계열 변경 감지 트리거 (분석에 쓰는 검색량/날짜/키워드가 바뀐 경우만)
+DIRTY_TRIGGERS = {
+    'trg_trend_ts_insert': f"""
+        CREATE TRIGGER IF NOT EXISTS trg_trend_ts_insert
+        AFTER INSERT ON keyword_timeseries
+        BEGIN
+            {_mark_dirty('NEW.record_date')}
+        END
+    """,
+    'trg_trend_ts_update': f"""
+        CREATE TRIGGER IF NOT EXISTS trg_trend_ts_update
+        AFTER UPDATE OF keyword_id, record_date, search_volume_total ON keyword_timeseries
+        WHEN OLD.search_volume_total IS NOT NEW.search_volume_total
+          OR OLD.record_date IS NOT NEW.record_date
+          OR OLD.keyword_id IS NOT NEW.keyword_id
+        BEGIN
+            {_mark_dirty('OLD.record_date')}
+            {_mark_dirty('NEW.record_date')}
+        END
+    """,
+    'trg_trend_ts_delete': f"""
+        CREATE TRIGGER IF NOT EXISTS trg_trend_ts_delete
+        AFTER DELETE ON keyword_timeseries
+        BEGIN
+            {_mark_dirty('OLD.record_date')}
+        END
+    """,
+}
+
+
+def ensure_schema(conn: sqlite3.Connection):
+    """
+    기간별 분석일 조회 인덱스 + 변경 날짜 기록 테이블/트리거
+
+    기록 테이블을 처음 만들 때는 모든 record_date를 변경분으로 채움
+    (처리 버전이 없으므로 첫 실행은 전체 재분석)
+    """
+    with conn:
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_changes_period_date
+            ON keyword_changes(period_days, analysis_date)
+        """)
+        created = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'keyword_trend_dirty'"
+        ).fetchone() is None
+        # 날짜당 한 행 (버전 = 마지막 변경 순번)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS keyword_trend_dirty (
+                record_date DATE PRIMARY KEY,
+                version INTEGER NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_trend_dirty_version
+            ON keyword_trend_dirty(version)
+        """)
+        # 기간별로 분석에 반영한 마지막 버전
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS keyword_trend_state (
+                period_days INTEGER PRIMARY KEY,
+                version INTEGER NOT NULL
+            )
+        """)
+        for ddl in DIRTY_TRIGGERS.values():
+            conn.execute(ddl)
+        if created:
+            conn.execute("""
+                INSERT INTO keyword_trend_dirty (record_date, version)
+                SELECT DISTINCT record_date, 1 FROM keyword_timeseries
+            """)
+
+
+def dirty_since(conn: sqlite3.Connection, period_days: int) -> Optional[str]:
+    """기간별로 마지막 분석 이후 바뀐 가장 이른 record_date (없으면 None)"""
+    row = conn.execute("""
+        SELECT MIN(record_date) FROM keyword_trend_dirty
+        WHERE version > COALESCE(
+            (SELECT version FROM keyword_trend_state WHERE period_days = ?), 0)
+    """, (period_days,)).fetchone()
+    return row[0]
+
+
+def last_analysis_date(conn: sqlite3.Connection, period_days: int) -> Optional[str]:
+    """기간별로 마지막으로 분석한 record_date (없으면 None)"""
+    row = conn.execute(
+        "SELECT MAX(analysis_date) FROM keyword_changes WHERE period_days = ?",
+        (period_days,),
+    ).fetchone()
+    return row[0]
+
+
+def analyze_period(conn: sqlite3.Connection, period_days: int, full: bool = False) -> int:
+    """
+    한 기간의 변화 분석 (한 트랜잭션)
+
+    바뀐 가장 이른 record_date 이후 결과를 지우고 다시 계산한다.
+    (그 날짜가 이후 날짜의 기준 스냅샷이 될 수 있으므로 이후 날짜도 모두 재계산)
+    BEGIN IMMEDIATE: 버전 확인과 저장 사이에 적재가 끼어들지 않도록 쓰기 잠금을 먼저 잡음
+
+    Args:
+        period_days: 비교 기간 (일)
+        full: True면 해당 기간 결과를 지우고 전체 날짜 재분석
+
+    Returns:
+        저장한 행 수
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    with conn:
+        version = conn.execute("SELECT COALESCE(MAX(version), 0) FROM keyword_trend_dirty").fetchone()[0]
+        if full:
+            conn.execute("DELETE FROM keyword_changes WHERE period_days = ?", (period_days,))
+            since = None
+            inserted = conn.execute(_analysis_sql(period_days), {'since': since}).rowcount
+        else:
+            since = dirty_since(conn, period_days)
+            inserted = 0
+            if since is not None:
+                conn.execute(
+                    "DELETE FROM keyword_changes WHERE period_days = ? AND analysis_date >= ?",
+                    (period_days, since),
+                )
+                inserted = conn.execute(_analysis_sql(period_days), {'since': since}).rowcount
+
+        conn.execute(
+            "INSERT OR REPLACE INTO keyword_trend_state (period_days, version) VALUES (?, ?)",
+            (period_days, version),
+        )
+        return inserted
+
+
+def analyze_trends(periods=DEFAULT_PERIODS, full: bool = False):
+    """기간별 트렌드 분석 실행 + 결과 요약"""
+
+    print("=" * 80)
+    print("📈 키워드 트렌드 분석 (keyword_changes)")
+    print("=" * 80)
+
+    prepare_for_write()
+    conn = connect()
+    ensure_schema(conn)
+
+    for period_days in periods:
+        since = None if full else dirty_since(conn, period_days)
+        if full:
+            scope = "전체 날짜"
+        elif since is None:
+            scope = "변경 없음"
+        else:
+            scope = f"{since}부터 record_date 재분석"
+
+        started = time.perf_counter()
+        inserted = analyze_period(conn, period_days, full=full)
+        elapsed = time.perf_counter() - started
+
+        print(f"\n📋 {period_days}일 변화 ({scope})")
+        print(f"   ✅ {inserted:,}개 저장 ({elapsed:.3f}초)")
+
+    # 최신 분석일 기준 요약
+    print("\n" + "=" * 80)
+    print("📊 최신 분석일 트렌드 요약")
+    print("=" * 80)
+
+    for period_days in periods:
+        latest = last_analysis_date(conn, period_days)
+        if latest is None:
+            print(f"\n   {period_days}일: 비교할 이전 스냅샷이 없습니다")
+            continue
+
+        print(f"\n   {period_days}일 변화 ({latest})")
+        rows = conn.execute("""
+            SELECT trend, alert_level, COUNT(*)
+            FROM keyword_changes
+            WHERE period_days = ? AND analysis_date = ?
+            GROUP BY trend, alert_level
+            ORDER BY trend, alert_level
+        """, (period_days, latest)).fetchall()
+        for trend, alert_level, count in rows:
+            print(f"   - {trend:<12} {alert_level:<8} {count:>8,}개")
+
+        rows = conn.execute("""
+            SELECT k.keyword, c.volume_change_abs, c.volume_change_pct
+            FROM keyword_changes c
+            JOIN keywords_master k ON c.keyword_id = k.keyword_id
+            WHERE c.period_days = ? AND c.analysis_date = ?
+            AND c.alert_level = 'high'
+            ORDER BY c.volume_change_abs DESC
+            LIMIT 10
+        """, (period_days, latest)).fetchall()
+        if rows:
+            print(f"\n   🔥 급상승 키워드 (high)")
+            for keyword, change_abs, change_pct in rows:
+                pct = f"{change_pct:+.1f}%" if change_pct is not None else "신규"
+                print(f"      {keyword:<25} {change_abs:>+10,}회  {pct:>9}")
+
+    conn.close()
+
+    print(f"\n💾 DB 위치: {DB_PATH}\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="키워드 트렌드 분석")
+    parser.add_argument("--period", type=int, nargs="+", default=list(DEFAULT_PERIODS),
+                        help="비교 기간(일) 목록")
+    parser.add_argument("--full", action="store_true",
+                        help="기존 분석 결과를 지우고 전체 날짜 재분석")
+    args = parser.parse_args()
+
+    analyze_trends(tuple(args.period), full=args.full)
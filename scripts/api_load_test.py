@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+keyword_api.py 부하 테스트 (p50/p99 응답 시간)
+
+- 동시 요청 --concurrency개로 --requests개를 보냄 (keep-alive 커넥션 재사용)
+- 요청 종류(--mix): context, prompt, recommendations, keywords (세부 페르소나별 목록)
+  키워드 ID는 /recommendations?min_volume=0 결과에서 무작위 선택
+- --revalidate: 한 번 받은 응답의 ETag로 If-None-Match 재검증 (304 비율/시간 확인)
+- --spawn: 같은 프로세스에서 서버를 빈 포트로 띄워 측정 (DB가 있는 PC에서 바로 실행)
+- 결과: 요청 종류별 건수/상태 코드/p50/p90/p99/최대, 처리량 (--json으로 저장)
+
+사용법:
+    python3 scripts/keyword_api.py --port 8700 &
+    python3 scripts/api_load_test.py --url http://127.0.0.1:8700 --requests 2000 --concurrency 32
+    python3 scripts/api_load_test.py --spawn --revalidate --json load_test.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from async_http import AsyncHTTPClient
+
+DEFAULT_URL = 'http://127.0.0.1:8700'
+DEFAULT_REQUESTS = 2000
+DEFAULT_CONCURRENCY = 32
+REQUEST_KINDS = ('context', 'prompt', 'recommendations', 'keywords')
+
+# 키워드 ID 표본 수
+SAMPLE_KEYWORDS = 200
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """백분위 (값이 2개 미만이면 그 값)"""
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method='inclusive')[int(pct) - 1]
+
+
+def build_targets(kinds: List[str], keyword_ids: List[int], sub_persona_ids: List[str],
+                  count: int, seed: int = 0) -> List[tuple]:
+    """(종류, 경로) 목록 - 종류는 순환, 대상은 무작위 (같은 대상 반복 → 캐시 효과 포함)"""
+    rng = random.Random(seed)
+    targets = []
+    for i in range(count):
+        kind = kinds[i % len(kinds)]
+        if kind == 'context':
+            target = f"/keywords/{rng.choice(keyword_ids)}/context"
+        elif kind == 'prompt':
+            target = f"/keywords/{rng.choice(keyword_ids)}/prompt"
+        elif kind == 'recommendations':
+            target = f"/recommendations?limit={rng.choice((5, 10, 20))}"
+        else:
+            target = f"/sub-personas/{rng.choice(sub_persona_ids)}/keywords?limit=10&unposted_first=1"
+        targets.append((kind, target))
+    return targets
+
+
+async def run_load_test(url: str, kinds: List[str], requests: int, concurrency: int,
+                        revalidate: bool = False, seed: int = 0) -> Dict:
+    """부하 테스트 실행 → 결과 요약"""
+    client = AsyncHTTPClient(max_idle_per_host=concurrency)
+    try:
+        status, _, body = await client.request(
+            'GET', f"{url}/recommendations?limit={SAMPLE_KEYWORDS}&min_volume=0")
+        if status != 200:
+            raise RuntimeError(f"키워드 표본 조회 실패: HTTP {status}")
+        keyword_ids = [row['keyword_id'] for row in json.loads(body)['keywords']]
+        _, _, body = await client.request('GET', f"{url}/sub-personas")
+        sub_persona_ids = [row['sub_persona_id'] for row in json.loads(body)['sub_personas']]
+        if not keyword_ids or not sub_persona_ids:
+            raise RuntimeError("키워드/세부 페르소나가 없습니다")
+
+        targets = build_targets(kinds, keyword_ids, sub_persona_ids, requests, seed)
+        latencies: Dict[str, List[float]] = {kind: [] for kind in kinds}
+        statuses: Dict[str, Dict[int, int]] = {kind: {} for kind in kinds}
+        etags: Dict[str, str] = {}
+        position = 0
+
+        async def worker():
+            nonlocal position
+            while position < len(targets):
+                kind, target = targets[position]
+                position += 1
+                headers = {}
+                if revalidate and target in etags:
+                    headers['If-None-Match'] = etags[target]
+
+                started = time.perf_counter()
+                status, response_headers, _ = await client.request('GET', url + target, headers=headers)
+                latencies[kind].append(time.perf_counter() - started)
+                statuses[kind][status] = statuses[kind].get(status, 0) + 1
+                if 'etag' in response_headers:
+                    etags[target] = response_headers['etag']
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        _, _, body = await client.request('GET', f"{url}/stats")
+        server_stats = json.loads(body)
+    finally:
+        await client.close()
+
+    def summary(values: List[float]) -> Dict:
+        return {
+            'count': len(values),
+            'p50_ms': round(percentile(values, 50) * 1000, 3),
+            'p90_ms': round(percentile(values, 90) * 1000, 3),
+            'p99_ms': round(percentile(values, 99) * 1000, 3),
+            'max_ms': round(max(values, default=0.0) * 1000, 3),
+        }
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        'url': url,
+        'requests': requests,
+        'concurrency': concurrency,
+        'revalidate': revalidate,
+        'elapsed_sec': round(elapsed, 3),
+        'rps': round(requests / elapsed, 1) if elapsed else 0.0,
+        'overall': summary(all_latencies),
+        'by_kind': {kind: {**summary(latencies[kind]),
+                           'status': {str(code): n for code, n in sorted(statuses[kind].items())}}
+                    for kind in kinds},
+        'server': server_stats,
+    }
+
+
+def print_report(result: Dict):
+    print(f"\n📊 {result['requests']:,}건 / 동시 {result['concurrency']}개"
+          f"{' / ETag 재검증' if result['revalidate'] else ''}")
+    print(f"   처리 시간: {result['elapsed_sec']:.2f}초 ({result['rps']:,.0f} req/s)")
+    print(f"\n{'종류':<16} {'건수':>7} {'p50(ms)':>9} {'p90(ms)':>9} {'p99(ms)':>9} {'최대(ms)':>9}  상태")
+    print("-" * 80)
+    rows = list(result['by_kind'].items()) + [('전체', result['overall'])]
+    for kind, stats in rows:
+        status = ' '.join(f"{code}×{n:,}" for code, n in stats.get('status', {}).items())
+        print(f"{kind:<16} {stats['count']:>7,} {stats['p50_ms']:>9.2f} {stats['p90_ms']:>9.2f}"
+              f" {stats['p99_ms']:>9.2f} {stats['max_ms']:>9.2f}  {status}")
+
+    server = result['server']
+    print(f"\n🗄️  서버: 캐시 hit {server['hits']:,} / miss {server['misses']:,}"
+          f" / 304 {server['not_modified']:,} / 오류 {server['errors']:,}"
+          f" / DB 세대 {server['generation']}")
+
+
+async def _main(args) -> Dict:
+    kinds = args.mix
+    if not args.spawn:
+        return await run_load_test(args.url.rstrip('/'), kinds, args.requests, args.concurrency,
+                                   args.revalidate, args.seed)
+
+    from keyword_api import KeywordAPIServer
+    server = KeywordAPIServer(readers=args.readers)
+    listener = await server.start('127.0.0.1', 0)
+    port = listener.sockets[0].getsockname()[1]
+    try:
+        return await run_load_test(f"http://127.0.0.1:{port}", kinds, args.requests,
+                                   args.concurrency, args.revalidate, args.seed)
+    finally:
+        await server.shutdown(listener)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="keyword_api.py 부하 테스트")
+    parser.add_argument("--url", default=DEFAULT_URL, help="API 주소")
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS, help="총 요청 수")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="동시 요청 수")
+    parser.add_argument("--mix", nargs="+", choices=REQUEST_KINDS, default=list(REQUEST_KINDS),
+                        help="요청 종류 (순환)")
+    parser.add_argument("--revalidate", action="store_true", help="ETag로 If-None-Match 재검증")
+    parser.add_argument("--spawn", action="store_true", help="서버를 같은 프로세스에서 띄워 측정")
+    parser.add_argument("--readers", type=int, default=4, help="--spawn 서버의 DB 조회 스레드 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=Path, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("⏱️  키워드 API 부하 테스트")
+    print("=" * 80)
+
+    result = asyncio.run(_main(args))
+    print_report(result)
+
+    if args.json:
+        args.json.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"\n💾 결과 저장: {args.json}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
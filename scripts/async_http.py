@@ -0,0 +1,248 @@
+"""
+asyncio 스트림 기반 최소 HTTP/1.1 (표준 라이브러리만 사용)
+
+- AsyncHTTPClient: keep-alive 커넥션 재사용 JSON POST 클라이언트 (http/https)
+- read_request / write_response: 로컬 서버(mock_llm_server.py 등)용 요청 파싱/응답
+  형식이 잘못된 요청은 BadRequest → 서버는 400 응답 후 연결 종료
+
+aiohttp/httpx 없이 동작하도록 필요한 부분만 구현:
+Content-Length 본문, chunked 응답, Connection: close 처리
+"""
+
+import asyncio
+import json
+import ssl
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# 헤더 한 줄 / 헤더 수 / 본문 최대 크기
+MAX_LINE = 64 * 1024
+MAX_HEADERS = 100
+MAX_BODY = 64 * 1024 * 1024
+
+STATUS_TEXT = {
+    200: 'OK', 204: 'No Content', 304: 'Not Modified', 400: 'Bad Request',
+    404: 'Not Found', 405: 'Method Not Allowed', 429: 'Too Many Requests',
+    500: 'Internal Server Error', 503: 'Service Unavailable',
+}
+
+
+class HTTPError(Exception):
+    """응답 형식 오류 또는 연결 중단"""
+
+
+class ConnectionClosed(HTTPError):
+    """메시지를 시작하기 전에 상대가 연결을 닫음"""
+
+
+class BadRequest(HTTPError):
+    """서버가 받은 요청의 형식 오류 (400)"""
+
+
+async def _readline(reader: asyncio.StreamReader) -> bytes:
+    """한 줄 읽기 (스트림 버퍼 한도를 넘는 줄은 HTTPError)"""
+    try:
+        line = await reader.readline()
+    except ValueError:
+        raise HTTPError("줄이 너무 깁니다")
+    if len(line) > MAX_LINE:
+        raise HTTPError("줄이 너무 깁니다")
+    return line
+
+
+async def _read_headers(reader: asyncio.StreamReader) -> Tuple[str, Dict[str, str]]:
+    """시작 줄 + 헤더 (헤더 이름은 소문자)"""
+    start = await _readline(reader)
+    if not start:
+        raise ConnectionClosed("연결이 닫혔습니다")
+
+    headers = {}
+    while True:
+        line = await _readline(reader)
+        if line in (b'\r\n', b'\n', b''):
+            break
+        if len(headers) >= MAX_HEADERS:
+            raise HTTPError("헤더가 너무 많습니다")
+        name, separator, value = line.decode('latin-1').partition(':')
+        if not separator or not name.strip():
+            raise HTTPError(f"헤더 형식 오류: {line[:100]!r}")
+        headers[name.strip().lower()] = value.strip()
+    return start.decode('latin-1').rstrip('\r\n'), headers
+
+
+def _parse_int(value, base: int = 10) -> int:
+    """길이 값 파싱 (형식 오류/음수는 HTTPError)"""
+    try:
+        if base == 10 and not value.isdigit():
+            raise ValueError(value)
+        number = int(value, base)
+    except ValueError:
+        raise HTTPError(f"길이 형식 오류: {value[:100]!r}")
+    if number < 0:
+        raise HTTPError(f"길이 형식 오류: {number}")
+    return number
+
+
+async def _read_body(reader: asyncio.StreamReader, headers: Dict[str, str]) -> bytes:
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        chunks = []
+        while True:
+            size = _parse_int((await _readline(reader)).split(b';')[0].strip() or b'0', 16)
+            if size > MAX_BODY:
+                raise HTTPError(f"본문이 너무 큽니다 ({size:,} bytes)")
+            if size == 0:
+                # 트레일러 헤더까지 소비
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                return b''.join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+
+    length = _parse_int(headers.get('content-length', '0'))
+    if length > MAX_BODY:
+        raise HTTPError(f"본문이 너무 큽니다 ({length:,} bytes)")
+    return await reader.readexactly(length) if length else b''
+
+
+# ============================================================
+# 클라이언트
+# ============================================================
+
+class AsyncHTTPClient:
+    """
+    호스트별 keep-alive 커넥션 풀
+
+    동시 요청 수는 호출하는 쪽(세마포어)이 제한하고, 여기서는 끝난 커넥션을
+    유휴 목록에 돌려 다음 요청이 TCP/TLS 연결을 다시 맺지 않게 한다.
+    """
+
+    def __init__(self, max_idle_per_host: int = 32):
+        self.max_idle_per_host = max_idle_per_host
+        self._idle: Dict[tuple, List[tuple]] = {}
+        self._ssl_context = None
+
+    async def _connect(self, scheme: str, host: str, port: int) -> tuple:
+        idle = self._idle.get((scheme, host, port))
+        while idle:
+            reader, writer = idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer
+            writer.close()
+
+        ssl_context = None
+        if scheme == 'https':
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            ssl_context = self._ssl_context
+        return await asyncio.open_connection(host, port, ssl=ssl_context)
+
+    def _release(self, key: tuple, connection: tuple, reusable: bool):
+        idle = self._idle.setdefault(key, [])
+        if reusable and len(idle) < self.max_idle_per_host:
+            idle.append(connection)
+        else:
+            connection[1].close()
+
+    async def request(self, method: str, url: str, body: bytes = b'',
+                      headers: Optional[Dict[str, str]] = None,
+                      timeout: Optional[float] = None) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        요청 한 번 → (상태 코드, 응답 헤더, 본문)
+
+        timeout은 연결부터 본문 수신까지 전체 시간 (초과 시 asyncio.TimeoutError)
+        """
+        parts = urlsplit(url)
+        scheme = parts.scheme or 'http'
+        port = parts.port or (443 if scheme == 'https' else 80)
+        key = (scheme, parts.hostname, port)
+        target = parts.path or '/'
+        if parts.query:
+            target += '?' + parts.query
+
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {parts.netloc}",
+                 f"Content-Length: {len(body)}"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        head = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+        async def exchange():
+            connection = await self._connect(*key)
+            reader, writer = connection
+            try:
+                writer.write(head + body)
+                await writer.drain()
+                status_line, response_headers = await _read_headers(reader)
+                payload = await _read_body(reader, response_headers)
+            except BaseException:
+                writer.close()
+                raise
+            reusable = response_headers.get('connection', '').lower() != 'close'
+            self._release(key, connection, reusable)
+            parts = status_line.split(' ', 2)
+            if len(parts) < 2 or not parts[1].isdigit():
+                raise HTTPError(f"상태 줄 형식 오류: {status_line[:100]!r}")
+            return int(parts[1]), response_headers, payload
+
+        return await asyncio.wait_for(exchange(), timeout)
+
+    async def post_json(self, url: str, payload: Dict, headers: Optional[Dict[str, str]] = None,
+                        timeout: Optional[float] = None) -> Tuple[int, Dict[str, str], bytes]:
+        """JSON POST"""
+        return await self.request(
+            'POST', url,
+            json.dumps(payload, ensure_ascii=False).encode('utf-8'),
+            {'Content-Type': 'application/json', **(headers or {})},
+            timeout,
+        )
+
+    async def close(self):
+        """유휴 커넥션 모두 닫기"""
+        for idle in self._idle.values():
+            for _, writer in idle:
+                writer.close()
+        self._idle.clear()
+
+
+# ============================================================
+# 서버용
+# ============================================================
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+    """
+    요청 하나 → (메서드, 경로, 헤더, 본문), 클라이언트가 연결을 닫았으면 None
+
+    Raises:
+        BadRequest: 요청 줄/헤더/본문 길이 형식 오류
+    """
+    try:
+        request_line, headers = await _read_headers(reader)
+    except (ConnectionClosed, ConnectionError, asyncio.IncompleteReadError):
+        return None
+    except HTTPError as e:
+        raise BadRequest(str(e)) from e
+
+    parts = request_line.split(' ')
+    if (len(parts) != 3 or not parts[0].isalpha() or not parts[1].startswith('/')
+            or not parts[2].startswith('HTTP/')):
+        raise BadRequest(f"요청 줄 형식 오류: {request_line[:100]!r}")
+    method, target, _ = parts
+
+    try:
+        body = await _read_body(reader, headers)
+    except (ConnectionError, asyncio.IncompleteReadError):
+        return None
+    except HTTPError as e:
+        raise BadRequest(str(e)) from e
+    return method, target, headers, body
+
+
+async def write_response(writer: asyncio.StreamWriter, status: int, body: bytes = b'',
+                         headers: Optional[Dict[str, str]] = None,
+                         content_type: str = 'application/json; charset=utf-8'):
+    """응답 쓰기 (keep-alive 유지)"""
+    lines = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, 'Unknown')}",
+             f"Content-Length: {len(body)}"]
+    if body:
+        lines.append(f"Content-Type: {content_type}")
+    lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+    writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+    await writer.drain()
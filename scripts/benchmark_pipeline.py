@@ -0,0 +1,675 @@
+#!/usr/bin/env python3
+"""
+키워드 파이프라인 벤치마크 (합성 DB 생성 + 단계별 시간 측정)
+실제 DB(키워드 1,692개)로는 규모별 성능을 볼 수 없어 10만~100만 키워드 DB를 만들어 측정
+
+- 합성 DB: 기본 스키마(BASE_SCHEMA, 저장소 기본 DB와 같은 테이블/인덱스) + 업그레이드를 정해진 순서로 적용
+  (keyword_latest → posting_priority → 커버링 인덱스, 결과 JSON의 schema_upgrades에 기록),
+  페르소나 정의만 실제 DB(--template)에서 복사,
+  키워드는 실제 형태(띄어쓰기 없는 지역/장소 + 제품/브랜드 + 의도 복합어),
+  검색량은 실제 분포와 비슷한 긴 꼬리(중앙값 ~60, 상위 1% ~1만), 수집일 --dates개 (월 단위 + 신규 키워드)
+  → data/benchmark/synthetic_v1_{크기}_{수집일}d_s{시드}.db (같은 설정이면 재사용)
+- 측정 단계 (크기마다 DB 사본에서, KEYWORD_DB_PATH를 지정한 자식 프로세스로 실행):
+  reclassify           세부 페르소나 전체 재분류 (조회 + 라벨링 + 기록)
+  priority_refresh     포스팅 우선순위 저장 컬럼 갱신 (재분류로 바뀐 키워드)
+  recommend            추천 키워드 50개 (get_recommended_keywords_for_posting)
+  export               추천 키워드 CSV 출력
+  context_lookup_sql   키워드 전체 컨텍스트 --samples회 (keyword_db 쿼리)
+  index_load           메모리 인덱스 적재 (keyword_index)
+  context_lookup_index 키워드 전체 컨텍스트 --samples회 (메모리 인덱스)
+  batch_render         일괄 프롬프트 --batch개 렌더링 (캐시 미사용)
+  batch_render_cold / batch_render_warm  프롬프트 결과 캐시 저장 / 재사용
+- 결과: JSON (data/benchmark/results/{시각}.json) → --compare로 이전 결과와 비교,
+  --tolerance보다 느려진 단계가 있으면 종료 코드 1
+
+사용법:
+    python3 scripts/benchmark_pipeline.py                                  # 1만/10만/100만
+    python3 scripts/benchmark_pipeline.py --sizes 10000 100000 --dates 6
+    python3 scripts/benchmark_pipeline.py --generate-only --sizes 1000000
+    python3 scripts/benchmark_pipeline.py --sizes 100000 --compare data/benchmark/results/20251201_120000.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List
+
+import keyword_db
+
+BENCH_DIR = Path(__file__).resolve().parent.parent / "data" / "benchmark"
+RESULTS_DIR = BENCH_DIR / "results"
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+DEFAULT_DATES = 6
+DEFAULT_SEED = 42
+DEFAULT_SAMPLES = 2000
+DEFAULT_BATCH = 2000
+DEFAULT_REPEAT = 5
+
+# 이전 결과 대비 이 비율 넘게 느려지면 회귀로 표시
+DEFAULT_TOLERANCE = 0.25
+
+# 합성 규칙/스키마를 바꾸면 올려서 기존 합성 DB를 다시 만들게 함
+GENERATOR_VERSION = 2
+
+# 수집일: 실제 DB 마지막 수집일부터 DATE_INTERVAL_DAYS 간격으로 과거 방향
+LAST_RECORD_DATE = date(2025, 11, 20)
+DATE_INTERVAL_DAYS = 30
+
+# 실제 DB에서 내용까지 복사하는 테이블 (기본 스키마에 있는 컬럼만)
+REFERENCE_TABLES = ('customer_personas', 'sub_personas')
+
+# 합성 DB 기본 스키마 (upgrade_to_subpersona.py / upgrade_template_mapping.py까지 적용된 저장소 기본 DB)
+# 템플릿 DB에 어떤 업그레이드가 적용됐는지와 무관하게 같은 스키마에서 측정
+BASE_TABLES = [
+    """
+    CREATE TABLE customer_personas (
+        persona_id INTEGER PRIMARY KEY,
+        persona_name VARCHAR(100) NOT NULL,
+        description TEXT,
+        characteristics TEXT,
+        content_strategy TEXT,
+        target_keywords TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE sub_personas (
+        sub_persona_id VARCHAR(10) PRIMARY KEY,
+        parent_persona_id INTEGER,
+        sub_persona_name VARCHAR(100),
+        description TEXT,
+        keywords_pattern TEXT,
+        content_strategy TEXT,
+        priority_level VARCHAR(20),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        template_id VARCHAR(50),
+        landing_url VARCHAR(200),
+        funnel_strategy TEXT,
+        cta_text VARCHAR(200),
+        FOREIGN KEY (parent_persona_id) REFERENCES customer_personas(persona_id)
+    )
+    """,
+    """
+    CREATE TABLE keywords_master (
+        keyword_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        keyword VARCHAR(200) NOT NULL UNIQUE,
+        persona_id INTEGER,
+        confidence_score FLOAT DEFAULT 0.0,
+        labeling_method VARCHAR(50),
+        source_file VARCHAR(200),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        sub_persona_id VARCHAR(10),
+        FOREIGN KEY (persona_id) REFERENCES customer_personas(persona_id)
+    )
+    """,
+    """
+    CREATE TABLE keyword_timeseries (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        keyword_id INTEGER NOT NULL,
+        record_date DATE NOT NULL,
+        search_volume_pc INTEGER DEFAULT 0,
+        search_volume_mobile INTEGER DEFAULT 0,
+        search_volume_total INTEGER DEFAULT 0,
+        avg_click_pc FLOAT DEFAULT 0.0,
+        avg_click_mobile FLOAT DEFAULT 0.0,
+        avg_ctr_pc FLOAT DEFAULT 0.0,
+        avg_ctr_mobile FLOAT DEFAULT 0.0,
+        competition_level VARCHAR(20),
+        avg_ad_count INTEGER DEFAULT 0,
+        data_source VARCHAR(100),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (keyword_id) REFERENCES keywords_master(keyword_id),
+        UNIQUE(keyword_id, record_date)
+    )
+    """,
+    """
+    CREATE TABLE keyword_changes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        keyword_id INTEGER NOT NULL,
+        analysis_date DATE NOT NULL,
+        period_days INTEGER DEFAULT 7,
+        volume_change_pct FLOAT,
+        volume_change_abs INTEGER,
+        trend VARCHAR(20),
+        alert_level VARCHAR(20),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (keyword_id) REFERENCES keywords_master(keyword_id)
+    )
+    """,
+    """
+    CREATE TABLE blog_posts (
+        post_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        keyword_id INTEGER NOT NULL,
+        persona_id INTEGER NOT NULL,
+        title VARCHAR(500),
+        content TEXT,
+        target_date DATE,
+        status VARCHAR(20),
+        post_url VARCHAR(500),
+        performance_score FLOAT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        published_at TIMESTAMP,
+        FOREIGN KEY (keyword_id) REFERENCES keywords_master(keyword_id),
+        FOREIGN KEY (persona_id) REFERENCES customer_personas(persona_id)
+    )
+    """,
+]
+
+# 적재 후 생성하는 기본 인덱스
+BASE_INDEXES = [
+    "CREATE INDEX idx_date ON keyword_timeseries(record_date)",
+    "CREATE INDEX idx_keyword ON keywords_master(keyword)",
+    "CREATE INDEX idx_keyword_date ON keyword_timeseries(keyword_id, record_date)",
+    "CREATE INDEX idx_keyword_trend ON keyword_changes(keyword_id, analysis_date)",
+    "CREATE INDEX idx_persona ON keywords_master(persona_id)",
+    "CREATE INDEX idx_post_keyword ON blog_posts(keyword_id)",
+    "CREATE INDEX idx_post_persona ON blog_posts(persona_id)",
+    "CREATE INDEX idx_post_status ON blog_posts(status)",
+]
+
+INSERT_BATCH = 50000
+
+# ============================================================
+# 합성 키워드 재료 (실제 네이버 연관키워드 형태를 흉내)
+# ============================================================
+
+_REGIONS = [
+    '서울', '부산', '인천', '대구', '대전', '광주', '울산', '수원', '성남', '용인', '고양',
+    '창원', '청주', '천안', '전주', '제주', '강남', '분당', '일산', '목포', '김해', '평택',
+]
+_PLACES = [
+    '집', '가정용', '실내', '실외', '현관', '베란다', '사무실', '매장', '상가', '식당', '카페',
+    '편의점', '약국', '병원', '학원', '어린이집', '아파트', '빌라', '오피스텔', '주차장', '창고',
+    '공장', '농장', '회사', '학교',
+]
+_SPECS = [
+    '무선', '와이파이', '4K', '야간', '적외선', '방수', '소형', '충전식', '360', '실외용',
+    '200만화소', '500만화소',
+]
+_PRODUCTS = {
+    1: ['홈캠', '펫캠', '가정용CCTV', '무선홈캠', '스마트홈캠', '고양이캠', '강아지캠', '베이비캠',
+        '실내카메라', '홈CCTV', '집캠', '펫CCTV'],
+    2: ['CCTV설치', 'CCTV자가설치', 'CCTV세트', '4채널CCTV', '8채널CCTV', '무선CCTV',
+        'CCTV카메라', '방범카메라', 'DIYCCTV', 'CCTV녹화기'],
+    3: ['캡스', 'ADT캡스', '세콤', '에스원', 'KT텔레캅', '텔레캅', 'KTCCTV', '기가아이즈',
+        '뷰가드', 'LGU+CCTV', 'SK쉴더스', '보안업체'],
+    4: ['NVR', 'DVR', 'IP카메라', 'PTZ카메라', 'AI카메라', '매장CCTV', '사무실CCTV',
+        '업소용CCTV', '공장CCTV', '상가CCTV', '출입통제', '지능형CCTV'],
+    5: ['CCTV', '감시카메라', 'CCTV종류', 'CCTV법률', 'CCTV열람', 'CCTV확인', '도로CCTV',
+        '실시간CCTV', 'CCTV안내판', '보안시스템', '블랙박스', '초소형카메라'],
+}
+_INTENTS = [
+    '추천', '가격', '비용', '설치', '설치비용', '후기', '비교', '순위', '견적', '렌탈', '월요금',
+    '요금', '고객센터', '위약금', '해지', 'AS', '약정', '이전', '이전설치', '문의', '할인',
+    '무료설치', '최저가', '업체', '설정', '앱',
+]
+# 실제 DB 분포 (키워드 수 / 경쟁정도 비율)
+_PERSONA_WEIGHTS = [253, 104, 283, 270, 782]
+_COMPETITION = (('높음', 0.85, 4, 15), ('중간', 0.135, 2, 9), ('낮음', 0.015, 0, 3))
+
+# 검색량: 최소 20 (PC/모바일 각 10 = '< 10'), 파레토 꼬리, 상한 70만
+_VOLUME_ALPHA = 0.65
+_VOLUME_MAX = 700000
+
+
+def _synthetic_keyword(rng: random.Random, persona_id: int) -> str:
+    """지역/장소/사양 + 제품 + 의도 (각 부분은 확률적으로 생략)"""
+    parts = []
+    if rng.random() < 0.25:
+        parts.append(rng.choice(_REGIONS))
+    if rng.random() < 0.35:
+        parts.append(rng.choice(_PLACES))
+    if rng.random() < 0.2:
+        parts.append(rng.choice(_SPECS))
+    parts.append(rng.choice(_PRODUCTS[persona_id]))
+    if rng.random() < 0.75:
+        parts.append(rng.choice(_INTENTS))
+    if rng.random() < 0.15:
+        parts.append(rng.choice(_INTENTS))
+    return ''.join(parts)
+
+
+def iter_synthetic_keywords(size: int, dates: int, seed: int = DEFAULT_SEED) -> Iterator[tuple]:
+    """
+    합성 키워드 + 시계열
+
+    Yields:
+        (keywords_master 행, [keyword_timeseries 행, ...]) - 시계열은 날짜 오름차순
+    """
+    rng = random.Random(seed)
+    record_dates = [(LAST_RECORD_DATE - timedelta(days=DATE_INTERVAL_DAYS * i)).isoformat()
+                    for i in reversed(range(dates))]
+    created_at = f"{record_dates[0]} 09:00:00"
+    seen = set()
+
+    for keyword_id in range(1, size + 1):
+        persona_id = rng.choices(range(1, 6), weights=_PERSONA_WEIGHTS)[0]
+        keyword = _synthetic_keyword(rng, persona_id)
+        for _ in range(8):
+            if keyword not in seen:
+                break
+            keyword = _synthetic_keyword(rng, persona_id)
+        else:
+            # 조합이 겹치면 모델명처럼 영문+숫자 접미사 (예: 파인뷰K50)
+            while keyword in seen:
+                keyword = f"{keyword}{rng.choice('ABCKPSX')}{rng.randint(10, 999)}"
+        seen.add(keyword)
+
+        level, _, ads_min, ads_max = rng.choices(_COMPETITION, weights=[c[1] for c in _COMPETITION])[0]
+        base_volume = min(_VOLUME_MAX, 20 * rng.paretovariate(_VOLUME_ALPHA))
+        trend = rng.gauss(0, 0.15)
+        mobile_share = rng.uniform(0.5, 0.8)
+        # 25%는 중간 수집일부터 등장하는 신규 키워드
+        first = 0 if rng.random() < 0.75 else rng.randrange(1, dates) if dates > 1 else 0
+
+        series = []
+        for i in range(first, dates):
+            volume = base_volume * math.exp(trend * (i - dates + 1)) * rng.lognormvariate(0, 0.1)
+            pc = max(10, int(round(volume * (1 - mobile_share), -1)))
+            mobile = max(10, int(round(volume * mobile_share, -1)))
+            ctr_pc = round(rng.uniform(0, 4), 2)
+            ctr_mobile = round(rng.uniform(0, 5), 2)
+            series.append((
+                keyword_id, record_dates[i], pc, mobile, pc + mobile,
+                round(pc * ctr_pc / 100, 1), round(mobile * ctr_mobile / 100, 1), ctr_pc, ctr_mobile,
+                level, rng.randint(ads_min, ads_max), f"synthetic_{record_dates[i]}",
+            ))
+
+        yield (keyword_id, keyword, persona_id, 0.0, 'synthetic', 'synthetic', created_at, created_at), series
+
+
+def synthetic_db_path(size: int, dates: int, seed: int) -> Path:
+    return BENCH_DIR / f"synthetic_v{GENERATOR_VERSION}_{size}_{dates}d_s{seed}.db"
+
+
+def apply_schema_upgrades(conn: sqlite3.Connection) -> List[str]:
+    """
+    기본 스키마에 업그레이드 스크립트와 같은 DDL을 정해진 순서로 적용 (적재 후 한 번)
+
+    1. keyword_latest + 증분 유지 트리거 (keyword_db.ensure_latest_snapshot)
+    2. posting_priority 컬럼 + 인덱스 + 변경 감지 트리거 (값은 비워 둠 → priority_refresh 단계에서 계산)
+    3. 커버링 인덱스 (upgrade_indexes.COVERING_INDEXES)
+
+    Returns:
+        적용한 업그레이드 이름 목록 (결과 JSON의 schema_upgrades)
+    """
+    from blog_automation_helper import (POSTING_PRIORITY_TRIGGERS, SQL_ADD_POSTING_PRIORITY,
+                                        SQL_CREATE_POSTING_PRIORITY_INDEX)
+    from upgrade_indexes import COVERING_INDEXES
+
+    keyword_db.ensure_latest_snapshot(conn)
+
+    with conn:
+        conn.execute(SQL_ADD_POSTING_PRIORITY)
+        conn.execute(SQL_CREATE_POSTING_PRIORITY_INDEX)
+        for ddl in POSTING_PRIORITY_TRIGGERS.values():
+            conn.execute(ddl)
+
+    with conn:
+        for ddl in COVERING_INDEXES.values():
+            conn.execute(ddl)
+
+    return applied_schema_upgrades(conn)
+
+
+def applied_schema_upgrades(conn: sqlite3.Connection) -> List[str]:
+    """DB에 적용된 업그레이드 (재사용한 합성 DB도 같은 방식으로 기록)"""
+    from upgrade_indexes import COVERING_INDEXES
+
+    names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(keywords_master)")}
+    upgrades = []
+    if 'keyword_latest' in names:
+        upgrades.append('keyword_latest')
+    if 'posting_priority' in columns:
+        upgrades.append('posting_priority')
+    if all(name in names for name in COVERING_INDEXES):
+        upgrades.append('covering_indexes')
+    return upgrades
+
+
+def generate_synthetic_db(path: Path, size: int, dates: int = DEFAULT_DATES, seed: int = DEFAULT_SEED,
+                          template: Path = keyword_db.DB_PATH) -> Dict:
+    """
+    합성 keyword_persona.db 생성
+
+    기본 스키마(BASE_TABLES) → 페르소나 정의 복사(template DB) → 적재 → 기본 인덱스
+    → 업그레이드(apply_schema_upgrades) 순. 인덱스/트리거는 적재 후에 만듦 (행마다 갱신 없음)
+
+    Returns:
+        {'keywords', 'timeseries_rows', 'seconds', 'bytes', 'schema_upgrades'}
+    """
+    started = time.perf_counter()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.unlink(missing_ok=True)
+
+    conn = sqlite3.connect(tmp_path)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    for sql in BASE_TABLES:
+        conn.execute(sql)
+
+    conn.execute("ATTACH DATABASE ? AS template", (str(template),))
+    with conn:
+        for table in REFERENCE_TABLES:
+            columns = ', '.join(row[1] for row in conn.execute(f"PRAGMA main.table_info({table})"))
+            conn.execute(f"INSERT INTO main.{table} ({columns}) SELECT {columns} FROM template.{table}")
+    conn.execute("DETACH DATABASE template")
+
+    sql_keywords = """
+        INSERT INTO keywords_master
+        (keyword_id, keyword, persona_id, confidence_score, labeling_method, source_file,
+         created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    sql_series = """
+        INSERT INTO keyword_timeseries
+        (keyword_id, record_date, search_volume_pc, search_volume_mobile, search_volume_total,
+         avg_click_pc, avg_click_mobile, avg_ctr_pc, avg_ctr_mobile,
+         competition_level, avg_ad_count, data_source)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    keywords, series_rows = [], []
+    series_count = 0
+
+    def flush():
+        with conn:
+            conn.executemany(sql_keywords, keywords)
+            conn.executemany(sql_series, series_rows)
+        keywords.clear()
+        series_rows.clear()
+
+    for keyword_row, series in iter_synthetic_keywords(size, dates, seed):
+        keywords.append(keyword_row)
+        series_rows.extend(series)
+        series_count += len(series)
+        if len(keywords) >= INSERT_BATCH:
+            flush()
+    flush()
+
+    with conn:
+        for sql in BASE_INDEXES:
+            conn.execute(sql)
+    upgrades = apply_schema_upgrades(conn)
+    conn.execute("ANALYZE")
+    conn.commit()
+    conn.close()
+    tmp_path.replace(path)
+
+    return {
+        'keywords': size,
+        'timeseries_rows': series_count,
+        'seconds': round(time.perf_counter() - started, 3),
+        'bytes': path.stat().st_size,
+        'schema_upgrades': upgrades,
+    }
+
+
+# ============================================================
+# 단계별 측정 (자식 프로세스: keyword_db.DB_PATH = 합성 DB 사본)
+# ============================================================
+
+def _measure(run: Callable[[], int], repeat: int = 1) -> Dict:
+    """run()을 repeat회 실행 → 중앙값/최소 시간 + 처리 건수 (run의 반환값)"""
+    times = []
+    ops = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        ops = run()
+        times.append(time.perf_counter() - started)
+    seconds = statistics.median(times)
+    return {
+        'seconds': round(seconds, 6),
+        'min_seconds': round(min(times), 6),
+        'repeat': repeat,
+        'ops': ops,
+        'ops_per_sec': round(ops / seconds, 1) if seconds else None,
+    }
+
+
+def run_stages(samples: int = DEFAULT_SAMPLES, batch: int = DEFAULT_BATCH,
+               repeat: int = DEFAULT_REPEAT, seed: int = DEFAULT_SEED) -> Dict[str, Dict]:
+    """keyword_db.DB_PATH에서 단계별 측정 (DB를 수정하므로 사본에서 실행)"""
+    import keyword_index
+    from blog_automation_helper import BlogAutomationHelper
+    from integrated_blog_workflow import IntegratedBlogWorkflow
+    from reclassify_keywords_subpersona import label_keywords, select_keywords_to_relabel, write_labels_bulk
+
+    results = {}
+    conn = keyword_db.connect()
+
+    def reclassify():
+        rows, _ = select_keywords_to_relabel(conn, full=True)
+        write_labels_bulk(conn, label_keywords(rows))
+        return len(rows)
+
+    results['reclassify'] = _measure(reclassify)
+
+    helper = BlogAutomationHelper()
+    results['priority_refresh'] = _measure(helper.refresh_posting_priority)
+    results['recommend'] = _measure(
+        lambda: len(helper.get_recommended_keywords_for_posting(limit=50, min_volume=1000)), repeat)
+    with contextlib.redirect_stdout(io.StringIO()):
+        results['export'] = _measure(
+            lambda: helper.export_keyword_list_for_posting("benchmark_export.csv") and 1, repeat)
+
+    keyword_count = conn.execute("SELECT MAX(keyword_id) FROM keywords_master").fetchone()[0]
+    keyword_ids = random.Random(seed).sample(range(1, keyword_count + 1), min(samples, keyword_count))
+
+    results['context_lookup_sql'] = _measure(
+        lambda: sum(1 for keyword_id in keyword_ids
+                    if keyword_db.fetch_keyword_full_context(conn, keyword_id)), repeat)
+
+    index = keyword_index.get_index()
+    results['index_load'] = _measure(lambda: index.get(keyword_ids[0]) and keyword_count)
+    workflow = IntegratedBlogWorkflow(use_cache=False)
+    results['context_lookup_index'] = _measure(
+        lambda: sum(1 for keyword_id in keyword_ids if workflow.get_keyword_full_context(keyword_id)),
+        repeat)
+    results['batch_render'] = _measure(
+        lambda: sum(1 for _ in workflow.iter_batch_prompts(limit=batch)), repeat)
+
+    cached = IntegratedBlogWorkflow(use_cache=True)
+
+    def render_cached():
+        count = sum(1 for _ in cached.iter_batch_prompts(limit=batch))
+        cached.prompt_cache.flush()
+        return count
+
+    results['batch_render_cold'] = _measure(render_cached)
+    results['batch_render_warm'] = _measure(render_cached, repeat)
+
+    cached.close()
+    workflow.close()
+    helper.close()
+    conn.close()
+    return results
+
+
+def _run_stages_subprocess(db_path: Path, args) -> Dict[str, Dict]:
+    """KEYWORD_DB_PATH=db_path로 이 스크립트를 다시 실행해 측정 (모듈 상수/공용 풀이 합성 DB를 가리킴)"""
+    output = db_path.with_name('stages.json')
+    command = [
+        sys.executable, str(Path(__file__).resolve()), '--run-stages', str(output),
+        '--samples', str(args.samples), '--batch', str(args.batch),
+        '--repeat', str(args.repeat), '--seed', str(args.seed),
+    ]
+    completed = subprocess.run(command, env={**os.environ, 'KEYWORD_DB_PATH': str(db_path)},
+                               capture_output=True, text=True)
+    if completed.returncode != 0:
+        print(completed.stdout[-2000:])
+        print(completed.stderr[-4000:])
+        raise SystemExit(f"❌ 단계 측정 실패 (종료 코드 {completed.returncode})")
+    return json.loads(output.read_text(encoding='utf-8'))
+
+
+# ============================================================
+# 결과 / 비교
+# ============================================================
+
+def _environment() -> Dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=Path(__file__).parent,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'git_commit': commit,
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def compare_results(old: Dict, new: Dict, tolerance: float = DEFAULT_TOLERANCE) -> List[tuple]:
+    """
+    같은 크기/단계끼리 중앙값 비교
+
+    Returns:
+        회귀 목록 [(크기, 단계, 이전 초, 현재 초), ...] (현재 > 이전 × (1 + tolerance))
+    """
+    previous = {(run['size'], stage): result['seconds']
+                for run in old['runs'] for stage, result in run['stages'].items()}
+
+    print(f"\n📈 이전 결과와 비교 (허용 {tolerance:.0%}, 기준 커밋 {old['environment'].get('git_commit')})")
+    print(f"\n{'크기':>10} {'단계':<22} {'이전(초)':>10} {'현재(초)':>10} {'비율':>7}")
+    print("-" * 66)
+
+    regressions = []
+    for run in new['runs']:
+        for stage, result in run['stages'].items():
+            before = previous.get((run['size'], stage))
+            if not before:
+                continue
+            ratio = result['seconds'] / before
+            mark = ''
+            if ratio > 1 + tolerance:
+                mark = '  ⚠️ 회귀'
+                regressions.append((run['size'], stage, before, result['seconds']))
+            print(f"{run['size']:>10,} {stage:<22} {before:>10.4f} {result['seconds']:>10.4f}"
+                  f" {ratio:>6.2f}x{mark}")
+    return regressions
+
+
+def print_run(run: Dict):
+    generated = run['generate']
+    print(f"\n📊 키워드 {run['size']:,}개 (시계열 {generated['timeseries_rows']:,}행,"
+          f" DB {generated['bytes'] / 1024 / 1024:,.1f}MB"
+          + (f", 생성 {generated['seconds']:.1f}초)" if generated.get('seconds') is not None else ", 재사용)"))
+    print(f"   스키마 업그레이드: {', '.join(generated.get('schema_upgrades') or []) or '없음'}")
+    print(f"\n{'단계':<22} {'중앙값(초)':>11} {'최소(초)':>10} {'건수':>10} {'건/초':>12}")
+    print("-" * 70)
+    for stage, result in run['stages'].items():
+        ops_per_sec = f"{result['ops_per_sec']:,.0f}" if result['ops_per_sec'] else '-'
+        print(f"{stage:<22} {result['seconds']:>11.4f} {result['min_seconds']:>10.4f}"
+              f" {result['ops']:>10,} {ops_per_sec:>12}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="키워드 파이프라인 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="합성 키워드 수 목록")
+    parser.add_argument("--dates", type=int, default=DEFAULT_DATES, help="키워드별 수집일 수 (월 단위)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help="컨텍스트 조회 횟수")
+    parser.add_argument("--batch", type=int, default=DEFAULT_BATCH, help="일괄 프롬프트 렌더링 키워드 수")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="조회 단계 반복 횟수 (중앙값)")
+    parser.add_argument("--template", type=Path, default=keyword_db.DB_PATH,
+                        help="페르소나 정의를 복사할 DB (스키마는 BASE_TABLES + 업그레이드)")
+    parser.add_argument("--regenerate", action="store_true", help="합성 DB가 있어도 다시 생성")
+    parser.add_argument("--generate-only", action="store_true", help="합성 DB만 생성")
+    parser.add_argument("--output", type=Path, help="결과 JSON 경로 (기본: data/benchmark/results/{시각}.json)")
+    parser.add_argument("--compare", type=Path, help="비교할 이전 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="회귀 판정 비율 (0.25 = 25%% 넘게 느려지면 회귀)")
+    parser.add_argument("--run-stages", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_stages:
+        results = run_stages(args.samples, args.batch, args.repeat, args.seed)
+        args.run_stages.write_text(json.dumps(results), encoding='utf-8')
+        return
+
+    print("=" * 80)
+    print("⏱️  키워드 파이프라인 벤치마크")
+    print("=" * 80)
+    print(f"\n   크기: {', '.join(f'{size:,}' for size in args.sizes)} / 수집일 {args.dates}개"
+          f" / 시드 {args.seed}")
+
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'environment': _environment(),
+        'settings': {'dates': args.dates, 'seed': args.seed, 'samples': args.samples,
+                     'batch': args.batch, 'repeat': args.repeat,
+                     'generator_version': GENERATOR_VERSION},
+        'runs': [],
+    }
+
+    for size in args.sizes:
+        db_path = synthetic_db_path(size, args.dates, args.seed)
+        if args.regenerate or not db_path.exists():
+            print(f"\n🏗️  합성 DB 생성: {size:,}개 → {db_path.name}")
+            generated = generate_synthetic_db(db_path, size, args.dates, args.seed, args.template)
+        else:
+            with sqlite3.connect(db_path) as conn:
+                series_count = conn.execute("SELECT COUNT(*) FROM keyword_timeseries").fetchone()[0]
+                upgrades = applied_schema_upgrades(conn)
+            generated = {'keywords': size, 'timeseries_rows': series_count, 'seconds': None,
+                         'bytes': db_path.stat().st_size, 'schema_upgrades': upgrades}
+        if args.generate_only:
+            print(f"   ✅ {generated['timeseries_rows']:,}행 / {generated['bytes'] / 1024 / 1024:,.1f}MB")
+            continue
+
+        # 단계들이 DB를 수정하므로 사본에서 측정 (프롬프트 캐시도 사본 폴더에 생성)
+        work_dir = BENCH_DIR / "work" / str(size)
+        shutil.rmtree(work_dir, ignore_errors=True)
+        work_dir.mkdir(parents=True)
+        work_db = work_dir / "keyword_persona.db"
+        shutil.copyfile(db_path, work_db)
+        try:
+            stages = _run_stages_subprocess(work_db, args)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        run = {'size': size, 'generate': generated, 'stages': stages}
+        report['runs'].append(run)
+        print_run(run)
+
+    if args.generate_only:
+        return
+
+    output = args.output or RESULTS_DIR / f"{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f"\n💾 결과 저장: {output}")
+
+    if args.compare:
+        old = json.loads(args.compare.read_text(encoding='utf-8'))
+        regressions = compare_results(old, report, args.tolerance)
+        if regressions:
+            print(f"\n⚠️  느려진 단계 {len(regressions)}개")
+            sys.exit(1)
+        print("\n✅ 회귀 없음")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,24 +4,159 @@
 키워드 페르소나 DB 기반 포스팅 우선순위 계산 및 프롬프트 생성
 """
 
+import heapq
 import sqlite3
-from pathlib import Path
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import List, Dict, Optional
 
-DB_PATH = Path("/home/tlswk/careon/data/customers/cctv/keyword/keyword_persona.db")
+import keyword_db
+from instrumentation import timed
+
+# 포스팅 우선순위 원점수(반올림 전) SQL 식
+# - calculate_posting_priority()와 배치 추천이 같은 식을 공유 (점수 불일치 방지)
+# - 파이썬 `or` 기본값 의미를 그대로 재현: 검색량/광고수 NULL→0,
+#   경쟁정도 NULL/''→'중간', 신뢰도 NULL/0→0.5
+# - 정수 구간 점수를 먼저 더한 뒤 신뢰도(실수)를 더해 부동소수 결과까지 동일
+# - 반올림은 round(score, 2)로 파이썬에서 처리 (SQLite ROUND와 결과가 다를 수 있음)
+POSTING_PRIORITY_SQL = """
+    (CASE
+        WHEN COALESCE(kt.search_volume_total, 0) > 50000 THEN 40
+        WHEN COALESCE(kt.search_volume_total, 0) > 10000 THEN 35
+        WHEN COALESCE(kt.search_volume_total, 0) > 5000 THEN 30
+        WHEN COALESCE(kt.search_volume_total, 0) > 1000 THEN 20
+        ELSE 10
+     END
+     + CASE COALESCE(NULLIF(kt.competition_level, ''), '중간')
+        WHEN '낮음' THEN 30
+        WHEN '중간' THEN 20
+        ELSE 10
+     END
+     + COALESCE(NULLIF(k.confidence_score, 0), 0.5) * 20
+     + CASE
+        WHEN COALESCE(kt.avg_ad_count, 0) >= 10 THEN 10
+        WHEN COALESCE(kt.avg_ad_count, 0) >= 7 THEN 7
+        WHEN COALESCE(kt.avg_ad_count, 0) >= 5 THEN 5
+        ELSE 3
+     END)
+"""
+
+# 저장 우선순위 컬럼 (upgrade_posting_priority.py, 벤치마크 합성 DB가 같은 정의 사용)
+SQL_ADD_POSTING_PRIORITY = "ALTER TABLE keywords_master ADD COLUMN posting_priority FLOAT"
+
+# ORDER BY posting_priority DESC LIMIT + 미계산(NULL) 조회
+SQL_CREATE_POSTING_PRIORITY_INDEX = """
+    CREATE INDEX IF NOT EXISTS idx_posting_priority
+    ON keywords_master(posting_priority)
+"""
+
+# 변경 감지 트리거: 신뢰도/시계열이 바뀐 키워드의 posting_priority를 NULL("재계산 필요")로 표시
+POSTING_PRIORITY_TRIGGERS = {
+    'trg_priority_confidence': """
+        CREATE TRIGGER IF NOT EXISTS trg_priority_confidence
+        AFTER UPDATE OF confidence_score ON keywords_master
+        WHEN OLD.confidence_score IS NOT NEW.confidence_score
+        BEGIN
+            UPDATE keywords_master SET posting_priority = NULL
+            WHERE keyword_id = NEW.keyword_id;
+        END
+    """,
+    'trg_priority_ts_insert': """
+        CREATE TRIGGER IF NOT EXISTS trg_priority_ts_insert
+        AFTER INSERT ON keyword_timeseries
+        BEGIN
+            UPDATE keywords_master SET posting_priority = NULL
+            WHERE keyword_id = NEW.keyword_id;
+        END
+    """,
+    'trg_priority_ts_update': """
+        CREATE TRIGGER IF NOT EXISTS trg_priority_ts_update
+        AFTER UPDATE ON keyword_timeseries
+        BEGIN
+            UPDATE keywords_master SET posting_priority = NULL
+            WHERE keyword_id IN (OLD.keyword_id, NEW.keyword_id);
+        END
+    """,
+    'trg_priority_ts_delete': """
+        CREATE TRIGGER IF NOT EXISTS trg_priority_ts_delete
+        AFTER DELETE ON keyword_timeseries
+        BEGIN
+            UPDATE keywords_master SET posting_priority = NULL
+            WHERE keyword_id = OLD.keyword_id;
+        END
+    """,
+}
+
+
+@timed('priority.refresh', rows=int)
+def refresh_posting_priority(conn: sqlite3.Connection, full: bool = False) -> int:
+    """
+    저장된 포스팅 우선순위(keywords_master.posting_priority) 갱신
+
+    트리거가 신뢰도 변경/시계열 변경 시 posting_priority를 NULL로 표시하므로
+    NULL인 키워드만 다시 계산한다. 변경이 없으면 인덱스 조회 한 번으로 끝남.
+    쓰기 스크립트(적재/재분류/스케줄러)가 쓰기 후 호출 → 추천 조회는 읽기만 함.
+
+    Args:
+        conn: 키워드 DB 커넥션
+        full: True면 전체 키워드 재계산
+
+    Returns:
+        갱신된 키워드 수 (posting_priority 컬럼이 없는 DB면 0)
+    """
+    columns = conn.execute("PRAGMA table_info(keywords_master)").fetchall()
+    if not any(column[1] == 'posting_priority' for column in columns):
+        return 0
+
+    stale_filter = "" if full else "WHERE k.posting_priority IS NULL"
+    cursor = conn.execute(f"""
+        SELECT k.keyword_id, {POSTING_PRIORITY_SQL} AS raw_score
+        FROM keywords_master k
+        LEFT JOIN keyword_latest kt ON k.keyword_id = kt.keyword_id
+        {stale_filter}
+    """)
+
+    updates = [(round(raw_score, 2), keyword_id) for keyword_id, raw_score in cursor.fetchall()]
+    if not updates:
+        return 0
+
+    conn.executemany("""
+        UPDATE keywords_master
+        SET posting_priority = ?
+        WHERE keyword_id = ?
+    """, updates)
+    conn.commit()
+
+    return len(updates)
 
 
 class BlogAutomationHelper:
     """블로그 자동화 헬퍼 클래스"""
 
-    def __init__(self):
-        self.conn = sqlite3.connect(DB_PATH)
-        self.conn.row_factory = sqlite3.Row
+    def __init__(self, db_path: Path = keyword_db.DB_PATH):
+        """
+        Args:
+            db_path: 키워드 DB (기본: KEYWORD_VERTICAL 버티컬, 샤드 조회 시 버티컬별 DB)
+        """
+        self.db_path = Path(db_path)
+        self.pool = keyword_db.get_pool(self.db_path)
+        self.conn = self.pool.acquire()
+        self.has_materialized_priority = self._has_column('keywords_master', 'posting_priority')
+        self.has_keyword_clusters = self._has_column('keywords_master', 'cluster_id')
+
+    def close(self):
+        """커넥션을 공용 풀에 반납"""
+        if getattr(self, 'conn', None) is not None:
+            self.pool.release(self.conn)
+            self.conn = None
 
     def __del__(self):
-        if hasattr(self, 'conn'):
-            self.conn.close()
+        self.close()
+
+    def _has_column(self, table: str, column: str) -> bool:
+        """테이블 컬럼 존재 여부 (업그레이드 스크립트 적용 여부 확인용)"""
+        cursor = self.conn.execute(f"PRAGMA table_info({table})")
+        return any(row['name'] == column for row in cursor.fetchall())
 
     def get_top_keywords_by_volume(self, limit: int = 20, persona_id: Optional[int] = None) -> List[Dict]:
         """
@@ -34,28 +169,7 @@ class BlogAutomationHelper:
         Returns:
             키워드 정보 리스트
         """
-        cursor = self.conn.cursor()
-
-        persona_filter = ""
-        params = [limit]
-        if persona_id:
-            persona_filter = "AND k.persona_id = ?"
-            params.insert(0, persona_id)
-
-        query = f"""
-            SELECT k.keyword_id, k.keyword, k.persona_id, p.persona_name,
-                   kt.search_volume_total, kt.competition_level,
-                   kt.avg_ad_count, k.confidence_score
-            FROM keywords_master k
-            JOIN customer_personas p ON k.persona_id = p.persona_id
-            LEFT JOIN keyword_timeseries kt ON k.keyword_id = kt.keyword_id
-            WHERE kt.search_volume_total > 0 {persona_filter}
-            ORDER BY kt.search_volume_total DESC
-            LIMIT ?
-        """
-
-        cursor.execute(query, params)
-        return [dict(row) for row in cursor.fetchall()]
+        return keyword_db.fetch_top_keywords(self.conn, limit, persona_id)
 
     def calculate_posting_priority(self, keyword_id: int) -> float:
         """
@@ -72,11 +186,10 @@ class BlogAutomationHelper:
         """
         cursor = self.conn.cursor()
 
-        cursor.execute("""
-            SELECT k.keyword, k.confidence_score, kt.search_volume_total,
-                   kt.competition_level, kt.avg_ad_count
+        cursor.execute(f"""
+            SELECT {POSTING_PRIORITY_SQL} AS raw_score
             FROM keywords_master k
-            LEFT JOIN keyword_timeseries kt ON k.keyword_id = kt.keyword_id
+            LEFT JOIN keyword_latest kt ON k.keyword_id = kt.keyword_id
             WHERE k.keyword_id = ?
         """, (keyword_id,))
 
@@ -84,83 +197,98 @@ class BlogAutomationHelper:
         if not row:
             return 0.0
 
-        score = 0.0
-
-        # 1. 검색량 점수 (40점)
-        volume = row['search_volume_total'] or 0
-        if volume > 50000:
-            score += 40
-        elif volume > 10000:
-            score += 35
-        elif volume > 5000:
-            score += 30
-        elif volume > 1000:
-            score += 20
-        else:
-            score += 10
-
-        # 2. 경쟁 정도 점수 (30점) - 경쟁 낮을수록 높은 점수
-        competition = row['competition_level'] or '중간'
-        if competition == '낮음':
-            score += 30
-        elif competition == '중간':
-            score += 20
-        else:  # '높음'
-            score += 10
-
-        # 3. 페르소나 신뢰도 점수 (20점)
-        confidence = row['confidence_score'] or 0.5
-        score += confidence * 20
-
-        # 4. 광고 수 점수 (10점) - 광고 많을수록 수익성 높음
-        ad_count = row['avg_ad_count'] or 0
-        if ad_count >= 10:
-            score += 10
-        elif ad_count >= 7:
-            score += 7
-        elif ad_count >= 5:
-            score += 5
-        else:
-            score += 3
-
-        return round(score, 2)
-
-    def get_recommended_keywords_for_posting(self, limit: int = 10, min_volume: int = 1000) -> List[Dict]:
+        return round(row['raw_score'], 2)
+
+    @timed('recommend', rows=len)
+    def get_recommended_keywords_for_posting(self, limit: int = 10, min_volume: int = 1000,
+                                             exclude_posted: bool = True,
+                                             one_per_cluster: bool = True) -> List[Dict]:
         """
         블로그 포스팅 추천 키워드 조회
 
         Args:
             limit: 조회할 키워드 수
             min_volume: 최소 검색량
+            exclude_posted: 포스팅 이력(blog_posts)이 있는 키워드 제외 (안티 조인)
+            one_per_cluster: 근접 중복 클러스터당 대표 키워드 하나만
+                (keyword_similarity.py 실행 DB, exclude_posted면 클러스터 안 이력도 확인)
 
         Returns:
             우선순위 점수와 함께 키워드 리스트
         """
         cursor = self.conn.cursor()
-
-        cursor.execute("""
+        not_posted = f"AND {keyword_db.SQL_NOT_POSTED}" if exclude_posted else ""
+        if one_per_cluster and self.has_keyword_clusters:
+            not_posted += f" AND {keyword_db.SQL_CLUSTER_REPRESENTATIVE}"
+            if exclude_posted:
+                not_posted += f" AND {keyword_db.SQL_CLUSTER_NOT_POSTED}"
+
+        # 저장된 우선순위 컬럼이 있으면 정렬 + LIMIT을 SQL에서 한 번에 처리
+        # (upgrade_posting_priority.py 적용 DB)
+        # 갱신은 쓰기 스크립트 몫이라 조회는 읽기만 함 → 아직 재계산 안 된(NULL) 키워드는
+        # 같은 식으로 즉석 계산해 순위에서 빠지지 않게 함
+        # (동점은 검색량 → keyword_id 역순: 기존 idx_posting_priority 역방향 스캔 순서)
+        if self.has_materialized_priority:
+            cursor.execute(f"""
+                SELECT k.keyword_id, k.keyword, k.persona_id, p.persona_name,
+                       kt.search_volume_total, kt.competition_level,
+                       kt.avg_ad_count, k.confidence_score,
+                       COALESCE(k.posting_priority, {POSTING_PRIORITY_SQL}) AS raw_score
+                FROM keywords_master k
+                JOIN keyword_latest kt ON k.keyword_id = kt.keyword_id
+                JOIN customer_personas p ON k.persona_id = p.persona_id
+                WHERE kt.search_volume_total >= ?
+                AND k.persona_id != 5
+                {not_posted}
+                ORDER BY raw_score DESC, kt.search_volume_total DESC, k.keyword_id DESC
+                LIMIT ?
+            """, (min_volume, limit))
+
+            rows = [dict(row) for row in cursor.fetchall()]
+            for keyword_data in rows:
+                keyword_data['priority_score'] = round(keyword_data.pop('raw_score'), 2)
+            return rows
+
+        # 후보 전체의 점수를 한 번의 쿼리로 계산 (키워드별 재조회 없음)
+        cursor.execute(f"""
             SELECT k.keyword_id, k.keyword, k.persona_id, p.persona_name,
                    kt.search_volume_total, kt.competition_level,
-                   kt.avg_ad_count, k.confidence_score
+                   kt.avg_ad_count, k.confidence_score,
+                   {POSTING_PRIORITY_SQL} AS raw_score
             FROM keywords_master k
             JOIN customer_personas p ON k.persona_id = p.persona_id
-            LEFT JOIN keyword_timeseries kt ON k.keyword_id = kt.keyword_id
+            LEFT JOIN keyword_latest kt ON k.keyword_id = kt.keyword_id
             WHERE kt.search_volume_total >= ?
             AND k.persona_id != 5
+            {not_posted}
             ORDER BY kt.search_volume_total DESC
         """, (min_volume,))
 
-        results = []
-        for row in cursor.fetchall():
-            keyword_data = dict(row)
-            keyword_data['priority_score'] = self.calculate_posting_priority(row['keyword_id'])
-            results.append(keyword_data)
+        return self._top_by_priority(cursor, limit)
+
+    def refresh_posting_priority(self, full: bool = False) -> int:
+        """저장된 포스팅 우선순위 갱신 (모듈 함수 refresh_posting_priority 참고)"""
+        return refresh_posting_priority(self.conn, full)
 
-        # 우선순위 점수로 정렬
-        results.sort(key=lambda x: x['priority_score'], reverse=True)
+    @staticmethod
+    @timed('recommend.score', rows=len)
+    def _top_by_priority(cursor: sqlite3.Cursor, limit: int) -> List[Dict]:
+        """
+        raw_score 컬럼을 포함한 결과에서 우선순위 TOP-k 선택
+
+        전체 정렬 대신 힙(heapq.nlargest)으로 상위 limit개만 유지.
+        nlargest는 안정 정렬과 같은 결과를 보장하므로 동점일 때는
+        기존과 동일하게 검색량 내림차순(쿼리 순서)이 유지됨.
+        """
+        def scored_rows():
+            for row in cursor:
+                keyword_data = dict(row)
+                keyword_data['priority_score'] = round(keyword_data.pop('raw_score'), 2)
+                yield keyword_data
 
-        return results[:limit]
+        return heapq.nlargest(limit, scored_rows(), key=lambda x: x['priority_score'])
 
+    @timed('prompt.generate')
     def generate_blog_prompt(self, keyword_id: int) -> str:
         """
         페르소나 맞춤형 블로그 프롬프트 생성
@@ -179,7 +307,7 @@ class BlogAutomationHelper:
                    kt.search_volume_total, kt.competition_level, kt.avg_ad_count
             FROM keywords_master k
             JOIN customer_personas p ON k.persona_id = p.persona_id
-            LEFT JOIN keyword_timeseries kt ON k.keyword_id = kt.keyword_id
+            LEFT JOIN keyword_latest kt ON k.keyword_id = kt.keyword_id
             WHERE k.keyword_id = ?
         """, (keyword_id,))
 
@@ -330,18 +458,19 @@ class BlogAutomationHelper:
         }
         return points.get(persona_id, "- 정확하고 유용한 정보 제공\n- 독자의 검색 의도 충족")
 
+    @timed('export.csv')
     def export_keyword_list_for_posting(self, filename: str = "posting_keywords.csv"):
         """
         블로그 포스팅용 키워드 리스트 CSV 출력
 
         Args:
-            filename: 출력 파일명
+            filename: 출력 파일명 (헬퍼가 조회하는 키워드 DB와 같은 폴더에 저장)
         """
         import csv
 
         keywords = self.get_recommended_keywords_for_posting(limit=50)
 
-        output_path = Path("/home/tlswk/careon/data/customers/cctv/keyword") / filename
+        output_path = self.db_path.parent / filename
 
         with open(output_path, 'w', newline='', encoding='utf-8') as f:
             writer = csv.DictWriter(f, fieldnames=[
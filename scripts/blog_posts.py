@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+블로그 포스팅 이력 (blog_posts)
+draft 일괄 저장 → scheduled → published 상태 이동 + 발행 URL/시각 기록
+
+- 여러 건을 json_each로 넘겨 문장 하나로 처리 (건별 쿼리 없음, 한 트랜잭션)
+- 상태는 앞으로만 이동: draft → scheduled → published (draft에서 바로 발행 가능)
+  조건에 맞지 않는 포스트(이미 발행 등)는 건너뛰고 처리 건수만 반환
+- 추천 쿼리는 keyword_db.SQL_NOT_POSTED(안티 조인)로 이력이 있는 키워드를 제외
+
+사용법:
+    python3 scripts/blog_posts.py --list draft
+    python3 scripts/blog_posts.py --schedule 12 13 14 --date 2025-12-01
+    python3 scripts/blog_posts.py --publish 12=https://blog.naver.com/careon/1234
+    python3 scripts/blog_posts.py --publish-csv published.csv   # post_id,post_url[,published_at]
+"""
+
+import argparse
+import csv
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import keyword_db
+
+POST_STATUSES = ('draft', 'scheduled', 'published')
+
+# 목표 상태 → 이동할 수 있는 현재 상태
+TRANSITIONS = {
+    'scheduled': ('draft',),
+    'published': ('draft', 'scheduled'),
+}
+
+# 일괄 draft: JSON 배열 → 행 (같은 키워드가 여러 번이면 호출 쪽에서 마지막 것만 남김)
+_DRAFT_ROWS = """
+    SELECT json_extract(value, '$.keyword_id') AS keyword_id,
+           json_extract(value, '$.title') AS title,
+           json_extract(value, '$.content') AS content,
+           json_extract(value, '$.target_date') AS target_date
+    FROM json_each(:drafts)
+"""
+
+# MATERIALIZED: 입력을 한 번만 풀어 임시 테이블로 만들면 플래너가 자동 인덱스로 조인
+# (서브쿼리로 두면 draft 행마다 json_each를 다시 훑음 → draft 수 × 입력 수)
+SQL_UPDATE_DRAFTS = f"""
+    WITH d AS MATERIALIZED ({_DRAFT_ROWS})
+    UPDATE blog_posts AS bp
+    SET title = d.title,
+        content = d.content,
+        target_date = COALESCE(d.target_date, bp.target_date),
+        created_at = CURRENT_TIMESTAMP
+    FROM d
+    WHERE bp.keyword_id = d.keyword_id AND bp.status = 'draft'
+"""
+
+SQL_INSERT_DRAFTS = f"""
+    INSERT INTO blog_posts (keyword_id, persona_id, title, content, target_date, status)
+    SELECT k.keyword_id, k.persona_id, d.title, d.content, d.target_date, 'draft'
+    FROM ({_DRAFT_ROWS}) AS d
+    JOIN keywords_master k ON k.keyword_id = d.keyword_id
+    WHERE NOT :replace_existing OR NOT EXISTS (
+        SELECT 1 FROM blog_posts bp
+        WHERE bp.keyword_id = d.keyword_id AND bp.status = 'draft'
+    )
+"""
+
+SQL_TRANSITION = """
+    UPDATE blog_posts
+    SET status = :status,
+        target_date = COALESCE(:target_date, target_date)
+    WHERE post_id IN (SELECT value FROM json_each(:post_ids))
+    AND status IN (SELECT value FROM json_each(:from_statuses))
+"""
+
+# [[post_id, post_url, published_at], ...] - URL/시각이 없으면 기존 값/현재 시각
+SQL_PUBLISH = """
+    UPDATE blog_posts AS bp
+    SET status = 'published',
+        post_url = COALESCE(p.post_url, bp.post_url),
+        published_at = COALESCE(p.published_at, :published_at, CURRENT_TIMESTAMP)
+    FROM (
+        SELECT json_extract(value, '$[0]') AS post_id,
+               json_extract(value, '$[1]') AS post_url,
+               json_extract(value, '$[2]') AS published_at
+        FROM json_each(:posts)
+    ) AS p
+    WHERE bp.post_id = p.post_id
+    AND bp.status IN (SELECT value FROM json_each(:from_statuses))
+"""
+
+SQL_POSTS = """
+    SELECT bp.post_id, bp.keyword_id, k.keyword, k.sub_persona_id, bp.persona_id,
+           bp.title, bp.status, bp.target_date, bp.post_url,
+           bp.created_at, bp.published_at
+    FROM blog_posts bp
+    JOIN keywords_master k ON bp.keyword_id = k.keyword_id
+"""
+
+
+def save_drafts(conn: sqlite3.Connection, drafts: Iterable[Dict],
+                replace_existing: bool = True) -> Dict[str, int]:
+    """
+    draft 일괄 저장 (한 트랜잭션)
+
+    Args:
+        drafts: {'keyword_id', 'title', 'content', 'target_date'(선택)} 목록
+        replace_existing: 키워드에 draft가 이미 있으면 덮어씀 (False면 항상 새 draft)
+
+    Returns:
+        {'inserted': 새 draft 수, 'updated': 덮어쓴 draft 수}
+    """
+    rows = [{
+        'keyword_id': draft['keyword_id'],
+        'title': draft.get('title'),
+        'content': draft.get('content'),
+        'target_date': draft.get('target_date'),
+    } for draft in drafts]
+    if not rows:
+        return {'inserted': 0, 'updated': 0}
+
+    if replace_existing:
+        # 같은 키워드는 마지막 것만 (UPDATE ... FROM은 여러 행이 맞으면 어느 행을 쓸지 정해지지 않음)
+        rows = list({row['keyword_id']: row for row in rows}.values())
+    payload = json.dumps(rows, ensure_ascii=False)
+
+    with conn:
+        updated = 0
+        if replace_existing:
+            # WITH로 시작하는 문장은 sqlite3 모듈이 rowcount를 -1로 둠 → total_changes 차이로 계산
+            changes = conn.total_changes
+            conn.execute(SQL_UPDATE_DRAFTS, {'drafts': payload})
+            updated = conn.total_changes - changes
+        inserted = conn.execute(SQL_INSERT_DRAFTS, {
+            'drafts': payload,
+            'replace_existing': replace_existing,
+        }).rowcount
+
+    return {'inserted': inserted, 'updated': updated}
+
+
+def transition_posts(conn: sqlite3.Connection, post_ids: Iterable[int], status: str,
+                     target_date: Optional[str] = None) -> int:
+    """
+    여러 포스트의 상태를 한 번에 이동 (TRANSITIONS에 없는 이동은 건너뜀)
+
+    Returns:
+        상태가 바뀐 포스트 수
+    """
+    if status not in TRANSITIONS:
+        raise ValueError(f"이동할 수 없는 상태: {status} (가능: {', '.join(TRANSITIONS)})")
+    if status == 'published':
+        return publish_posts(conn, [(post_id, None) for post_id in post_ids])
+
+    with conn:
+        return conn.execute(SQL_TRANSITION, {
+            'status': status,
+            'target_date': target_date,
+            'post_ids': json.dumps(list(post_ids)),
+            'from_statuses': json.dumps(TRANSITIONS[status]),
+        }).rowcount
+
+
+def schedule_posts(conn: sqlite3.Connection, post_ids: Iterable[int],
+                   target_date: Optional[str] = None) -> int:
+    """draft → scheduled (target_date를 주면 함께 기록)"""
+    return transition_posts(conn, post_ids, 'scheduled', target_date)
+
+
+def publish_posts(conn: sqlite3.Connection, posts: Iterable[Tuple],
+                  published_at: Optional[str] = None) -> int:
+    """
+    draft/scheduled → published + post_url/published_at 기록
+
+    Args:
+        posts: (post_id, post_url) 또는 (post_id, post_url, published_at) 목록
+        published_at: 행별 시각이 없을 때 쓰는 시각 (없으면 현재 시각, UTC)
+    """
+    payload = [list(post) + [None] * (3 - len(post)) for post in posts]
+    if not payload:
+        return 0
+
+    with conn:
+        return conn.execute(SQL_PUBLISH, {
+            'posts': json.dumps(payload, ensure_ascii=False),
+            'published_at': published_at,
+            'from_statuses': json.dumps(TRANSITIONS['published']),
+        }).rowcount
+
+
+def fetch_posts(conn: sqlite3.Connection, status: Optional[str] = None,
+                limit: Optional[int] = None) -> List[Dict]:
+    """포스팅 이력 (목표일 → post_id 순)"""
+    sql = SQL_POSTS
+    params = []
+    if status:
+        sql += " WHERE bp.status = ?"
+        params.append(status)
+    sql += " ORDER BY bp.target_date IS NULL, bp.target_date, bp.post_id"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+    return [dict(row) for row in conn.execute(sql, params).fetchall()]
+
+
+def posted_keyword_ids(conn: sqlite3.Connection) -> set:
+    """포스팅 이력이 있는 키워드 ID (DB 밖의 목록을 거를 때)"""
+    return {row[0] for row in conn.execute("SELECT DISTINCT keyword_id FROM blog_posts")}
+
+
+def status_counts(conn: sqlite3.Connection) -> Dict[str, int]:
+    """상태별 포스트 수 (idx_post_status)"""
+    return {row[0]: row[1] for row in conn.execute(
+        "SELECT status, COUNT(*) FROM blog_posts GROUP BY status")}
+
+
+def _read_publish_csv(path: Path) -> List[tuple]:
+    """post_id,post_url[,published_at] (헤더 줄 있으면 무시)"""
+    rows = []
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            if not row or not row[0].strip().isdigit():
+                continue
+            rows.append((int(row[0]), row[1].strip() if len(row) > 1 else None,
+                         row[2].strip() if len(row) > 2 and row[2].strip() else None))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="블로그 포스팅 이력 관리")
+    parser.add_argument("--list", nargs="?", const='', metavar="STATUS",
+                        help="포스트 목록 (상태 지정 가능: draft/scheduled/published)")
+    parser.add_argument("--schedule", type=int, nargs="+", metavar="POST_ID",
+                        help="draft → scheduled")
+    parser.add_argument("--date", help="--schedule 목표일 (YYYY-MM-DD)")
+    parser.add_argument("--publish", nargs="+", metavar="POST_ID=URL",
+                        help="draft/scheduled → published (URL 생략 가능)")
+    parser.add_argument("--publish-csv", type=Path,
+                        help="발행 목록 CSV (post_id,post_url[,published_at])")
+    parser.add_argument("--published-at", help="발행 시각 (기본: 현재 시각)")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("📰 블로그 포스팅 이력")
+    print("=" * 80)
+
+    pool = keyword_db.get_pool()
+    with pool.connection() as conn:
+        if args.schedule:
+            changed = schedule_posts(conn, args.schedule, args.date)
+            print(f"\n📅 scheduled: {changed:,}/{len(args.schedule):,}개")
+
+        published = []
+        for item in args.publish or []:
+            post_id, _, url = item.partition('=')
+            published.append((int(post_id), url or None))
+        if args.publish_csv:
+            published += _read_publish_csv(args.publish_csv)
+        if published:
+            changed = publish_posts(conn, published, args.published_at)
+            print(f"\n🚀 published: {changed:,}/{len(published):,}개")
+
+        if args.list is not None:
+            posts = fetch_posts(conn, args.list or None)
+            print(f"\n{'ID':>6} {'상태':<10} {'목표일':<11} {'키워드':<25} 제목")
+            print("-" * 100)
+            for post in posts:
+                print(f"{post['post_id']:>6} {post['status']:<10} {post['target_date'] or '-':<11} "
+                      f"{post['keyword']:<25} {(post['title'] or '')[:40]}")
+
+        counts = status_counts(conn)
+
+    print(f"\n📊 상태별: " + " / ".join(
+        f"{status} {counts.get(status, 0):,}개" for status in POST_STATUSES))
+    print(f"\n💾 DB 위치: {keyword_db.DB_PATH}\n")
+
+
+if __name__ == "__main__":
+    main()
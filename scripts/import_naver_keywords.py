@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+네이버 키워드 도구 엑셀(xlsx) 일괄 적재
+data/row 폴더의 연관키워드 엑셀 → keywords_master + keyword_timeseries
+
+- openpyxl read-only 모드로 행 단위 스트리밍 (파일 수와 무관하게 메모리 일정)
+- 키워드 정규화 후 DB UPSERT로 파일 간 중복 제거
+- 신규 키워드는 적재 시점에 페르소나/세부 페르소나 자동 라벨링
+- 파싱 결과는 파일 해시 기준 .npz로 캐시 (재적재 시 엑셀 파싱 생략)
+
+사용법:
+    python3 scripts/import_naver_keywords.py
+    python3 scripts/import_naver_keywords.py <파일 또는 폴더> ... --date 2025-11-20
+"""
+
+import argparse
+import re
+import sqlite3
+import time
+import unicodedata
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from openpyxl import load_workbook
+
+import xlsx_cache
+from blog_automation_helper import refresh_posting_priority
+from instrumentation import stage
+from keyword_db import DATA_ROOT, DB_PATH, VERTICAL, connect, prepare_for_write
+from reclassify_keywords_subpersona import CLASSIFIER
+
+RAW_DATA_DIR = DATA_ROOT / "row" / f"{VERTICAL}-related-keyword(naver-keyword-tools)"
+
+# 한 트랜잭션으로 적재하는 행 수
+DEFAULT_BATCH_SIZE = 10000
+
+# 파싱 규칙(COLUMN_MAP, to_record) 버전 - 바꾸면 xlsx 캐시가 무효화됨
+PARSER_VERSION = 'v1'
+
+# 엑셀 헤더 → keyword_timeseries 컬럼
+COLUMN_MAP = {
+    '연관키워드': 'keyword',
+    '월간검색수(PC)': 'search_volume_pc',
+    '월간검색수(모바일)': 'search_volume_mobile',
+    '월평균클릭수(PC)': 'avg_click_pc',
+    '월평균클릭수(모바일)': 'avg_click_mobile',
+    '월평균클릭률(PC)': 'avg_ctr_pc',
+    '월평균클릭률(모바일)': 'avg_ctr_mobile',
+    '경쟁정도': 'competition_level',
+    '월평균노출 광고수': 'avg_ad_count',
+}
+
+# 페르소나 자동 라벨링 규칙 (keyword_persona_system_design.md)
+PERSONA_RULES = {
+    1: ['홈캠', '추천', '비교', '가정용', '실내', '펫캠', '무선',
+        '엘지홈캠', 'LG홈캠', '국산홈캠', '스마트홈캠'],
+    2: ['설치', 'DIY', '셀프', '자가설치', '설치방법', '세트',
+        '4채널', '8채널', 'CCTV세트', 'IP카메라추천'],
+    3: ['KT', '캡스', '에스원', '세콤', 'ADT', '텔레캅',
+        '뷰가드', '기가아이즈', '고객센터', '비용', 'KTCCTV'],
+    4: ['설치업체', '견적', 'NVR', 'DVR', '매장', '사무실',
+        'IP카메라', '공장', '학교', '병원', '업소용'],
+    5: ['도로', '버스', '실시간', '종류', '법률', 'CCTV확인']
+}
+
+_LOWER_PERSONA_RULES = {
+    persona_id: [pattern.lower() for pattern in patterns]
+    for persona_id, patterns in PERSONA_RULES.items()
+}
+
+
+def auto_label_keyword(keyword: str) -> tuple:
+    """
+    키워드를 페르소나에 자동 라벨링 (규칙 기반)
+
+    Returns:
+        (persona_id, confidence_score)
+    """
+    keyword_lower = keyword.lower()
+    scores = {persona_id: 0.0 for persona_id in range(1, 6)}
+
+    for persona_id, patterns in _LOWER_PERSONA_RULES.items():
+        for pattern in patterns:
+            if pattern in keyword_lower:
+                scores[persona_id] += 1.0
+
+    best_persona = max(scores.items(), key=lambda x: x[1])
+
+    if best_persona[1] == 0:
+        return (5, 0.3)  # 기타로 분류, 낮은 신뢰도
+
+    return (best_persona[0], min(best_persona[1] / 3.0, 1.0))
+
+
+def normalize_keyword(value) -> str:
+    """키워드 정규화: NFC + 앞뒤 공백 제거 + 연속 공백 1칸"""
+    if value is None:
+        return ''
+    keyword = unicodedata.normalize('NFC', str(value))
+    return re.sub(r'\s+', ' ', keyword).strip()
+
+
+def parse_int(value) -> int:
+    """'1,070' → 1070, '< 10' → 10, '-' → 0"""
+    if value is None:
+        return 0
+    if isinstance(value, (int, float)):
+        return int(value)
+    digits = re.sub(r'[^0-9.]', '', str(value))
+    return int(float(digits)) if digits else 0
+
+
+def parse_float(value) -> float:
+    """'0.21%' → 0.21, '-' → 0.0"""
+    if value is None:
+        return 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    digits = re.sub(r'[^0-9.]', '', str(value))
+    return float(digits) if digits else 0.0
+
+
+def record_date_from_filename(path: Path) -> Optional[str]:
+    """파일명의 YYYYMMDD → 'YYYY-MM-DD' (없으면 None)"""
+    match = re.search(r'(20\d{2})(\d{2})(\d{2})', path.name)
+    if not match:
+        return None
+    return '-'.join(match.groups())
+
+
+def iter_workbook_rows(path: Path) -> Iterator[Dict]:
+    """
+    엑셀 파일을 행 단위로 스트리밍
+
+    첫 행을 헤더로 보고 COLUMN_MAP에 있는 컬럼만 읽는다.
+    """
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if not header:
+            return
+
+        columns = {
+            COLUMN_MAP[name]: idx
+            for idx, name in enumerate(header)
+            if name in COLUMN_MAP
+        }
+        if 'keyword' not in columns:
+            raise ValueError(f"'연관키워드' 컬럼이 없습니다: {path.name}")
+
+        for values in rows:
+            yield {
+                column: values[idx] if idx < len(values) else None
+                for column, idx in columns.items()
+            }
+    finally:
+        workbook.close()
+
+
+def to_record(raw: Dict) -> Optional[Dict]:
+    """엑셀 행 → 적재 레코드 (키워드가 없으면 None)"""
+    keyword = normalize_keyword(raw.get('keyword'))
+    if not keyword:
+        return None
+
+    search_volume_pc = parse_int(raw.get('search_volume_pc'))
+    search_volume_mobile = parse_int(raw.get('search_volume_mobile'))
+
+    return {
+        'keyword': keyword,
+        'search_volume_pc': search_volume_pc,
+        'search_volume_mobile': search_volume_mobile,
+        'search_volume_total': search_volume_pc + search_volume_mobile,
+        'avg_click_pc': parse_float(raw.get('avg_click_pc')),
+        'avg_click_mobile': parse_float(raw.get('avg_click_mobile')),
+        'avg_ctr_pc': parse_float(raw.get('avg_ctr_pc')),
+        'avg_ctr_mobile': parse_float(raw.get('avg_ctr_mobile')),
+        'competition_level': normalize_keyword(raw.get('competition_level')) or None,
+        'avg_ad_count': parse_int(raw.get('avg_ad_count')),
+    }
+
+
+def iter_file_records(path: Path, use_cache: bool = True) -> Iterator[Optional[Dict]]:
+    """
+    파일의 적재 레코드 (키워드 없는 행은 None)
+
+    캐시가 있으면 .npz에서 읽고, 없으면 엑셀을 파싱하면서 캐시를 만든다.
+    """
+    if use_cache and xlsx_cache.available():
+        cached = xlsx_cache.load(path, PARSER_VERSION)
+        if cached is not None:
+            records, skipped = cached
+            yield from records
+            yield from [None] * skipped
+            return
+
+    records = []
+    skipped = 0
+    for raw in iter_workbook_rows(path):
+        record = to_record(raw)
+        if record is None:
+            skipped += 1
+        elif use_cache:
+            records.append(record)
+        yield record
+
+    if use_cache:
+        xlsx_cache.save(path, PARSER_VERSION, records, skipped)
+
+
+def upsert_batch(conn: sqlite3.Connection, records: Dict[str, Dict],
+                 record_date: str, source_file: str) -> int:
+    """
+    레코드 배치를 한 트랜잭션으로 적재
+
+    1. keywords_master: 신규 키워드만 라벨링 후 INSERT (기존 키워드 라벨은 유지)
+    2. keyword_timeseries: (keyword_id, record_date) UPSERT, 지표가 바뀐 경우만 UPDATE
+
+    Returns:
+        신규 키워드 수
+    """
+    keywords = list(records)
+    placeholders = ','.join('?' * len(keywords))
+
+    with conn:
+        existing = {
+            row[0] for row in conn.execute(
+                f"SELECT keyword FROM keywords_master WHERE keyword IN ({placeholders})",
+                keywords,
+            )
+        }
+
+        new_keywords = []
+        for keyword in keywords:
+            if keyword in existing:
+                continue
+            persona_id, _ = auto_label_keyword(keyword)
+            sub_persona_id, confidence, _ = CLASSIFIER.classify(keyword, persona_id)
+            new_keywords.append((keyword, persona_id, sub_persona_id, confidence, source_file))
+
+        conn.executemany("""
+            INSERT INTO keywords_master
+            (keyword, persona_id, sub_persona_id, confidence_score, labeling_method, source_file)
+            VALUES (?, ?, ?, ?, 'auto', ?)
+            ON CONFLICT(keyword) DO NOTHING
+        """, new_keywords)
+
+        keyword_ids = {
+            row[1]: row[0] for row in conn.execute(
+                f"SELECT keyword_id, keyword FROM keywords_master WHERE keyword IN ({placeholders})",
+                keywords,
+            )
+        }
+
+        conn.executemany("""
+            INSERT INTO keyword_timeseries
+            (keyword_id, record_date, search_volume_pc, search_volume_mobile,
+             search_volume_total, avg_click_pc, avg_click_mobile,
+             avg_ctr_pc, avg_ctr_mobile, competition_level, avg_ad_count, data_source)
+            VALUES (:keyword_id, :record_date, :search_volume_pc, :search_volume_mobile,
+                    :search_volume_total, :avg_click_pc, :avg_click_mobile,
+                    :avg_ctr_pc, :avg_ctr_mobile, :competition_level, :avg_ad_count, :data_source)
+            ON CONFLICT(keyword_id, record_date) DO UPDATE SET
+                search_volume_pc = excluded.search_volume_pc,
+                search_volume_mobile = excluded.search_volume_mobile,
+                search_volume_total = excluded.search_volume_total,
+                avg_click_pc = excluded.avg_click_pc,
+                avg_click_mobile = excluded.avg_click_mobile,
+                avg_ctr_pc = excluded.avg_ctr_pc,
+                avg_ctr_mobile = excluded.avg_ctr_mobile,
+                competition_level = excluded.competition_level,
+                avg_ad_count = excluded.avg_ad_count,
+                data_source = excluded.data_source
+            WHERE keyword_timeseries.search_volume_pc IS NOT excluded.search_volume_pc
+               OR keyword_timeseries.search_volume_mobile IS NOT excluded.search_volume_mobile
+               OR keyword_timeseries.avg_click_pc IS NOT excluded.avg_click_pc
+               OR keyword_timeseries.avg_click_mobile IS NOT excluded.avg_click_mobile
+               OR keyword_timeseries.avg_ctr_pc IS NOT excluded.avg_ctr_pc
+               OR keyword_timeseries.avg_ctr_mobile IS NOT excluded.avg_ctr_mobile
+               OR keyword_timeseries.competition_level IS NOT excluded.competition_level
+               OR keyword_timeseries.avg_ad_count IS NOT excluded.avg_ad_count
+        """, [
+            dict(record, keyword_id=keyword_ids[keyword],
+                 record_date=record_date, data_source=source_file)
+            for keyword, record in records.items()
+        ])
+
+    return len(new_keywords)
+
+
+def collect_files(paths: List[Path]) -> List[Path]:
+    """파일/폴더 목록 → xlsx 파일 목록 (엑셀 임시 파일 ~$ 제외)"""
+    files = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(sorted(path.glob('*.xlsx')))
+        else:
+            files.append(path)
+    return [f for f in files if not f.name.startswith('~$')]
+
+
+def import_files(paths: List[Path], record_date: Optional[str] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE, use_cache: bool = True) -> Dict:
+    """
+    엑셀 파일 적재
+
+    Args:
+        paths: xlsx 파일 또는 폴더 목록
+        record_date: 수집일 (None이면 파일명의 YYYYMMDD, 없으면 오늘)
+        batch_size: 트랜잭션당 행 수
+        use_cache: 파싱 결과 캐시 사용 여부
+
+    Returns:
+        적재 통계
+    """
+    # 업그레이드 전 DB면 keyword_latest를 먼저 만들어 적재분이 트리거로 반영되게 함
+    prepare_for_write()
+    conn = connect()
+    stats = {'files': 0, 'rows': 0, 'skipped': 0, 'new_keywords': 0}
+    started = time.perf_counter()
+
+    for path in collect_files(paths):
+        file_date = record_date or record_date_from_filename(path) or date.today().isoformat()
+        batch: Dict[str, Dict] = {}
+        file_rows = 0
+
+        for record in iter_file_records(path, use_cache):
+            if record is None:
+                stats['skipped'] += 1
+                continue
+
+            # 같은 배치 안의 중복 키워드는 마지막 값 사용
+            batch[record['keyword']] = record
+            file_rows += 1
+
+            if len(batch) >= batch_size:
+                with stage('import.upsert', len(batch)):
+                    stats['new_keywords'] += upsert_batch(conn, batch, file_date, path.name)
+                batch = {}
+
+        if batch:
+            with stage('import.upsert', len(batch)):
+                stats['new_keywords'] += upsert_batch(conn, batch, file_date, path.name)
+
+        stats['files'] += 1
+        stats['rows'] += file_rows
+        print(f"   ✅ {path.name}: {file_rows:,}행 ({file_date})")
+
+    # 신규/시계열 변경 키워드의 저장 우선순위 재계산 (추천 조회가 쓰기 없이 읽도록)
+    stats['priority_refreshed'] = refresh_posting_priority(conn)
+    conn.close()
+
+    stats['elapsed'] = time.perf_counter() - started
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="네이버 키워드 도구 엑셀 적재")
+    parser.add_argument("paths", nargs="*", type=Path, default=[RAW_DATA_DIR],
+                        help="xlsx 파일 또는 폴더 (기본: data/row 네이버 키워드 폴더)")
+    parser.add_argument("--date", help="수집일 YYYY-MM-DD (기본: 파일명의 날짜)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="트랜잭션당 행 수")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="xlsx 파싱 캐시를 사용하지 않음")
+    args = parser.parse_args()
+
+    if args.date:
+        datetime.strptime(args.date, '%Y-%m-%d')
+
+    print("=" * 80)
+    print("📥 네이버 키워드 도구 엑셀 적재")
+    print("=" * 80 + "\n")
+
+    stats = import_files(args.paths, args.date, args.batch_size, use_cache=not args.no_cache)
+
+    elapsed = max(stats['elapsed'], 1e-9)
+    print("\n" + "=" * 80)
+    print(f"✅ 적재 완료: 파일 {stats['files']}개, {stats['rows']:,}행 "
+          f"({stats['rows'] / elapsed:,.0f} rows/s)")
+    print(f"   신규 키워드: {stats['new_keywords']:,}개 (자동 라벨링)")
+    print(f"   건너뛴 행: {stats['skipped']:,}개")
+    if stats['priority_refreshed']:
+        print(f"   우선순위 재계산: {stats['priority_refreshed']:,}개")
+    print("=" * 80)
+    print(f"\n💾 DB 위치: {DB_PATH}\n")
+
+
+if __name__ == "__main__":
+    main()
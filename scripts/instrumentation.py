@@ -0,0 +1,354 @@
+"""
+실행 시간 계측 (옵트인, 환경 변수 KEYWORD_PROFILE)
+느린 실행에서 시간이 SQL / 파이썬 처리(라벨링·점수·렌더링) / 파일 I/O 중 어디에 쓰이는지 확인
+
+- KEYWORD_PROFILE=1          종료 시 요약 표 출력 (stderr)
+- KEYWORD_PROFILE=out.json   요약 표 + JSON 저장
+- 켜져 있으면:
+  SQL   keyword_db.connect()가 계측 커넥션을 만듦 → 문장별 호출 수/시간(execute~fetch)/반환 행 수
+        + set_trace_callback으로 SQLite가 실제 실행한 횟수 (executemany 행 수, 트리거 실행 포함)
+  단계  stage('이름')/@timed('이름')로 감싼 구간 → 호출 수/시간/처리 행 수 + 그 안의 SQL 시간
+- 꺼져 있으면: stage()는 공용 빈 컨텍스트, @timed는 함수를 그대로 반환, 커넥션도 기본 클래스
+  → 계측 코드가 있어도 추가 비용 없음 (행 단위 반복문 안에는 두지 않음)
+
+사용법:
+    KEYWORD_PROFILE=1 python3 scripts/blog_automation_helper.py
+    KEYWORD_PROFILE=profile.json python3 scripts/reclassify_keywords_subpersona.py --full
+
+    from instrumentation import stage, timed
+    with stage('reclassify.label') as s:
+        changes = label_keywords(rows)
+        s.add(len(rows))
+"""
+
+import atexit
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+PROFILE = os.environ.get('KEYWORD_PROFILE', '')
+ENABLED = PROFILE not in ('', '0')
+
+# 요약 표에 보여줄 SQL 문장 수 (시간순)
+TOP_STATEMENTS = 15
+
+# 표에서 SQL 문장을 자르는 길이 (JSON에는 전체)
+SQL_DISPLAY_WIDTH = 70
+
+_WHITESPACE = re.compile(r'\s+')
+
+_lock = threading.Lock()
+_local = threading.local()
+_started = time.perf_counter()
+# 이름 → [호출 수, 시간, 행 수, SQL 시간]
+_stages: Dict[str, list] = {}
+# 정규화된 SQL → [호출 수, 시간, 행 수, SQLite 실행 수(trace)]
+_statements: Dict[str, list] = {}
+# SQL 문자열 → 정규화 결과 (반복 쿼리는 상수 문자열이라 한 번만 정규화)
+_normalized: Dict[str, str] = {}
+
+
+def _entry(sql: str) -> list:
+    key = _normalized.get(sql)
+    if key is None:
+        key = _normalized[sql] = _WHITESPACE.sub(' ', sql).strip()
+    entry = _statements.get(key)
+    if entry is None:
+        entry = _statements[key] = [0, 0.0, 0, 0]
+    return entry
+
+
+def _record_sql(sql: str, seconds: float, rows: int = 0, calls: int = 1):
+    with _lock:
+        entry = _entry(sql)
+        entry[0] += calls
+        entry[1] += seconds
+        entry[2] += rows
+    # 실행 중인 단계 전체에 SQL 시간 누적 (중첩 단계는 바깥 단계에도 포함)
+    for active in getattr(_local, 'stack', ()):
+        active.sql_seconds += seconds
+
+
+def _trace(_expanded_sql: str):
+    """
+    set_trace_callback: SQLite가 문장(트리거 본문 포함)을 실행할 때마다 호출
+
+    전달되는 SQL은 값이 치환된 문장이라 키로 쓰지 않고, 지금 커서가 실행 중인 문장에 횟수만 더함
+    """
+    sql = getattr(_local, 'sql', None)
+    if sql is not None:
+        with _lock:
+            _entry(sql)[3] += 1
+
+
+# ============================================================
+# 단계 타이머
+# ============================================================
+
+class _Stage:
+    """stage() 컨텍스트 (켜져 있을 때만 생성)"""
+
+    __slots__ = ('name', 'rows', 'sql_seconds', '_started')
+
+    def __init__(self, name: str, rows: int):
+        self.name = name
+        self.rows = rows
+        self.sql_seconds = 0.0
+
+    def add(self, rows: int):
+        """처리 행 수 누적"""
+        self.rows += rows
+
+    def __enter__(self):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(self)
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self._started
+        _local.stack.pop()
+        with _lock:
+            entry = _stages.get(self.name)
+            if entry is None:
+                entry = _stages[self.name] = [0, 0.0, 0, 0.0]
+            entry[0] += 1
+            entry[1] += elapsed
+            entry[2] += self.rows
+            entry[3] += self.sql_seconds
+        return False
+
+
+class _NullStage:
+    """꺼져 있을 때 stage()가 돌려주는 공용 객체"""
+
+    __slots__ = ()
+
+    def add(self, rows: int):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+def stage(name: str, rows: int = 0):
+    """
+    구간 타이머 (with 문)
+
+    Args:
+        name: 단계 이름 ('reclassify.label' 등, 같은 이름은 합산)
+        rows: 처리 행 수 (구간 안에서 .add()로 누적 가능)
+    """
+    if not ENABLED:
+        return _NULL_STAGE
+    return _Stage(name, rows)
+
+
+def timed(name: str, rows: Optional[Callable] = None) -> Callable:
+    """
+    함수 전체를 stage(name)으로 감싸는 데코레이터 (꺼져 있으면 함수를 그대로 반환)
+
+    Args:
+        rows: 반환값 → 처리 행 수 (예: len)
+    """
+    def decorate(func):
+        if not ENABLED:
+            return func
+
+        def wrapper(*args, **kwargs):
+            with _Stage(name, 0) as active:
+                result = func(*args, **kwargs)
+                if rows is not None:
+                    active.add(rows(result))
+                return result
+
+        wrapper.__name__ = func.__name__
+        wrapper.__qualname__ = func.__qualname__
+        wrapper.__doc__ = func.__doc__
+        wrapper.__wrapped__ = func
+        return wrapper
+    return decorate
+
+
+# ============================================================
+# SQL 계측 커넥션 (keyword_db.connect가 켜져 있을 때만 사용)
+# ============================================================
+
+class ProfiledCursor(sqlite3.Cursor):
+    """execute부터 fetch까지 시간/행 수를 마지막 문장에 기록"""
+
+    _sql = None
+
+    def execute(self, sql, parameters=()):
+        self._sql = _local.sql = sql
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            _record_sql(sql, time.perf_counter() - started)
+
+    def executemany(self, sql, seq_of_parameters):
+        self._sql = _local.sql = sql
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            # 행마다 실행되는 횟수는 trace 집계(SQLite 실행 수)로 확인
+            _record_sql(sql, time.perf_counter() - started, rows=max(self.rowcount, 0))
+
+    def executescript(self, sql_script):
+        self._sql = _local.sql = sql_script
+        started = time.perf_counter()
+        try:
+            return super().executescript(sql_script)
+        finally:
+            _record_sql(sql_script, time.perf_counter() - started)
+
+    def _fetched(self, started: float, rows: int):
+        if self._sql is not None:
+            _record_sql(self._sql, time.perf_counter() - started, rows, calls=0)
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(started, row is not None)
+        return row
+
+    def fetchmany(self, size=None):
+        started = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._fetched(started, len(rows))
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(started, len(rows))
+        return rows
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        started = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._fetched(started, 0)
+            raise
+        self._fetched(started, 1)
+        return row
+
+
+class ProfiledConnection(sqlite3.Connection):
+    """cursor()/execute()가 ProfiledCursor를 쓰는 커넥션"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.set_trace_callback(_trace)
+
+    def cursor(self, factory=ProfiledCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+
+def connection_factory():
+    """keyword_db.connect()에 넘길 커넥션 클래스 (꺼져 있으면 기본 클래스)"""
+    return ProfiledConnection if ENABLED else sqlite3.Connection
+
+
+# ============================================================
+# 요약
+# ============================================================
+
+def summary() -> Dict:
+    """단계/SQL 집계 (JSON으로 저장 가능한 값)"""
+    with _lock:
+        stages = {name: {
+            'calls': calls,
+            'seconds': round(seconds, 6),
+            'sql_seconds': round(sql_seconds, 6),
+            'python_seconds': round(max(seconds - sql_seconds, 0.0), 6),
+            'rows': rows,
+        } for name, (calls, seconds, rows, sql_seconds) in _stages.items()}
+        statements = [{
+            'sql': sql,
+            'calls': calls,
+            'sqlite_executions': executions,
+            'seconds': round(seconds, 6),
+            'rows': rows,
+        } for sql, (calls, seconds, rows, executions) in _statements.items()]
+    statements.sort(key=lambda item: item['seconds'], reverse=True)
+    return {
+        'argv': sys.argv,
+        'total_seconds': round(time.perf_counter() - _started, 6),
+        'sql_seconds': round(sum(item['seconds'] for item in statements), 6),
+        'stages': stages,
+        'statements': statements,
+    }
+
+
+def print_summary(data: Dict, file=sys.stderr):
+    """요약 표 출력"""
+    print("\n" + "=" * 80, file=file)
+    print(f"⏱️  실행 프로파일: 전체 {data['total_seconds']:.3f}초 / SQL {data['sql_seconds']:.3f}초",
+          file=file)
+    print("=" * 80, file=file)
+
+    if data['stages']:
+        print(f"\n{'단계':<32} {'호출':>6} {'시간(초)':>10} {'SQL(초)':>10} {'파이썬(초)':>10} {'행':>10}",
+              file=file)
+        print("-" * 84, file=file)
+        for name, item in sorted(data['stages'].items(), key=lambda kv: kv[1]['seconds'], reverse=True):
+            print(f"{name:<32} {item['calls']:>6,} {item['seconds']:>10.4f} {item['sql_seconds']:>10.4f}"
+                  f" {item['python_seconds']:>10.4f} {item['rows']:>10,}", file=file)
+
+    statements = data['statements']
+    if statements:
+        # SQLite 실행 수가 호출 수보다 많으면 executemany 행 수 또는 트리거 실행
+        print(f"\n🗄️  SQL 상위 {min(TOP_STATEMENTS, len(statements))}개 (시간순)", file=file)
+        print(f"\n{'호출':>7} {'SQLite 실행':>11} {'시간(초)':>10} {'평균(ms)':>9} {'행':>10}  문장", file=file)
+        print("-" * 120, file=file)
+        for item in statements[:TOP_STATEMENTS]:
+            average = item['seconds'] / item['calls'] * 1000 if item['calls'] else 0.0
+            sql = item['sql']
+            if len(sql) > SQL_DISPLAY_WIDTH:
+                sql = sql[:SQL_DISPLAY_WIDTH - 1] + '…'
+            print(f"{item['calls']:>7,} {item['sqlite_executions']:>11,} {item['seconds']:>10.4f}"
+                  f" {average:>9.3f} {item['rows']:>10,}  {sql}", file=file)
+
+
+def _dump_at_exit():
+    data = summary()
+    print_summary(data)
+    if PROFILE.endswith('.json'):
+        path = Path(PROFILE)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"\n📝 프로파일 저장: {path}", file=sys.stderr)
+
+
+if ENABLED:
+    atexit.register(_dump_at_exit)
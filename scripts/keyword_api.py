@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+키워드/페르소나 DB 조회 HTTP API (asyncio, 읽기 전용)
+다른 PC(콘텐츠팀, 카피라이터 도구)에서 추천 키워드/키워드 컨텍스트/프롬프트를 조회
+
+- GET /recommendations?limit=10&min_volume=1000&exclude_posted=1&one_per_cluster=1
+      → BlogAutomationHelper.get_recommended_keywords_for_posting
+- GET /keywords/{keyword_id}/context → IntegratedBlogWorkflow.get_keyword_full_context
+- GET /keywords/{keyword_id}/prompt  → IntegratedBlogWorkflow.generate_full_blog_prompt
+- GET /sub-personas, /sub-personas/{id}/keywords?limit=10&unposted_first=1 (선택 화면용)
+- GET /health, /stats
+- limit은 1~MAX_LIMIT, min_volume은 0 이상만 허용 (범위 밖은 400)
+
+- 요청 파싱/응답은 async_http (mock_llm_server.py와 같은 keep-alive 처리)
+- DB 조회는 읽기 스레드 풀(--readers)에서 실행 → 이벤트 루프는 막히지 않음
+  스레드마다 헬퍼/워크플로우 하나씩 (커넥션은 keyword_db 공용 풀에서 대여)
+- 응답 캐시 + ETag: DB 세대(PRAGMA data_version이 바뀔 때마다 +1) 기준
+  → DB가 그대로면 같은 요청은 캐시 응답, If-None-Match가 맞으면 304 (본문 없음)
+  → 프롬프트는 제목/본문 템플릿 버전도 ETag에 포함 (템플릿 수정 시 새 응답)
+- 같은 요청이 동시에 들어오면 한 번만 계산하고 결과를 나눠 씀
+
+사용법:
+    python3 scripts/keyword_api.py --host 0.0.0.0 --port 8700 --readers 4
+    curl http://127.0.0.1:8700/recommendations?limit=5
+    python3 scripts/api_load_test.py --url http://127.0.0.1:8700 --requests 2000
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import keyword_db
+from async_http import BadRequest, HTTPError, read_request, write_response
+from blog_automation_helper import BlogAutomationHelper
+from integrated_blog_workflow import IntegratedBlogWorkflow
+from prompt_templates import CHECK_INTERVAL, REGISTRY
+
+DEFAULT_PORT = 8700
+DEFAULT_READERS = 4
+
+# 응답 캐시 최대 항목 수 (가장 오래 안 쓴 것부터 버림)
+RESPONSE_CACHE_SIZE = 4096
+
+# 쿼리 파라미터 허용 범위 (SQLite는 음수 LIMIT을 무제한으로 처리하므로 범위 밖은 400)
+MAX_LIMIT = 500
+MAX_MIN_VOLUME = 10 ** 9
+
+
+class RequestError(Exception):
+    """잘못된 요청 (상태 코드 포함)"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _int_param(query: Dict, name: str, default: int, minimum: int, maximum: int) -> int:
+    value = query.get(name, [None])[-1]
+    if value is None:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise RequestError(400, f"{name}는 정수여야 합니다: {value}")
+    if not minimum <= number <= maximum:
+        raise RequestError(400, f"{name}는 {minimum}~{maximum} 범위여야 합니다: {number}")
+    return number
+
+
+def _bool_param(query: Dict, name: str, default: bool) -> bool:
+    value = query.get(name, [None])[-1]
+    if value is None:
+        return default
+    return value.lower() not in ('0', 'false', 'no', '')
+
+
+class KeywordAPIServer:
+    """키워드 DB 조회 API 서버"""
+
+    def __init__(self, readers: int = DEFAULT_READERS, cache_size: int = RESPONSE_CACHE_SIZE,
+                 use_prompt_cache: bool = True):
+        """
+        Args:
+            readers: DB 조회 스레드 수 (읽기 풀 크기)
+            cache_size: 응답 캐시 최대 항목 수 (0이면 캐시 없음, ETag/304는 그대로)
+            use_prompt_cache: 프롬프트 결과 캐시(prompt_cache.db) 사용
+        """
+        self.readers = readers
+        self.cache_size = cache_size
+        self.use_prompt_cache = use_prompt_cache
+        self.executor = ThreadPoolExecutor(readers, thread_name_prefix='keyword-api')
+        self._local = threading.local()
+        self._workers = []
+        self._workers_lock = threading.Lock()
+
+        # DB 세대: 전용 커넥션의 data_version (다른 커넥션이 커밋하면 바뀜)이 바뀔 때마다 +1
+        # 서버 시작 시각을 ETag 앞에 붙여 재시작 전 ETag와 섞이지 않게 함
+        self._version_conn = keyword_db.connect()
+        self._data_version = None
+        self.generation = 0
+        self.boot_id = f"{int(time.time()):x}"
+        self._templates = ''
+        self._templates_checked = float('-inf')
+
+        # 요청 경로 → [세대, 템플릿 버전, ETag, 본문]
+        self._responses: OrderedDict = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # 열린 keep-alive 커넥션 (처리 태스크 → writer), 종료 시 닫아서 핸들러가 정상 종료되게 함
+        self._connections: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self.stats = {'requests': 0, 'hits': 0, 'misses': 0, 'not_modified': 0,
+                      'errors': 0, 'generations': 0}
+
+        self.routes: Dict[str, Callable] = {
+            'recommendations': self._recommendations,
+            'sub-personas': self._sub_personas,
+            'keywords': self._keyword,
+        }
+
+    # ------------------------------------------------------------
+    # 읽기 스레드 (스레드마다 헬퍼/워크플로우 하나)
+    # ------------------------------------------------------------
+
+    def _worker(self) -> Tuple[BlogAutomationHelper, IntegratedBlogWorkflow]:
+        worker = getattr(self._local, 'worker', None)
+        if worker is None:
+            worker = self._local.worker = (
+                BlogAutomationHelper(), IntegratedBlogWorkflow(use_cache=self.use_prompt_cache))
+            with self._workers_lock:
+                self._workers.append(worker)
+        return worker
+
+    def _recommendations(self, parts, query) -> Dict:
+        if parts:
+            raise RequestError(404, "/recommendations")
+        helper, _ = self._worker()
+        keywords = helper.get_recommended_keywords_for_posting(
+            limit=_int_param(query, 'limit', 10, 1, MAX_LIMIT),
+            min_volume=_int_param(query, 'min_volume', 1000, 0, MAX_MIN_VOLUME),
+            exclude_posted=_bool_param(query, 'exclude_posted', True),
+            one_per_cluster=_bool_param(query, 'one_per_cluster', True),
+        )
+        return {'count': len(keywords), 'keywords': keywords}
+
+    def _sub_personas(self, parts, query) -> Dict:
+        _, workflow = self._worker()
+        if not parts:
+            personas = workflow.index.sub_personas()
+            return {'count': len(personas), 'sub_personas': personas}
+        if len(parts) != 2 or parts[1] != 'keywords':
+            raise RequestError(404, "/sub-personas/{id}/keywords")
+        keywords = workflow.index.keywords_by_sub_persona(
+            parts[0],
+            limit=_int_param(query, 'limit', 10, 1, MAX_LIMIT),
+            min_volume=_int_param(query, 'min_volume', 1, 0, MAX_MIN_VOLUME),
+            unposted_first=_bool_param(query, 'unposted_first', False),
+        )
+        return {'sub_persona_id': parts[0], 'count': len(keywords), 'keywords': keywords}
+
+    def _keyword(self, parts, query) -> Dict:
+        # isdigit()만으로는 '²', '٣' 같은 유니코드 숫자도 통과 → ASCII 숫자만 허용
+        if (len(parts) != 2 or parts[1] not in ('context', 'prompt')
+                or not (parts[0].isascii() and parts[0].isdigit())):
+            raise RequestError(404, "/keywords/{keyword_id}/context|prompt")
+        keyword_id = int(parts[0])
+        _, workflow = self._worker()
+        if parts[1] == 'context':
+            result = workflow.get_keyword_full_context(keyword_id)
+        else:
+            result = workflow.generate_full_blog_prompt(keyword_id)
+        if not result:
+            raise RequestError(404, f"키워드 없음: {keyword_id}")
+        return {'keyword_id': keyword_id, **result}
+
+    def _compute(self, target: str) -> bytes:
+        """요청 경로 → JSON 본문 (읽기 스레드에서 실행)"""
+        parts = urlsplit(target)
+        segments = [unquote(segment) for segment in parts.path.strip('/').split('/') if segment]
+        route = self.routes.get(segments[0]) if segments else None
+        if route is None:
+            raise RequestError(404, parts.path)
+        payload = route(segments[1:], parse_qs(parts.query))
+        return json.dumps(payload, ensure_ascii=False).encode('utf-8')
+
+    def close_workers(self):
+        """읽기 스레드 종료 + 프롬프트 캐시 저장/커넥션 반납"""
+        self.executor.shutdown(wait=True)
+        with self._workers_lock:
+            for helper, workflow in self._workers:
+                workflow.close()
+                helper.close()
+            self._workers.clear()
+        self._version_conn.close()
+
+    # ------------------------------------------------------------
+    # 응답 캐시 / ETag
+    # ------------------------------------------------------------
+
+    def _check_generation(self):
+        """data_version이 바뀌었으면 세대 +1, 응답 캐시 비움"""
+        version = self._version_conn.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._data_version:
+            if self._data_version is not None:
+                self.generation += 1
+                self.stats['generations'] += 1
+                self._responses.clear()
+            self._data_version = version
+
+    def _template_versions(self, target: str) -> str:
+        """프롬프트 요청이면 제목/본문 템플릿 + 심리 변수 버전 해시 (아니면 '')"""
+        if not urlsplit(target).path.endswith('/prompt'):
+            return ''
+        # 세부 페르소나별 템플릿 파일이 따로 있어 전체 목록의 버전을 합침
+        # (폴더 확인은 REGISTRY와 같은 CHECK_INTERVAL마다 한 번)
+        now = time.monotonic()
+        if now - self._templates_checked >= CHECK_INTERVAL:
+            versions = [REGISTRY.vars_version('persona_psychology')]
+            for kind in ('title', 'body'):
+                versions += [REGISTRY.template_version(kind, path.stem)
+                             for path in sorted((REGISTRY.template_dir / kind).glob('*.txt'))]
+            self._templates = hashlib.sha1('|'.join(versions).encode('ascii')).hexdigest()[:8]
+            self._templates_checked = now
+        return self._templates
+
+    def _etag(self, generation: int, templates: str) -> str:
+        tag = f"{self.boot_id}-{generation}"
+        return f'"{tag}-{templates}"' if templates else f'"{tag}"'
+
+    async def _cached(self, target: str, templates: str) -> Tuple[str, bytes, bool]:
+        """(ETag, 본문, 캐시 hit) - 같은 요청이 계산 중이면 그 결과를 기다림"""
+        entry = self._responses.get(target)
+        if entry is not None and entry[0] == self.generation and entry[1] == templates:
+            self._responses.move_to_end(target)
+            return entry[2], entry[3], True
+
+        pending = self._inflight.get(target)
+        if pending is not None:
+            etag, body = await asyncio.shield(pending)
+            return etag, body, True
+
+        generation = self.generation
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[target] = future
+        try:
+            body = await asyncio.get_running_loop().run_in_executor(self.executor, self._compute, target)
+        except BaseException as e:
+            future.set_exception(e)
+            # 기다리는 요청이 없어도 "예외를 꺼내지 않음" 경고가 나지 않게
+            future.exception()
+            raise
+        finally:
+            del self._inflight[target]
+
+        etag = self._etag(generation, templates)
+        future.set_result((etag, body))
+        if self.cache_size and generation == self.generation:
+            self._responses[target] = [generation, templates, etag, body]
+            if len(self._responses) > self.cache_size:
+                self._responses.popitem(last=False)
+        return etag, body, False
+
+    # ------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------
+
+    async def handle(self, method: str, target: str, headers: Dict[str, str]) -> tuple:
+        """요청 → (상태 코드, 본문, 추가 헤더)"""
+        if method != 'GET':
+            return 405, {'error': f"GET만 지원합니다: {method}"}, {'Allow': 'GET'}
+        if target == '/health':
+            return 200, {'status': 'ok'}, {}
+        if target == '/stats':
+            return 200, {**self.stats, 'generation': self.generation,
+                         'cached_responses': len(self._responses), 'readers': self.readers}, {}
+
+        self.stats['requests'] += 1
+        self._check_generation()
+        templates = self._template_versions(target)
+
+        # DB/템플릿이 그대로면 ETag도 그대로 → 계산 없이 304
+        current = self._etag(self.generation, templates)
+        if headers.get('if-none-match') == current:
+            self.stats['not_modified'] += 1
+            return 304, b'', {'ETag': current, 'Cache-Control': 'no-cache'}
+
+        try:
+            etag, body, hit = await self._cached(target, templates)
+        except RequestError as e:
+            self.stats['errors'] += 1
+            return e.status, {'error': str(e)}, {}
+        except Exception as e:
+            self.stats['errors'] += 1
+            return 500, {'error': f"{type(e).__name__}: {e}"}, {}
+
+        self.stats['hits' if hit else 'misses'] += 1
+        response_headers = {'ETag': etag, 'Cache-Control': 'no-cache',
+                            'X-Cache': 'hit' if hit else 'miss'}
+        if headers.get('if-none-match') == etag:
+            self.stats['not_modified'] += 1
+            return 304, b'', response_headers
+        return 200, body, response_headers
+
+    async def serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """keep-alive 커넥션 하나 처리"""
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except BadRequest as e:
+                    # 형식이 잘못된 요청: 400 후 연결 종료 (이후 바이트는 신뢰할 수 없음)
+                    self.stats['errors'] += 1
+                    body = json.dumps({'error': str(e)}, ensure_ascii=False).encode('utf-8')
+                    await write_response(writer, 400, body, {'Connection': 'close'})
+                    break
+                if request is None:
+                    break
+                method, target, headers, _ = request
+                status, payload, response_headers = await self.handle(method, target, headers)
+                if not isinstance(payload, bytes):
+                    payload = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                await write_response(writer, status, payload, response_headers)
+        except (ConnectionError, HTTPError, ValueError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+
+    async def start(self, host: str = '127.0.0.1', port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        """서버 시작 (port=0이면 빈 포트 자동 선택)"""
+        return await asyncio.start_server(self.serve_connection, host, port)
+
+    async def shutdown(self, listener: asyncio.AbstractServer):
+        """
+        서버 종료: 리스너 닫기 → 열린 keep-alive 커넥션 닫기 → 핸들러 종료 대기 → 읽기 스레드 정리
+
+        커넥션을 닫으면 readline에서 대기 중인 핸들러가 EOF를 받아 정상 종료
+        (닫지 않으면 asyncio.run이 핸들러를 취소해 CancelledError 트레이스백이 남음)
+        """
+        listener.close()
+        for writer in list(self._connections.values()):
+            writer.close()
+        if self._connections:
+            await asyncio.gather(*self._connections, return_exceptions=True)
+        await listener.wait_closed()
+        self.close_workers()
+
+
+async def _main(args):
+    server = KeywordAPIServer(args.readers, args.cache_size, not args.no_prompt_cache)
+    listener = await server.start(args.host, args.port)
+
+    print("=" * 80)
+    print("🌐 키워드 DB 조회 API")
+    print("=" * 80)
+    print(f"\n   주소: http://{args.host}:{args.port}")
+    print(f"   읽기 스레드: {args.readers}개 / 응답 캐시: {args.cache_size:,}개")
+    print(f"   DB: {keyword_db.DB_PATH}")
+    print("\n   GET /recommendations?limit=10&min_volume=1000")
+    print("   GET /keywords/{keyword_id}/context")
+    print("   GET /keywords/{keyword_id}/prompt")
+    print("   GET /sub-personas, /sub-personas/{id}/keywords")
+    print("   GET /stats")
+    print("\n   Ctrl+C로 종료\n")
+
+    try:
+        await listener.serve_forever()
+    finally:
+        await server.shutdown(listener)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="키워드 DB 조회 HTTP API")
+    parser.add_argument("--host", default='127.0.0.1', help="다른 PC에서 접속하려면 0.0.0.0")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--readers", type=int, default=DEFAULT_READERS, help="DB 조회 스레드 수")
+    parser.add_argument("--cache-size", type=int, default=RESPONSE_CACHE_SIZE,
+                        help="응답 캐시 항목 수 (0 = 캐시 없음)")
+    parser.add_argument("--no-prompt-cache", action="store_true", help="프롬프트 결과 캐시 미사용")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        print("\n👋 종료합니다.")
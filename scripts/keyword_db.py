@@ -0,0 +1,587 @@
+"""
+키워드 페르소나 DB 공용 접근 모듈
+커넥션 풀 + PRAGMA 프로파일 + 반복 쿼리(준비된 구문 캐시) 모음
+
+모든 스크립트는 sqlite3.connect(DB_PATH) 대신 이 모듈을 사용한다.
+- 클래스형 스크립트: get_pool().acquire() / release()
+- 업그레이드 스크립트: connect() (단발성 커넥션)
+- 쓰기 스크립트(적재/재분류/트렌드/스케줄러)와 업그레이드 스크립트만 스키마를 바꾼다
+  (connect()는 keyword_latest 유무만 확인, 생성은 ensure_latest_snapshot)
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import instrumentation
+
+# DB 위치 설정 (환경 변수)
+# - KEYWORD_DATA_ROOT: 데이터 루트 (버티컬별 DB는 customers/<vertical>/keyword/ 아래)
+# - KEYWORD_VERTICAL: 단일 DB 스크립트가 사용할 버티컬 (상품군/고객사, 기본 cctv)
+# - KEYWORD_DB_PATH: DB 파일 직접 지정 (벤치마크용 합성 DB 등, 버티컬 설정보다 우선)
+DATA_ROOT = Path(os.environ.get('KEYWORD_DATA_ROOT', "/home/tlswk/careon/data"))
+CUSTOMERS_DIR = DATA_ROOT / "customers"
+VERTICAL = os.environ.get('KEYWORD_VERTICAL', 'cctv')
+KEYWORD_DB_NAME = "keyword_persona.db"
+
+# 같은 폴더의 캐시 DB (prompt_cache.db, llm_response_cache.db) - 샤드 목록에서 제외
+CACHE_DB_SUFFIX = "_cache.db"
+
+
+def vertical_db_path(vertical: str) -> Path:
+    """버티컬의 키워드 DB 경로"""
+    return CUSTOMERS_DIR / vertical / "keyword" / KEYWORD_DB_NAME
+
+
+DB_PATH = Path(os.environ.get('KEYWORD_DB_PATH', vertical_db_path(VERTICAL)))
+
+# PRAGMA 프로파일
+# - WAL: 읽기와 쓰기가 서로 막지 않음 (프롬프트 생성기 동시 실행)
+# - synchronous=NORMAL: WAL에서는 커밋마다 fsync 하지 않아도 DB 손상 없음
+# - cache_size 음수는 KiB 단위 (64MB), mmap_size는 바이트 단위 (256MB)
+# - busy_timeout: 쓰기 잠금 충돌 시 즉시 실패하지 않고 대기 (ms)
+PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -64000,
+    'mmap_size': 268435456,
+    'temp_store': 'MEMORY',
+    'busy_timeout': 5000,
+}
+
+# 커넥션별 준비된 구문(prepared statement) 캐시 크기
+# sqlite3 모듈은 SQL 문자열 단위로 캐시하므로 반복 쿼리는 아래 상수를 그대로 사용
+STATEMENT_CACHE_SIZE = 256
+
+# 풀에 유휴 상태로 보관할 최대 커넥션 수
+POOL_SIZE = 4
+
+
+# ============================================================
+# 반복 쿼리
+# ============================================================
+
+# 검색 지표는 keyword_latest(키워드별 최신 스냅샷)와 조인
+# → 시계열 날짜 수와 무관하게 키워드당 한 행
+
+SQL_SUB_PERSONAS = """
+    SELECT sub_persona_id, sub_persona_name, description,
+           priority_level, content_strategy,
+           template_id, landing_url, funnel_strategy, cta_text
+    FROM sub_personas
+    ORDER BY sub_persona_id
+"""
+
+SQL_KEYWORD_FULL_CONTEXT = """
+    SELECT k.keyword, k.sub_persona_id,
+           sp.sub_persona_name, sp.description, sp.content_strategy,
+           sp.template_id, sp.landing_url, sp.funnel_strategy, sp.cta_text,
+           sp.priority_level,
+           kt.search_volume_total, kt.competition_level, kt.avg_ad_count
+    FROM keywords_master k
+    JOIN sub_personas sp ON k.sub_persona_id = sp.sub_persona_id
+    LEFT JOIN keyword_latest kt ON k.keyword_id = kt.keyword_id
+    WHERE k.keyword_id = ?
+"""
+
+# 배치용: 조건은 fetch_keyword_contexts가 WHERE/ORDER BY로 붙인다
+SQL_KEYWORD_CONTEXTS = """
+    SELECT k.keyword_id, k.keyword, k.sub_persona_id,
+           sp.sub_persona_name, sp.description, sp.content_strategy,
+           sp.template_id, sp.landing_url, sp.funnel_strategy, sp.cta_text,
+           sp.priority_level,
+           kt.search_volume_total, kt.competition_level, kt.avg_ad_count
+    FROM keywords_master k
+    JOIN sub_personas sp ON k.sub_persona_id = sp.sub_persona_id
+    LEFT JOIN keyword_latest kt ON k.keyword_id = kt.keyword_id
+"""
+
+SQL_TOP_KEYWORDS = """
+    SELECT k.keyword_id, k.keyword, k.persona_id, p.persona_name,
+           kt.search_volume_total, kt.competition_level,
+           kt.avg_ad_count, k.confidence_score
+    FROM keywords_master k
+    JOIN customer_personas p ON k.persona_id = p.persona_id
+    LEFT JOIN keyword_latest kt ON k.keyword_id = kt.keyword_id
+    WHERE kt.search_volume_total > 0
+    ORDER BY kt.search_volume_total DESC
+    LIMIT ?
+"""
+
+SQL_TOP_KEYWORDS_BY_PERSONA = """
+    SELECT k.keyword_id, k.keyword, k.persona_id, p.persona_name,
+           kt.search_volume_total, kt.competition_level,
+           kt.avg_ad_count, k.confidence_score
+    FROM keywords_master k
+    JOIN customer_personas p ON k.persona_id = p.persona_id
+    LEFT JOIN keyword_latest kt ON k.keyword_id = kt.keyword_id
+    WHERE kt.search_volume_total > 0 AND k.persona_id = ?
+    ORDER BY kt.search_volume_total DESC
+    LIMIT ?
+"""
+
+# 포스팅 이력(blog_posts)이 있는 키워드 제외 - 안티 조인 조건
+# idx_post_keyword 커버링 조회 한 번 (키워드별 별도 쿼리 없음, 상태 무관: draft도 진행 중으로 간주)
+SQL_NOT_POSTED = "NOT EXISTS (SELECT 1 FROM blog_posts bp WHERE bp.keyword_id = k.keyword_id)"
+
+# 근접 중복 클러스터 (keyword_similarity.py → keywords_master.cluster_id, 단독 키워드는 NULL)
+# - 대표 키워드만: 클러스터당 한 개 (같은 검색 의도 글끼리 경쟁 방지)
+# - 클러스터 안 다른 키워드에 포스팅 이력이 있으면 대표도 제외 (idx_keyword_cluster → idx_post_keyword)
+SQL_CLUSTER_REPRESENTATIVE = "(k.cluster_id IS NULL OR k.cluster_id = k.keyword_id)"
+SQL_CLUSTER_NOT_POSTED = """NOT EXISTS (
+    SELECT 1 FROM keywords_master c
+    JOIN blog_posts bp ON bp.keyword_id = c.keyword_id
+    WHERE c.cluster_id = k.cluster_id
+)"""
+
+SQL_KEYWORDS_BY_SUB_PERSONA = """
+    SELECT k.keyword_id, k.keyword, k.confidence_score,
+           kt.search_volume_total, kt.competition_level, kt.avg_ad_count
+    FROM keywords_master k
+    LEFT JOIN keyword_latest kt ON k.keyword_id = kt.keyword_id
+    WHERE k.sub_persona_id = ?
+    AND kt.search_volume_total >= ?
+    ORDER BY kt.search_volume_total DESC
+    LIMIT ?
+"""
+
+# 포스팅하지 않은 키워드를 먼저, 포스팅한 키워드는 뒤로 (posted = 0/1)
+SQL_KEYWORDS_BY_SUB_PERSONA_UNPOSTED_FIRST = f"""
+    SELECT k.keyword_id, k.keyword, k.confidence_score,
+           kt.search_volume_total, kt.competition_level, kt.avg_ad_count,
+           NOT {SQL_NOT_POSTED} AS posted
+    FROM keywords_master k
+    LEFT JOIN keyword_latest kt ON k.keyword_id = kt.keyword_id
+    WHERE k.sub_persona_id = ?
+    AND kt.search_volume_total >= ?
+    ORDER BY posted, kt.search_volume_total DESC
+    LIMIT ?
+"""
+
+# 최근 분석일(analyze_trends.py → keyword_changes) 기준 검색량 급상승 키워드
+# 분석일 조회는 idx_changes_period_date, 변화율이 NULL(기준 검색량 0)인 신규 상승은 뒤로
+SQL_RISING_KEYWORDS = """
+    SELECT k.keyword_id, k.keyword, k.sub_persona_id,
+           c.analysis_date, c.volume_change_pct, c.volume_change_abs,
+           c.alert_level, kt.search_volume_total
+    FROM keyword_changes c
+    JOIN keywords_master k ON k.keyword_id = c.keyword_id
+    LEFT JOIN keyword_latest kt ON k.keyword_id = kt.keyword_id
+    WHERE c.period_days = ?
+    AND c.analysis_date = (SELECT MAX(analysis_date) FROM keyword_changes WHERE period_days = ?)
+    AND c.trend = 'increasing'
+    ORDER BY c.volume_change_pct DESC, c.volume_change_abs DESC
+    LIMIT ?
+"""
+
+
+# ============================================================
+# 최신 스냅샷 테이블 (keyword_latest)
+# ============================================================
+
+# 조회 SQL이 모두 keyword_latest와 조인한다. 업그레이드 전 DB는 쓰기 스크립트가
+# ensure_latest_snapshot으로 만들고 채움 (upgrade_latest_snapshot.py와 같은 정의),
+# 조회 전용 스크립트는 connect()에서 없다는 오류만 낸다
+
+LATEST_COLUMNS = """
+    keyword_id, record_date,
+    search_volume_pc, search_volume_mobile, search_volume_total,
+    avg_click_pc, avg_click_mobile, avg_ctr_pc, avg_ctr_mobile,
+    competition_level, avg_ad_count
+"""
+
+# keyword_id = rowid → 조인은 PK 조회 한 번
+SQL_CREATE_LATEST = """
+    CREATE TABLE IF NOT EXISTS keyword_latest (
+        keyword_id INTEGER PRIMARY KEY,
+        record_date DATE NOT NULL,
+        search_volume_pc INTEGER DEFAULT 0,
+        search_volume_mobile INTEGER DEFAULT 0,
+        search_volume_total INTEGER DEFAULT 0,
+        avg_click_pc FLOAT DEFAULT 0.0,
+        avg_click_mobile FLOAT DEFAULT 0.0,
+        avg_ctr_pc FLOAT DEFAULT 0.0,
+        avg_ctr_mobile FLOAT DEFAULT 0.0,
+        competition_level VARCHAR(20),
+        avg_ad_count INTEGER DEFAULT 0,
+        FOREIGN KEY (keyword_id) REFERENCES keywords_master(keyword_id)
+    )
+"""
+
+
+def _row_values(alias: str) -> str:
+    """트리거의 NEW/OLD 행 값 목록"""
+    return ', '.join(f"{alias}.{column.strip()}" for column in LATEST_COLUMNS.split(','))
+
+
+_LATEST_OF = """
+    INSERT OR REPLACE INTO keyword_latest ({columns})
+    SELECT {columns} FROM keyword_timeseries
+    WHERE keyword_id = {keyword_id}
+    ORDER BY record_date DESC
+    LIMIT 1;
+"""
+
+# 증분 유지 트리거
+# - INSERT: 새 행이 기존 최신보다 같거나 최근일 때만 교체 (과거 날짜 백필은 무시)
+# - UPDATE/DELETE: 해당 키워드의 최신 행을 시계열에서 다시 읽음 (인덱스 조회 한 번)
+LATEST_TRIGGERS = {
+    'trg_latest_ts_insert': f"""
+        CREATE TRIGGER IF NOT EXISTS trg_latest_ts_insert
+        AFTER INSERT ON keyword_timeseries
+        WHEN NEW.record_date >= COALESCE(
+            (SELECT record_date FROM keyword_latest WHERE keyword_id = NEW.keyword_id), '')
+        BEGIN
+            INSERT OR REPLACE INTO keyword_latest ({LATEST_COLUMNS})
+            VALUES ({_row_values('NEW')});
+        END
+    """,
+    'trg_latest_ts_update': f"""
+        CREATE TRIGGER IF NOT EXISTS trg_latest_ts_update
+        AFTER UPDATE ON keyword_timeseries
+        BEGIN
+            DELETE FROM keyword_latest WHERE keyword_id IN (OLD.keyword_id, NEW.keyword_id);
+            {_LATEST_OF.format(columns=LATEST_COLUMNS, keyword_id='OLD.keyword_id')}
+            {_LATEST_OF.format(columns=LATEST_COLUMNS, keyword_id='NEW.keyword_id')}
+        END
+    """,
+    'trg_latest_ts_delete': f"""
+        CREATE TRIGGER IF NOT EXISTS trg_latest_ts_delete
+        AFTER DELETE ON keyword_timeseries
+        WHEN OLD.record_date = (
+            SELECT record_date FROM keyword_latest WHERE keyword_id = OLD.keyword_id)
+        BEGIN
+            DELETE FROM keyword_latest WHERE keyword_id = OLD.keyword_id;
+            {_LATEST_OF.format(columns=LATEST_COLUMNS, keyword_id='OLD.keyword_id')}
+        END
+    """,
+}
+
+# 키워드별 최신 record_date 한 행으로 전체 재구성
+SQL_REBUILD_LATEST = f"""
+    INSERT INTO keyword_latest ({LATEST_COLUMNS})
+    SELECT {LATEST_COLUMNS}
+    FROM (
+        SELECT *, ROW_NUMBER() OVER (
+            PARTITION BY keyword_id ORDER BY record_date DESC
+        ) AS rn
+        FROM keyword_timeseries
+    )
+    WHERE rn = 1
+"""
+
+
+def create_latest_snapshot(conn: sqlite3.Connection):
+    """keyword_latest 테이블 + 증분 유지 트리거 생성 (이미 있으면 그대로)"""
+    conn.execute(SQL_CREATE_LATEST)
+    for ddl in LATEST_TRIGGERS.values():
+        conn.execute(ddl)
+
+
+def rebuild_latest_snapshot(conn: sqlite3.Connection):
+    """keyword_latest 전체 재구성 (커밋은 호출자)"""
+    conn.execute("DELETE FROM keyword_latest")
+    conn.execute(SQL_REBUILD_LATEST)
+
+
+def _has_table(conn: sqlite3.Connection, table: str) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone() is not None
+
+
+def ensure_latest_snapshot(conn: sqlite3.Connection) -> bool:
+    """
+    keyword_latest가 없으면 생성 + 채우기 (한 트랜잭션, 쓰기/업그레이드 스크립트 전용)
+
+    시계열 테이블이 없는 DB(빈 파일, 캐시 DB 등)는 건드리지 않음.
+    BEGIN IMMEDIATE로 쓰기 잠금을 먼저 잡고 다시 확인 → 여러 프로세스가 동시에 열어도 한 번만 채움
+
+    Returns:
+        새로 만들었으면 True
+    """
+    if _has_table(conn, 'keyword_latest') or not _has_table(conn, 'keyword_timeseries'):
+        return False
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if _has_table(conn, 'keyword_latest'):
+            conn.rollback()
+            return False
+        create_latest_snapshot(conn)
+        rebuild_latest_snapshot(conn)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return True
+
+
+# ============================================================
+# 커넥션
+# ============================================================
+
+# keyword_latest 확인을 마친 DB 파일 (Path.resolve() 기준)
+_schema_checked = set()
+
+# 공용 풀 목록 + _schema_checked 보호 (여러 스레드가 동시에 connect/get_pool)
+_pools_lock = threading.Lock()
+
+
+def check_latest_snapshot(conn: sqlite3.Connection, db_path: Path):
+    """
+    시계열이 있는 키워드 DB에 keyword_latest가 없으면 sqlite3.OperationalError
+
+    스키마는 바꾸지 않음 (조회 전용 스크립트/읽기 전용 DB 파일도 그대로 열림).
+    시계열 테이블이 없는 DB(캐시 DB 등)는 확인하지 않음.
+    """
+    if _has_table(conn, 'keyword_timeseries') and not _has_table(conn, 'keyword_latest'):
+        raise sqlite3.OperationalError(
+            f"keyword_latest 테이블이 없습니다: {db_path}\n"
+            f"   → python3 scripts/upgrade_latest_snapshot.py 실행 "
+            f"(또는 import_naver_keywords.py 등 쓰기 스크립트를 한 번 실행)")
+
+
+def connect(db_path: Path = DB_PATH, check_schema: bool = True) -> sqlite3.Connection:
+    """
+    PRAGMA 프로파일이 적용된 새 커넥션 생성
+
+    check_same_thread=False: 풀에서 꺼낸 커넥션을 다른 스레드에서 사용 가능
+    (한 시점에 한 스레드만 사용하는 것은 풀이 보장)
+    KEYWORD_PROFILE이 켜져 있으면 SQL 계측 커넥션 (instrumentation.py)
+    check_schema: keyword_latest 유무 확인 (프로세스당 DB 파일별 한 번).
+        쓰기/업그레이드 스크립트는 False로 열고 ensure_latest_snapshot 호출
+    """
+    conn = sqlite3.connect(
+        db_path,
+        check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        factory=instrumentation.connection_factory(),
+    )
+    conn.row_factory = sqlite3.Row
+
+    for name, value in PRAGMAS.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+
+    if check_schema:
+        key = Path(db_path).resolve()
+        with _pools_lock:
+            if key not in _schema_checked:
+                try:
+                    check_latest_snapshot(conn, db_path)
+                except sqlite3.Error:
+                    conn.close()
+                    raise
+                _schema_checked.add(key)
+
+    return conn
+
+
+def prepare_for_write(db_path: Path = DB_PATH) -> bool:
+    """
+    쓰기 스크립트 시작 시 호출: 업그레이드 전 DB면 keyword_latest 생성 + 채우기
+
+    Returns:
+        새로 만들었으면 True
+    """
+    conn = connect(db_path, check_schema=False)
+    try:
+        return ensure_latest_snapshot(conn)
+    finally:
+        conn.close()
+
+
+class ConnectionPool:
+    """
+    SQLite 커넥션 풀
+
+    유휴 커넥션을 재사용해 PRAGMA 설정과 준비된 구문 캐시를 유지한다.
+    유휴 커넥션이 없으면 새로 만들고(대기 없음), 반납 시 유휴 커넥션이
+    size개를 넘으면 닫는다.
+    """
+
+    def __init__(self, db_path: Path = DB_PATH, size: int = POOL_SIZE):
+        self.db_path = db_path
+        self.size = size
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def acquire(self) -> sqlite3.Connection:
+        """커넥션 대여"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return connect(self.db_path)
+
+    def release(self, conn: sqlite3.Connection):
+        """커넥션 반납 (열린 트랜잭션은 롤백해 잠금을 풀어둠)"""
+        if conn.in_transaction:
+            conn.rollback()
+
+        with self._lock:
+            if self._closed or self._idle.qsize() >= self.size:
+                conn.close()
+                return
+            self._idle.put_nowait(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """with 블록 동안 커넥션 대여"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close_all(self):
+        """유휴 커넥션 모두 닫기"""
+        with self._lock:
+            self._closed = True
+            while True:
+                try:
+                    self._idle.get_nowait().close()
+                except queue.Empty:
+                    break
+
+
+_pools: Dict[Path, ConnectionPool] = {}
+
+
+def get_pool(db_path: Path = DB_PATH) -> ConnectionPool:
+    """DB 파일별 공용 커넥션 풀 (str/상대 경로/심볼릭 링크로 불러도 같은 파일이면 같은 풀)"""
+    key = Path(db_path).resolve()
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(key)
+        return pool
+
+
+def discover_shards(root: Path = CUSTOMERS_DIR,
+                    verticals: Optional[List[str]] = None) -> Dict[str, Path]:
+    """
+    버티컬별 키워드 DB 목록 (root/<vertical>/keyword/*.db, 캐시 DB 제외)
+
+    샤드 이름은 버티컬 이름 (기본 파일명이 아니면 '<vertical>/<파일명>', 고객사별 DB 등)
+
+    Args:
+        verticals: 지정하면 해당 버티컬만
+    """
+    shards = {}
+    for path in sorted(root.glob("*/keyword/*.db")):
+        if path.name.endswith(CACHE_DB_SUFFIX):
+            continue
+        vertical = path.parent.parent.name
+        if verticals and vertical not in verticals:
+            continue
+        name = vertical if path.name == KEYWORD_DB_NAME else f"{vertical}/{path.stem}"
+        shards[name] = path
+    return shards
+
+
+# ============================================================
+# 조회 함수
+# ============================================================
+
+def fetch_sub_personas(conn: sqlite3.Connection) -> List[Dict]:
+    """세부 페르소나 목록 (퍼널 정보 포함)"""
+    return [dict(row) for row in conn.execute(SQL_SUB_PERSONAS).fetchall()]
+
+
+def fetch_keyword_full_context(conn: sqlite3.Connection, keyword_id: int) -> Dict:
+    """키워드의 전체 컨텍스트 (세부 페르소나 + 퍼널 + 검색 지표)"""
+    row = conn.execute(SQL_KEYWORD_FULL_CONTEXT, (keyword_id,)).fetchone()
+    return dict(row) if row else {}
+
+
+def fetch_keyword_contexts(conn: sqlite3.Connection,
+                           keyword_ids: Optional[List[int]] = None,
+                           persona_ids: Optional[List[int]] = None,
+                           sub_persona_ids: Optional[List[str]] = None,
+                           min_volume: Optional[int] = None,
+                           limit: Optional[int] = None,
+                           exclude_posted: bool = False) -> List[Dict]:
+    """
+    여러 키워드의 전체 컨텍스트를 쿼리 한 번으로 조회
+
+    ID/페르소나 목록은 json_each로 넘겨 개수와 무관하게 같은 SQL(준비된 구문 캐시)을 쓴다.
+    keyword_ids를 주면 그 순서대로, 아니면 검색량 내림차순으로 반환.
+    exclude_posted: blog_posts에 이력이 있는 키워드 제외 (안티 조인)
+    """
+    conditions = []
+    params = []
+
+    if keyword_ids is not None:
+        conditions.append("k.keyword_id IN (SELECT value FROM json_each(?))")
+        params.append(json.dumps(list(keyword_ids)))
+
+    persona_conditions = []
+    if persona_ids:
+        persona_conditions.append("k.persona_id IN (SELECT value FROM json_each(?))")
+        params.append(json.dumps(list(persona_ids)))
+    if sub_persona_ids:
+        persona_conditions.append("k.sub_persona_id IN (SELECT value FROM json_each(?))")
+        params.append(json.dumps(list(sub_persona_ids)))
+    if persona_conditions:
+        conditions.append(f"({' OR '.join(persona_conditions)})")
+
+    if min_volume is not None:
+        conditions.append("kt.search_volume_total >= ?")
+        params.append(min_volume)
+
+    if exclude_posted:
+        conditions.append(SQL_NOT_POSTED)
+
+    sql = SQL_KEYWORD_CONTEXTS
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    if keyword_ids is None:
+        sql += " ORDER BY kt.search_volume_total DESC, k.keyword_id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+    contexts = [dict(row) for row in conn.execute(sql, params).fetchall()]
+
+    if keyword_ids is not None:
+        order = {keyword_id: i for i, keyword_id in enumerate(keyword_ids)}
+        contexts.sort(key=lambda context: order[context['keyword_id']])
+        contexts = contexts[:limit]
+
+    return contexts
+
+
+def fetch_top_keywords(conn: sqlite3.Connection, limit: int = 20,
+                       persona_id: Optional[int] = None) -> List[Dict]:
+    """검색량 기준 TOP 키워드 (persona_id 지정 시 해당 페르소나만)"""
+    if persona_id:
+        cursor = conn.execute(SQL_TOP_KEYWORDS_BY_PERSONA, (persona_id, limit))
+    else:
+        cursor = conn.execute(SQL_TOP_KEYWORDS, (limit,))
+    return [dict(row) for row in cursor.fetchall()]
+
+
+def fetch_keywords_by_sub_persona(conn: sqlite3.Connection, sub_persona_id: str,
+                                  limit: int = 10, min_volume: int = 1,
+                                  unposted_first: bool = False) -> List[Dict]:
+    """
+    세부 페르소나별 키워드 (검색량 내림차순)
+
+    unposted_first: 포스팅 이력이 없는 키워드를 먼저 (결과에 posted 컬럼 추가)
+    """
+    sql = SQL_KEYWORDS_BY_SUB_PERSONA_UNPOSTED_FIRST if unposted_first else SQL_KEYWORDS_BY_SUB_PERSONA
+    cursor = conn.execute(sql, (sub_persona_id, min_volume, limit))
+    return [dict(row) for row in cursor.fetchall()]
+
+
+def fetch_rising_keywords(conn: sqlite3.Connection, period_days: int = 7,
+                          limit: int = 20) -> List[Dict]:
+    """검색량 급상승 키워드 (최근 분석일, 변화율 내림차순)"""
+    cursor = conn.execute(SQL_RISING_KEYWORDS, (period_days, period_days, limit))
+    return [dict(row) for row in cursor.fetchall()]
@@ -0,0 +1,294 @@
+"""
+메모리 키워드 인덱스 (읽기 전용, 변경 시 자동 재적재)
+프롬프트 생성기가 반복 조회하는 세부 페르소나/페르소나별 키워드/전체 컨텍스트를 메모리에서 바로 반환
+
+- 첫 조회 때 쿼리 두 번(세부 페르소나 + 키워드 전체)으로 적재 → 이후 조회는 디스크 I/O 없음
+- 키: keyword_id / 키워드 문자열 / 세부 페르소나 (세부 페르소나·페르소나별 목록은 검색량 순으로 미리 정렬)
+- 키워드 행은 __slots__ 레코드 (행마다 dict를 두지 않아 메모리 절약)
+- 무효화: 조회마다 PRAGMA data_version 확인 (다른 커넥션이 커밋하면 값이 바뀜)
+  → 키워드/시계열/blog_posts가 바뀌면 다음 조회 때 다시 적재
+  data_version은 자기 커넥션의 커밋에는 바뀌지 않으므로 인덱스 전용 커넥션을 따로 둔다 (쓰기 금지)
+- 반환 형식은 keyword_db의 같은 이름 조회 함수와 동일 (dict, 호출마다 새 객체)
+
+사용법:
+    index = keyword_index.get_index()
+    index.keywords_by_sub_persona('3-2', limit=10, unposted_first=True)
+    index.full_context(1305)
+    index.contexts(sub_persona_ids=['3-2'], min_volume=100)
+"""
+
+import heapq
+import threading
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import keyword_db
+
+# 키워드 전체를 한 번에 (세부 페르소나 컬럼은 sub_personas에서 따로 붙임)
+SQL_INDEX_KEYWORDS = f"""
+    SELECT k.keyword_id, k.keyword, k.persona_id, k.sub_persona_id, k.confidence_score,
+           kt.search_volume_total, kt.competition_level, kt.avg_ad_count,
+           NOT {keyword_db.SQL_NOT_POSTED} AS posted
+    FROM keywords_master k
+    LEFT JOIN keyword_latest kt ON k.keyword_id = kt.keyword_id
+"""
+
+SQL_PERSONA_NAMES = "SELECT persona_id, persona_name FROM customer_personas"
+
+# fetch_keyword_full_context / fetch_keyword_contexts 결과의 세부 페르소나 컬럼 (순서 유지)
+SUB_PERSONA_CONTEXT_FIELDS = (
+    'sub_persona_name', 'description', 'content_strategy',
+    'template_id', 'landing_url', 'funnel_strategy', 'cta_text',
+    'priority_level',
+)
+
+
+class KeywordRecord:
+    """키워드 한 행 (검색 지표는 keyword_latest 기준, 없으면 None)"""
+
+    __slots__ = ('keyword_id', 'keyword', 'persona_id', 'sub_persona_id', 'confidence_score',
+                 'search_volume_total', 'competition_level', 'avg_ad_count', 'posted')
+
+    def __init__(self, keyword_id, keyword, persona_id, sub_persona_id, confidence_score,
+                 search_volume_total, competition_level, avg_ad_count, posted):
+        self.keyword_id = keyword_id
+        self.keyword = keyword
+        self.persona_id = persona_id
+        self.sub_persona_id = sub_persona_id
+        self.confidence_score = confidence_score
+        self.search_volume_total = search_volume_total
+        self.competition_level = competition_level
+        self.avg_ad_count = avg_ad_count
+        self.posted = posted
+
+    def volume_key(self) -> tuple:
+        """검색량 내림차순(없으면 맨 뒤) → keyword_id 순 정렬 키"""
+        volume = self.search_volume_total
+        return (volume is None, -(volume or 0), self.keyword_id)
+
+
+class KeywordIndex:
+    """키워드 DB 읽기 전용 메모리 인덱스"""
+
+    def __init__(self, db_path: Path = keyword_db.DB_PATH):
+        self.db_path = db_path
+        self._conn = None
+        self._version = None
+        self._lock = threading.Lock()
+        self.stats = {'loads': 0, 'lookups': 0}
+
+        self._sub_personas: List[Dict] = []
+        self._sub_persona_map: Dict[str, Dict] = {}
+        self._persona_names: Dict[int, str] = {}
+        self._by_id: Dict[int, KeywordRecord] = {}
+        self._by_keyword: Dict[str, KeywordRecord] = {}
+        self._by_sub_persona: Dict[str, List[KeywordRecord]] = {}
+        self._by_persona: Dict[int, List[KeywordRecord]] = {}
+        self._by_volume: List[KeywordRecord] = []
+        # 세부 페르소나 목록의 -검색량 (오름차순, 검색량 없음은 inf) → bisect로 min_volume 경계 탐색
+        self._sub_persona_volumes: Dict[str, List[float]] = {}
+
+    def _ensure_fresh(self):
+        """DB가 바뀌었으면 (data_version 변화) 다시 적재"""
+        with self._lock:
+            if self._conn is None:
+                self._conn = keyword_db.connect(self.db_path)
+            version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if version != self._version:
+                self._load()
+                self._version = version
+            self.stats['lookups'] += 1
+
+    def _load(self):
+        conn = self._conn
+        self._sub_personas = keyword_db.fetch_sub_personas(conn)
+        self._sub_persona_map = {row['sub_persona_id']: row for row in self._sub_personas}
+        self._persona_names = dict(conn.execute(SQL_PERSONA_NAMES).fetchall())
+
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        records = [KeywordRecord(*row) for row in cursor.execute(SQL_INDEX_KEYWORDS)]
+        records.sort(key=KeywordRecord.volume_key)
+
+        by_sub_persona: Dict[str, List[KeywordRecord]] = {}
+        by_persona: Dict[int, List[KeywordRecord]] = {}
+        for record in records:
+            by_sub_persona.setdefault(record.sub_persona_id, []).append(record)
+            by_persona.setdefault(record.persona_id, []).append(record)
+
+        self._by_volume = records
+        self._by_id = {record.keyword_id: record for record in records}
+        self._by_keyword = {record.keyword: record for record in records}
+        self._by_sub_persona = by_sub_persona
+        self._by_persona = by_persona
+        self._sub_persona_volumes = {
+            sub_persona_id: [float('inf') if record.search_volume_total is None
+                             else -record.search_volume_total for record in group]
+            for sub_persona_id, group in by_sub_persona.items()
+        }
+        self.stats['loads'] += 1
+
+    def close(self):
+        """인덱스 전용 커넥션 닫기 (다음 조회 때 다시 열고 적재)"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+                self._version = None
+
+    # ------------------------------------------------------------
+    # 조회 (keyword_db 함수와 같은 형식)
+    # ------------------------------------------------------------
+
+    def get(self, keyword_id: int) -> Optional[KeywordRecord]:
+        """keyword_id → 레코드"""
+        self._ensure_fresh()
+        return self._by_id.get(keyword_id)
+
+    def find(self, keyword: str) -> Optional[KeywordRecord]:
+        """키워드 문자열 → 레코드"""
+        self._ensure_fresh()
+        return self._by_keyword.get(keyword)
+
+    def sub_personas(self) -> List[Dict]:
+        """keyword_db.fetch_sub_personas와 동일"""
+        self._ensure_fresh()
+        return [dict(row) for row in self._sub_personas]
+
+    def _context(self, record: KeywordRecord, with_id: bool) -> Optional[Dict]:
+        sub_persona = self._sub_persona_map.get(record.sub_persona_id)
+        if sub_persona is None:
+            # SQL은 sub_personas와 INNER JOIN → 세부 페르소나가 없으면 결과 없음
+            return None
+        context = {'keyword_id': record.keyword_id} if with_id else {}
+        context['keyword'] = record.keyword
+        context['sub_persona_id'] = record.sub_persona_id
+        for field in SUB_PERSONA_CONTEXT_FIELDS:
+            context[field] = sub_persona[field]
+        context['search_volume_total'] = record.search_volume_total
+        context['competition_level'] = record.competition_level
+        context['avg_ad_count'] = record.avg_ad_count
+        return context
+
+    def full_context(self, keyword_id: int) -> Dict:
+        """keyword_db.fetch_keyword_full_context와 동일 (없으면 {})"""
+        self._ensure_fresh()
+        record = self._by_id.get(keyword_id)
+        return (self._context(record, with_id=False) or {}) if record else {}
+
+    def contexts(self, keyword_ids: Optional[List[int]] = None,
+                 persona_ids: Optional[List[int]] = None,
+                 sub_persona_ids: Optional[List[str]] = None,
+                 min_volume: Optional[int] = None,
+                 limit: Optional[int] = None,
+                 exclude_posted: bool = False) -> List[Dict]:
+        """keyword_db.fetch_keyword_contexts와 동일 (ID 순서 또는 검색량 내림차순)"""
+        self._ensure_fresh()
+
+        if keyword_ids is not None:
+            # 같은 ID가 여러 번이어도 SQL(IN)처럼 한 번만, 순서는 마지막 위치 기준 (fetch_keyword_contexts와 동일)
+            positions = {keyword_id: i for i, keyword_id in enumerate(keyword_ids)}
+            records = (self._by_id.get(keyword_id) for keyword_id in sorted(positions, key=positions.get))
+        elif persona_ids or sub_persona_ids:
+            records = self._merged(persona_ids or (), sub_persona_ids or ())
+        else:
+            records = iter(self._by_volume)
+
+        persona_set = set(persona_ids or ())
+        sub_persona_set = set(sub_persona_ids or ())
+        contexts = []
+        for record in records:
+            if record is None:
+                continue
+            if (persona_set or sub_persona_set) and not (
+                    record.persona_id in persona_set or record.sub_persona_id in sub_persona_set):
+                continue
+            if min_volume is not None and (record.search_volume_total is None
+                                           or record.search_volume_total < min_volume):
+                if keyword_ids is None:
+                    # 검색량 내림차순 → 이후 레코드도 모두 미달
+                    break
+                continue
+            if exclude_posted and record.posted:
+                continue
+            context = self._context(record, with_id=True)
+            if context is None:
+                continue
+            contexts.append(context)
+            if limit is not None and len(contexts) >= limit:
+                break
+        return contexts
+
+    def _merged(self, persona_ids, sub_persona_ids) -> Iterator[KeywordRecord]:
+        """페르소나/세부 페르소나 목록들을 검색량 순서 그대로 합침 (전체 스캔 없음)"""
+        groups = [self._by_persona.get(persona_id, []) for persona_id in dict.fromkeys(persona_ids)]
+        groups += [self._by_sub_persona.get(sub_persona_id, [])
+                   for sub_persona_id in dict.fromkeys(sub_persona_ids)]
+        seen = set()
+        for record in heapq.merge(*groups, key=KeywordRecord.volume_key):
+            if record.keyword_id not in seen:
+                seen.add(record.keyword_id)
+                yield record
+
+    def keywords_by_sub_persona(self, sub_persona_id: str, limit: int = 10, min_volume: int = 1,
+                                unposted_first: bool = False) -> List[Dict]:
+        """keyword_db.fetch_keywords_by_sub_persona와 동일"""
+        self._ensure_fresh()
+        group = self._by_sub_persona.get(sub_persona_id, [])
+        # 검색량 >= min_volume인 앞부분만 (NULL은 SQL 비교에서 제외 → 맨 뒤라 함께 잘림)
+        end = bisect_right(self._sub_persona_volumes.get(sub_persona_id, []), -min_volume)
+        candidates = group[:end]
+        if unposted_first:
+            candidates = [record for record in candidates if not record.posted] + \
+                         [record for record in candidates if record.posted]
+
+        rows = []
+        for record in candidates[:limit]:
+            row = {
+                'keyword_id': record.keyword_id,
+                'keyword': record.keyword,
+                'confidence_score': record.confidence_score,
+                'search_volume_total': record.search_volume_total,
+                'competition_level': record.competition_level,
+                'avg_ad_count': record.avg_ad_count,
+            }
+            if unposted_first:
+                row['posted'] = record.posted
+            rows.append(row)
+        return rows
+
+    def top_keywords(self, limit: int = 20, persona_id: Optional[int] = None) -> List[Dict]:
+        """keyword_db.fetch_top_keywords와 동일 (검색량 > 0)"""
+        self._ensure_fresh()
+        group = self._by_persona.get(persona_id, []) if persona_id else self._by_volume
+        rows = []
+        for record in group:
+            if len(rows) >= limit or not record.search_volume_total or record.search_volume_total <= 0:
+                break
+            if record.persona_id not in self._persona_names:
+                continue
+            rows.append({
+                'keyword_id': record.keyword_id,
+                'keyword': record.keyword,
+                'persona_id': record.persona_id,
+                'persona_name': self._persona_names[record.persona_id],
+                'search_volume_total': record.search_volume_total,
+                'competition_level': record.competition_level,
+                'avg_ad_count': record.avg_ad_count,
+                'confidence_score': record.confidence_score,
+            })
+        return rows
+
+
+_indexes: Dict[Path, KeywordIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(db_path: Path = keyword_db.DB_PATH) -> KeywordIndex:
+    """DB 파일별 공용 인덱스 (프로세스 안에서 한 번만 적재)"""
+    with _indexes_lock:
+        index = _indexes.get(db_path)
+        if index is None:
+            index = _indexes[db_path] = KeywordIndex(db_path)
+        return index
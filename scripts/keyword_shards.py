@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+버티컬(상품군/고객사)별 키워드 DB 샤드 조회
+data/customers/<vertical>/keyword/*.db 를 찾아 추천/검색량/급상승 조회를 샤드마다 병렬 실행 후 TOP-k 병합
+
+- 샤드 = 버티컬별 DB 파일 (keyword_db.discover_shards, 캐시 DB 제외)
+- 샤드마다 keyword_db 공용 풀 커넥션 → 스레드 풀에서 동시 조회
+  (sqlite3는 쿼리 실행 중 GIL을 풀어 샤드 쿼리가 겹쳐 실행됨, 샤드가 하나면 스레드 없이 바로 조회)
+- 각 샤드는 자기 TOP-k만 돌려주고 heapq.nlargest로 병합 → 전체 TOP-k (결과에 vertical 컬럼 추가)
+- 단일 버티컬 스크립트는 KEYWORD_VERTICAL로 자기 DB만 조회 → 버티컬이 늘어도 CCTV 조회는 그대로
+- 샤드 한 곳이 실패해도(업그레이드 스크립트 미적용 등) 나머지 결과는 반환, 실패 내용은 errors
+
+사용법:
+    python3 scripts/keyword_shards.py --list
+    python3 scripts/keyword_shards.py --limit 20
+    python3 scripts/keyword_shards.py --verticals cctv security --rising 7
+"""
+
+import argparse
+import heapq
+import itertools
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import keyword_db
+from blog_automation_helper import BlogAutomationHelper
+
+# 동시 조회 스레드 수 상한 (샤드 수가 더 적으면 샤드 수)
+MAX_WORKERS = 8
+
+
+class ShardedKeywordDB:
+    """버티컬별 키워드 DB 병렬 조회 + TOP-k 병합"""
+
+    def __init__(self, shards: Optional[Dict[str, Path]] = None, workers: int = MAX_WORKERS):
+        """
+        Args:
+            shards: 샤드 이름 → DB 경로 (None이면 data/customers 아래 자동 탐색)
+            workers: 동시 조회 스레드 수 상한
+        """
+        self.shards = keyword_db.discover_shards() if shards is None else dict(shards)
+        self.workers = max(1, min(workers, len(self.shards)))
+        self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                            thread_name_prefix='keyword-shard')
+        # 마지막 조회에서 실패한 샤드 → 오류 메시지
+        self.errors: Dict[str, str] = {}
+
+    def close(self):
+        """스레드 풀 종료"""
+        self._executor.shutdown(wait=True)
+
+    def _fan_out(self, query: Callable[[Path], List[Dict]]) -> List[List[Dict]]:
+        """샤드마다 query(db_path) 실행 → 샤드별 결과 (각 행에 vertical 추가)"""
+        if len(self.shards) == 1:
+            # 스레드 전환 없이 바로 조회
+            outcomes = {}
+            for name, path in self.shards.items():
+                try:
+                    outcomes[name] = query(path)
+                except sqlite3.Error as e:
+                    outcomes[name] = e
+        else:
+            futures = {name: self._executor.submit(query, path) for name, path in self.shards.items()}
+            outcomes = {name: future.exception() or future.result() for name, future in futures.items()}
+
+        self.errors = {}
+        results = []
+        for name, outcome in outcomes.items():
+            if isinstance(outcome, BaseException):
+                if not isinstance(outcome, sqlite3.Error):
+                    raise outcome
+                self.errors[name] = str(outcome)
+                continue
+            for row in outcome:
+                row['vertical'] = name
+            results.append(outcome)
+        return results
+
+    @staticmethod
+    def _merge(results: List[List[Dict]], limit: int, key: Callable[[Dict], tuple]) -> List[Dict]:
+        """샤드별 TOP-k → 전체 TOP-k (동점은 샤드 순서 유지)"""
+        return heapq.nlargest(limit, itertools.chain.from_iterable(results), key=key)
+
+    def recommend(self, limit: int = 10, min_volume: int = 1000,
+                  exclude_posted: bool = True, one_per_cluster: bool = True) -> List[Dict]:
+        """
+        전체 버티컬 포스팅 추천 키워드 (BlogAutomationHelper.get_recommended_keywords_for_posting 병합)
+
+        keyword_id는 샤드마다 따로 매겨지므로 vertical과 함께 사용
+        """
+        def query(db_path: Path) -> List[Dict]:
+            helper = BlogAutomationHelper(db_path)
+            try:
+                return helper.get_recommended_keywords_for_posting(
+                    limit=limit, min_volume=min_volume,
+                    exclude_posted=exclude_posted, one_per_cluster=one_per_cluster)
+            finally:
+                helper.close()
+
+        return self._merge(self._fan_out(query), limit,
+                           key=lambda row: (row['priority_score'], row['search_volume_total'] or 0))
+
+    def top_keywords(self, limit: int = 20, persona_id: Optional[int] = None) -> List[Dict]:
+        """전체 버티컬 검색량 TOP 키워드"""
+        def query(db_path: Path) -> List[Dict]:
+            with keyword_db.get_pool(db_path).connection() as conn:
+                return keyword_db.fetch_top_keywords(conn, limit, persona_id)
+
+        return self._merge(self._fan_out(query), limit,
+                           key=lambda row: row['search_volume_total'] or 0)
+
+    def rising_keywords(self, period_days: int = 7, limit: int = 20) -> List[Dict]:
+        """전체 버티컬 검색량 급상승 키워드 (샤드별 최근 분석일 기준, 변화율 NULL은 뒤로)"""
+        def query(db_path: Path) -> List[Dict]:
+            with keyword_db.get_pool(db_path).connection() as conn:
+                return keyword_db.fetch_rising_keywords(conn, period_days, limit)
+
+        def key(row: Dict) -> tuple:
+            change_pct = row['volume_change_pct']
+            return (change_pct is not None, change_pct or 0.0, row['volume_change_abs'] or 0)
+
+        return self._merge(self._fan_out(query), limit, key=key)
+
+
+def print_errors(sharded: ShardedKeywordDB):
+    for name, error in sharded.errors.items():
+        print(f"   ⚠️  {name}: 조회 실패 - {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="버티컬별 키워드 DB 병렬 조회 (TOP-k 병합)")
+    parser.add_argument("--list", action="store_true", help="샤드(버티컬별 DB) 목록만 출력")
+    parser.add_argument("--verticals", nargs="+", help="조회할 버티컬 (기본: 전체)")
+    parser.add_argument("--limit", type=int, default=20, help="병합 후 키워드 수")
+    parser.add_argument("--min-volume", type=int, default=1000, help="추천 최소 월간 검색량")
+    parser.add_argument("--rising", type=int, metavar="DAYS",
+                        help="추천 대신 N일 급상승 키워드 (analyze_trends.py 결과)")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="동시 조회 스레드 수 상한")
+    args = parser.parse_args()
+
+    shards = keyword_db.discover_shards(verticals=args.verticals)
+
+    print("=" * 80)
+    print("🗂️  버티컬별 키워드 DB 조회")
+    print("=" * 80)
+    print(f"\n📂 {keyword_db.CUSTOMERS_DIR}")
+    for name, path in shards.items():
+        print(f"   - {name:<20} {path.name} ({path.stat().st_size / 1024 / 1024:,.1f}MB)")
+
+    if not shards:
+        print("\n❌ 키워드 DB가 없습니다 (<vertical>/keyword/*.db)")
+        return
+    if args.list:
+        return
+
+    sharded = ShardedKeywordDB(shards, workers=args.workers)
+    try:
+        started = time.perf_counter()
+        if args.rising:
+            rows = sharded.rising_keywords(args.rising, args.limit)
+        else:
+            rows = sharded.recommend(limit=args.limit, min_volume=args.min_volume)
+        elapsed = time.perf_counter() - started
+    finally:
+        sharded.close()
+
+    print_errors(sharded)
+
+    if args.rising:
+        print(f"\n📈 {args.rising}일 급상승 키워드 TOP {args.limit} ({len(shards)}개 샤드, {elapsed * 1000:.1f}ms)\n")
+        print(f"{'순위':<4} {'버티컬':<18} {'키워드':<24} {'분석일':<12} {'변화율':>8} {'검색량':>10}")
+        print("-" * 80)
+        for i, row in enumerate(rows, 1):
+            change = f"{row['volume_change_pct']:+.1f}%" if row['volume_change_pct'] is not None else "신규"
+            print(f"{i:<4} {row['vertical']:<18} {row['keyword']:<24} {row['analysis_date']:<12} "
+                  f"{change:>8} {row['search_volume_total'] or 0:>10,}")
+    else:
+        print(f"\n📊 포스팅 추천 키워드 TOP {args.limit} ({len(shards)}개 샤드, {elapsed * 1000:.1f}ms)\n")
+        print(f"{'순위':<4} {'버티컬':<18} {'키워드':<24} {'페르소나':<20} {'검색량':>10} {'우선순위':>8}")
+        print("-" * 80)
+        for i, row in enumerate(rows, 1):
+            print(f"{i:<4} {row['vertical']:<18} {row['keyword']:<24} {row['persona_name']:<20} "
+                  f"{row['search_volume_total'] or 0:>10,} {row['priority_score']:>7.1f}점")
+
+    if not rows:
+        print("   (결과 없음)")
+    print()
+
+
+if __name__ == "__main__":
+    main()
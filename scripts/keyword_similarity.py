@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+키워드 유사도 인덱스 (근접 중복 클러스터)
+"캡스고객센터" / "캡스 고객센터" / "ADT캡스고객센터"처럼 거의 같은 키워드를 한 클러스터로 묶어
+추천/캘린더가 클러스터당 대표 키워드 하나만 고르게 함 (같은 검색 의도 글끼리 경쟁 방지)
+
+- 정규화: NFC + 소문자 + 공백/기호 제거 → 한글 음절을 자모로 분해 (받침 하나 차이도 부분 일치)
+- 유사도: 자모 3-gram 집합의 Jaccard (기본 0.8 이상이면 같은 클러스터, 연쇄적으로 합침)
+  + 짧은 쪽이 긴 쪽에 순서대로 들어 있을 때만 (글자 추가/삭제만 허용)
+  → '500만화소'/'800만화소', '공장CCTV설치'/'농장CCTV설치'처럼 글자가 바뀐 키워드는 분리
+- 후보 생성: 3-gram을 전체 빈도 오름차순으로 정렬한 접두(prefix) 역색인 (PPJoin)
+  → 두 집합의 Jaccard가 t 이상이면 각자의 앞쪽 |x| - ceil(t|x|) + 1개 안에 공통 3-gram이 반드시 있음
+  → 희귀 3-gram을 공유하는 쌍만 비교 (전체 쌍 비교 없음) + 길이/위치 필터로 후보 축소
+  → 남은 후보만 정확한 Jaccard로 확인
+- 저장: keywords_master.cluster_id = 대표 키워드 ID (검색량 최대, 같으면 ID가 작은 것)
+  단독 키워드는 NULL → 클러스터링 이후 추가된 키워드도 자동으로 대표 취급
+- 조회 조건: keyword_db.SQL_CLUSTER_REPRESENTATIVE / SQL_CLUSTER_NOT_POSTED
+  (클러스터 안에 포스팅 이력이 하나라도 있으면 대표도 추천하지 않음)
+
+사용법:
+    python3 scripts/keyword_similarity.py                  # 클러스터 재계산 + 저장
+    python3 scripts/keyword_similarity.py --threshold 0.8 --dry-run
+    python3 scripts/keyword_similarity.py --show 20        # 큰 클러스터 20개 출력
+"""
+
+import argparse
+import json
+import math
+import re
+import sqlite3
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+from keyword_db import DB_PATH, connect, prepare_for_write
+
+# 0.8: 띄어쓰기/기호 차이(1.0), 브랜드 접두어 추가('ADT캡스고객센터' 0.81)는 묶고
+# 지역/브랜드 치환('부산CCTV설치'/'대전CCTV설치' 0.5)은 분리
+DEFAULT_THRESHOLD = 0.8
+NGRAM = 3
+
+# 한글 음절 → 초성/중성/종성 (호환 자모, 종성 없음은 '')
+CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+JUNGSEONG = 'ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ'
+JONGSEONG = ('', 'ㄱ', 'ㄲ', 'ㄳ', 'ㄴ', 'ㄵ', 'ㄶ', 'ㄷ', 'ㄹ', 'ㄺ', 'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ',
+             'ㄿ', 'ㅀ', 'ㅁ', 'ㅂ', 'ㅄ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ')
+HANGUL_BASE = 0xAC00
+
+# str.translate용 음절 → 자모 표 (11,172자, 글자별 파이썬 반복 없이 분해)
+JAMO_TABLE = {
+    HANGUL_BASE + offset: CHOSEONG[offset // 588] + JUNGSEONG[offset % 588 // 28] + JONGSEONG[offset % 28]
+    for offset in range(11172)
+}
+
+_NON_WORD = re.compile(r'[\W_]+')
+
+SQL_KEYWORDS = """
+    SELECT k.keyword_id, k.keyword, COALESCE(kt.search_volume_total, 0)
+    FROM keywords_master k
+    LEFT JOIN keyword_latest kt ON k.keyword_id = kt.keyword_id
+"""
+
+# 바뀐 행만 갱신 ([[keyword_id, cluster_id], ...], 단독 키워드는 cluster_id NULL)
+SQL_UPDATE_CLUSTERS = """
+    WITH c AS MATERIALIZED (
+        SELECT json_extract(value, '$[0]') AS keyword_id,
+               json_extract(value, '$[1]') AS cluster_id
+        FROM json_each(:clusters)
+    )
+    UPDATE keywords_master AS k
+    SET cluster_id = c.cluster_id
+    FROM c
+    WHERE k.keyword_id = c.keyword_id
+    AND k.cluster_id IS NOT c.cluster_id
+"""
+
+
+def normalize(keyword: str) -> str:
+    """NFC + 소문자 + 공백/기호 제거 ('ADT 캡스 A/S' → 'adt캡스as')"""
+    return _NON_WORD.sub('', unicodedata.normalize('NFC', keyword).lower())
+
+
+def jamo_string(keyword: str) -> str:
+    """정규화 + 한글 자모 분해 ('캡스 고객센터' → 'ㅋㅐㅂㅅㅡㄱㅗㄱㅐㄱㅅㅔㄴㅌㅓ')"""
+    return normalize(keyword).translate(JAMO_TABLE)
+
+
+def shingles(keyword: str, n: int = NGRAM) -> frozenset:
+    """자모 n-gram 집합 (n자보다 짧으면 문자열 전체 하나)"""
+    text = jamo_string(keyword)
+    if len(text) <= n:
+        return frozenset((text,)) if text else frozenset()
+    return frozenset(text[i:i + n] for i in range(len(text) - n + 1))
+
+
+def _in_order(short: str, long: str) -> bool:
+    """short의 글자가 long에 순서대로 모두 들어 있는지 (글자 추가/삭제만으로 같아짐)"""
+    remaining = iter(long)
+    return all(char in remaining for char in short)
+
+
+def similarity(a: str, b: str) -> float:
+    """두 키워드의 자모 3-gram Jaccard 유사도"""
+    x, y = shingles(a), shingles(b)
+    if not x or not y:
+        return 0.0
+    common = len(x & y)
+    return common / (len(x) + len(y) - common)
+
+
+def similar_pairs(keywords: Iterable[Tuple[int, str]],
+                  threshold: float = DEFAULT_THRESHOLD) -> Iterable[Tuple[int, int, float]]:
+    """
+    Jaccard가 threshold 이상이고 글자 치환이 없는 키워드 쌍 (prefix filtering 유사도 조인)
+
+    Args:
+        keywords: (keyword_id, keyword) 목록
+
+    Yields:
+        (keyword_id, keyword_id, 유사도)
+    """
+    records = []
+    texts = {}
+    for keyword_id, keyword in keywords:
+        grams = shingles(keyword)
+        if grams:
+            records.append((keyword_id, grams))
+            texts[keyword_id] = normalize(keyword)
+
+    # 3-gram을 빈도 오름차순 정수 ID로 → 각 집합의 앞부분이 희귀 3-gram
+    frequency = Counter(gram for _, grams in records for gram in grams)
+    rank = {gram: i for i, (gram, _) in enumerate(
+        sorted(frequency.items(), key=lambda item: (item[1], item[0])))}
+    records = sorted(((keyword_id, sorted(rank[gram] for gram in grams))
+                      for keyword_id, grams in records), key=lambda item: len(item[1]))
+
+    # 역색인: 3-gram → [(레코드 위치, 3-gram의 위치)], 크기 오름차순으로 쌓이므로
+    # 너무 작은 레코드는 앞에서부터 영구히 건너뜀 (starts)
+    index: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+    starts: Dict[int, int] = defaultdict(int)
+    sets: List[frozenset] = []
+    sizes: List[int] = []
+    pair_ratio = threshold / (1 + threshold)
+    for position, (keyword_id, tokens) in enumerate(records):
+        size = len(tokens)
+        min_size = math.ceil(threshold * size - 1e-9)
+        probe = size - min_size + 1
+        # 뒤에 오는 레코드는 크기가 같거나 크므로 더 짧은 접두만 색인해도 충분
+        indexed = size - math.ceil(2 * pair_ratio * size - 1e-9) + 1
+
+        # 후보별 접두 공통 수 (위치 필터: 남은 3-gram을 모두 맞혀도 기준 미달이면 제외)
+        overlaps: Dict[int, int] = {}
+        for i, token in enumerate(tokens[:probe]):
+            postings = index.get(token)
+            if not postings:
+                continue
+            start = starts[token]
+            while start < len(postings) and sizes[postings[start][0]] < min_size:
+                start += 1
+            starts[token] = start
+            for other, j in postings[start:]:
+                count = overlaps.get(other, 0)
+                if count < 0:
+                    continue
+                other_size = sizes[other]
+                needed = math.ceil(pair_ratio * (size + other_size) - 1e-9)
+                if count + 1 + min(size - i - 1, other_size - j - 1) >= needed:
+                    overlaps[other] = count + 1
+                else:
+                    overlaps[other] = -1
+
+        token_set = frozenset(tokens)
+        for other, count in overlaps.items():
+            if count <= 0:
+                continue
+            common = len(token_set & sets[other])
+            score = common / (size + sizes[other] - common)
+            if score < threshold:
+                continue
+            other_id = records[other][0]
+            short, long = sorted((texts[other_id], texts[keyword_id]), key=len)
+            if _in_order(short, long):
+                yield other_id, keyword_id, score
+
+        sets.append(token_set)
+        sizes.append(size)
+        for j, token in enumerate(tokens[:indexed]):
+            index[token].append((position, j))
+
+
+def cluster_keywords(keywords: List[Tuple[int, str, int]],
+                     threshold: float = DEFAULT_THRESHOLD) -> Dict[int, int]:
+    """
+    근접 중복 클러스터 (유사 쌍을 union-find로 연결)
+
+    Args:
+        keywords: (keyword_id, keyword, search_volume_total) 목록
+
+    Returns:
+        {keyword_id: 대표 keyword_id} - 2개 이상인 클러스터의 키워드만 포함
+    """
+    parent: Dict[int, int] = {}
+
+    def find(node: int) -> int:
+        root = node
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while parent.get(node, node) != root:
+            parent[node], node = root, parent[node]
+        return root
+
+    for a, b, _ in similar_pairs(((keyword_id, keyword) for keyword_id, keyword, _ in keywords),
+                                 threshold):
+        parent.setdefault(a, a)
+        parent.setdefault(b, b)
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    members: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+    for keyword_id, _, volume in keywords:
+        if keyword_id in parent:
+            members[find(keyword_id)].append((volume, keyword_id))
+
+    clusters = {}
+    for group in members.values():
+        # 대표: 검색량 최대, 같으면 ID가 작은 키워드
+        representative = min(group, key=lambda item: (-item[0], item[1]))[1]
+        for _, keyword_id in group:
+            clusters[keyword_id] = representative
+    return clusters
+
+
+def has_clusters(conn: sqlite3.Connection) -> bool:
+    """keywords_master.cluster_id 존재 여부 (클러스터링을 한 번이라도 실행했는지)"""
+    return any(row[1] == 'cluster_id' for row in conn.execute("PRAGMA table_info(keywords_master)"))
+
+
+def ensure_schema(conn: sqlite3.Connection):
+    """cluster_id 컬럼 + 같은 클러스터 조회용 인덱스"""
+    if not has_clusters(conn):
+        conn.execute("ALTER TABLE keywords_master ADD COLUMN cluster_id INTEGER")
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_keyword_cluster
+        ON keywords_master(cluster_id)
+    """)
+    conn.commit()
+
+
+def build_clusters(conn: sqlite3.Connection, threshold: float = DEFAULT_THRESHOLD,
+                   save: bool = True) -> Dict:
+    """
+    전체 키워드 클러스터 재계산 (+ 저장, 한 트랜잭션)
+
+    Returns:
+        {'keywords', 'clusters', 'clustered', 'changed', 'assignments', 'seconds'}
+    """
+    started = time.perf_counter()
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    keywords = cursor.execute(SQL_KEYWORDS).fetchall()
+    clusters = cluster_keywords(keywords, threshold)
+
+    changed = 0
+    if save:
+        ensure_schema(conn)
+        payload = json.dumps([[keyword_id, clusters.get(keyword_id)]
+                              for keyword_id, _, _ in keywords])
+        with conn:
+            # WITH로 시작하는 문장은 rowcount가 -1 → total_changes 차이로 계산
+            before = conn.total_changes
+            conn.execute(SQL_UPDATE_CLUSTERS, {'clusters': payload})
+            changed = conn.total_changes - before
+
+    return {
+        'keywords': len(keywords),
+        'clusters': len(set(clusters.values())),
+        'clustered': len(clusters),
+        'changed': changed,
+        'assignments': clusters,
+        'seconds': time.perf_counter() - started,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="키워드 근접 중복 클러스터링")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="자모 3-gram Jaccard 기준 (0~1)")
+    parser.add_argument("--show", type=int, default=10, help="출력할 클러스터 수 (큰 순)")
+    parser.add_argument("--dry-run", action="store_true", help="저장하지 않고 결과만 출력")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("🧬 키워드 유사도 인덱스 (근접 중복 클러스터)")
+    print("=" * 80)
+    print(f"\n   기준: 자모 {NGRAM}-gram Jaccard ≥ {args.threshold}")
+
+    prepare_for_write()
+    conn = connect()
+    result = build_clusters(conn, args.threshold, save=not args.dry_run)
+
+    print(f"\n📊 키워드 {result['keywords']:,}개 → 클러스터 {result['clusters']:,}개"
+          f" (묶인 키워드 {result['clustered']:,}개, {result['seconds']:.2f}초)")
+    if args.dry_run:
+        print("   🔍 --dry-run: 저장하지 않았습니다")
+    else:
+        print(f"   💾 cluster_id 갱신: {result['changed']:,}개")
+
+    members = defaultdict(list)
+    for keyword_id, representative in result['assignments'].items():
+        members[representative].append(keyword_id)
+    largest = sorted(members.items(), key=lambda item: (-len(item[1]), item[0]))[:args.show]
+    if largest:
+        ids = [keyword_id for _, group in largest for keyword_id in group]
+        names = dict(conn.execute(
+            "SELECT keyword_id, keyword FROM keywords_master"
+            " WHERE keyword_id IN (SELECT value FROM json_each(?))", (json.dumps(ids),)).fetchall())
+        print(f"\n🔗 큰 클러스터 TOP {len(largest)} (★ 대표)")
+        for representative, group in largest:
+            others = [names[keyword_id] for keyword_id in sorted(group) if keyword_id != representative]
+            print(f"   ★ {names[representative]:<25} + {', '.join(others)}")
+
+    conn.close()
+    print(f"\n💾 DB 위치: {DB_PATH}\n")
+
+
+if __name__ == "__main__":
+    main()
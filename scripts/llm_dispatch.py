@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+LLM 자동 발송 단계
+generate_full_blog_prompt 결과 → 제목 요청 → 제목 선택 → 본문 요청 → blog_posts(draft)
+
+카피라이터 Gem / 채팅 모델에 손으로 붙여넣던 과정을 OpenAI 호환 API로 자동화한다.
+
+- 동시 요청 제한: 세마포어 (--concurrency)
+- 속도 제한: 토큰 버킷 (--rps, 초당 요청 수)
+- 재시도: 429/5xx/연결 오류 시 지수 백오프 + 지터 (Retry-After 헤더는 최소 대기 시간)
+- 응답 캐시: 요청 해시 → 응답 (llm_response_cache.db, 재실행 시 같은 요청은 API 호출 없음)
+- 백프레셔: 제한 큐 → 키워드 워커 (프롬프트는 필요한 만큼만 생성)
+- 저장: blog_posts에 SAVE_BATCH개씩 한 트랜잭션으로 draft 저장
+
+설정: --endpoint/--model 또는 환경 변수 LLM_ENDPOINT, LLM_MODEL, LLM_API_KEY
+(OPENAI_API_KEY도 사용)
+
+사용법:
+    python3 scripts/mock_llm_server.py &
+    python3 scripts/llm_dispatch.py --persona 3-2
+    python3 scripts/llm_dispatch.py --input prompts/batch_20250101_090000.jsonl --concurrency 16 --rps 10
+"""
+
+import argparse
+import asyncio
+import hashlib
+import itertools
+import json
+import os
+import random
+import re
+import sqlite3
+import statistics
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import blog_posts
+import keyword_db
+from async_http import AsyncHTTPClient, HTTPError
+from integrated_blog_workflow import IntegratedBlogWorkflow, persona_arg, split_personas
+
+DEFAULT_ENDPOINT = os.environ.get('LLM_ENDPOINT', 'http://127.0.0.1:8800/v1')
+DEFAULT_MODEL = os.environ.get('LLM_MODEL', 'gpt-4o-mini')
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_RPS = 5.0
+DEFAULT_RETRIES = 4
+DEFAULT_TIMEOUT = 120.0
+DEFAULT_TEMPERATURE = 0.7
+
+# 재시도 대기: BACKOFF_BASE * 2^시도 (최대 BACKOFF_MAX초) × 0.5~1.0 지터
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+
+# 재시도하는 HTTP 상태 (그 외 4xx는 요청 자체 문제 → 바로 실패)
+RETRY_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+# 키워드 DB와 같은 폴더에 만드는 응답 캐시 파일
+RESPONSE_CACHE_NAME = "llm_response_cache.db"
+
+# blog_posts 저장 묶음 크기
+SAVE_BATCH = 50
+
+# 본문 요청에 붙이는 선택 제목 (body 템플릿의 "사전 작업: 제목 1개 선택 완료"에 해당)
+BODY_TITLE_SUFFIX = "\n\n## 선택한 제목\n{title}\n"
+
+# 제목 후보 줄: "1. 제목", "- 제목", "**1)** 제목" 등
+_TITLE_LINE = re.compile(r'^\s*(?:\*\*)?(?:\d+[.)]|[-*•])(?:\*\*)?\s+(.+?)\s*$')
+
+
+class LLMError(Exception):
+    """재시도 후에도 실패한 요청"""
+
+
+def pick_title(text: str) -> str:
+    """카피라이터 응답에서 첫 번째 제목 후보 (목록이 없으면 첫 줄)"""
+    lines = [line for line in text.splitlines() if line.strip()]
+    for line in lines:
+        match = _TITLE_LINE.match(line)
+        if match:
+            return match.group(1).strip('*"\'“”「」 ')
+    return lines[0].strip('#*" ') if lines else ''
+
+
+class RateLimiter:
+    """토큰 버킷 (rate: 초당 요청 수, burst: 한 번에 몰아 보낼 수 있는 요청 수)"""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """토큰 하나 사용 (없으면 생길 때까지 대기, 먼저 온 순서대로)"""
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class ResponseCache:
+    """요청 해시 → 응답 내용 (SQLite, 응답마다 바로 커밋)"""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        """db_path: 캐시 DB 파일 (기본: 호출 시점의 keyword_db.DB_PATH 옆 RESPONSE_CACHE_NAME)"""
+        db_path = Path(db_path) if db_path else keyword_db.DB_PATH.parent / RESPONSE_CACHE_NAME
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = keyword_db.connect(db_path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_responses (
+                request_hash CHAR(64) PRIMARY KEY,
+                model VARCHAR(100),
+                content TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        self.conn.commit()
+
+    def get(self, request_hash: str) -> Optional[str]:
+        row = self.conn.execute(
+            "SELECT content FROM llm_responses WHERE request_hash = ?", (request_hash,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def put(self, request_hash: str, model: str, content: str):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (request_hash, model, content) VALUES (?, ?, ?)",
+                (request_hash, model, content),
+            )
+
+    def close(self):
+        self.conn.close()
+
+
+class LLMClient:
+    """OpenAI 호환 chat completions 클라이언트 (동시성/속도 제한, 재시도, 캐시)"""
+
+    def __init__(self, endpoint: str = DEFAULT_ENDPOINT, model: str = DEFAULT_MODEL,
+                 api_key: Optional[str] = None, concurrency: int = DEFAULT_CONCURRENCY,
+                 rps: float = DEFAULT_RPS, retries: int = DEFAULT_RETRIES,
+                 timeout: float = DEFAULT_TIMEOUT, temperature: float = DEFAULT_TEMPERATURE,
+                 cache: Optional[ResponseCache] = None):
+        self.url = endpoint.rstrip('/') + '/chat/completions'
+        self.model = model
+        self.retries = retries
+        self.timeout = timeout
+        self.temperature = temperature
+        self.cache = cache
+        self.headers = {'Authorization': f"Bearer {api_key}"} if api_key else {}
+        self.http = AsyncHTTPClient(max_idle_per_host=concurrency)
+        self.limiter = RateLimiter(rps)
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.latencies: List[float] = []
+        self.stats = {'requests': 0, 'cache_hits': 0, 'retries': 0, 'throttled': 0, 'failures': 0}
+
+    async def complete(self, prompt: str) -> str:
+        """프롬프트 하나 → 응답 내용"""
+        payload = {
+            'model': self.model,
+            'messages': [{'role': 'user', 'content': prompt}],
+            'temperature': self.temperature,
+        }
+        request_hash = hashlib.sha256(
+            json.dumps(payload, sort_keys=True, ensure_ascii=False).encode('utf-8')
+        ).hexdigest()
+
+        if self.cache is not None:
+            cached = self.cache.get(request_hash)
+            if cached is not None:
+                self.stats['cache_hits'] += 1
+                return cached
+
+        # 재시도 대기 중에도 슬롯을 잡고 있음 → 서버가 밀릴 때 전체 요청 속도가 같이 줄어듦
+        async with self._semaphore:
+            content = await self._post_with_retry(payload)
+
+        if self.cache is not None:
+            self.cache.put(request_hash, self.model, content)
+        return content
+
+    async def _post_with_retry(self, payload: Dict) -> str:
+        for attempt in range(self.retries + 1):
+            await self.limiter.acquire()
+            self.stats['requests'] += 1
+            started = time.perf_counter()
+            retry_after = 0.0
+            try:
+                status, headers, body = await self.http.post_json(
+                    self.url, payload, self.headers, self.timeout)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, HTTPError) as e:
+                error = f"{type(e).__name__}: {e}"
+            else:
+                if status == 200:
+                    try:
+                        content = json.loads(body)['choices'][0]['message']['content']
+                        if not isinstance(content, str):
+                            raise TypeError(f"content가 문자열이 아님 ({type(content).__name__})")
+                    except (ValueError, LookupError, TypeError) as e:
+                        # 잘리거나 형식이 다른 200 응답 → 네트워크 오류처럼 재시도, 끝내 실패하면 LLMError
+                        error = f"응답 파싱 실패 ({type(e).__name__}: {e}): " \
+                                f"{body[:200].decode('utf-8', 'replace')}"
+                    else:
+                        self.latencies.append(time.perf_counter() - started)
+                        return content
+                else:
+                    error = f"HTTP {status}: {body[:200].decode('utf-8', 'replace')}"
+                    if status == 429:
+                        self.stats['throttled'] += 1
+                    if status not in RETRY_STATUS:
+                        break
+                    try:
+                        retry_after = float(headers.get('retry-after', 0))
+                    except ValueError:
+                        retry_after = 0.0
+
+            if attempt < self.retries:
+                self.stats['retries'] += 1
+                # Retry-After는 최소 대기 시간으로만 사용 (동시에 거절된 요청이 한꺼번에 다시 몰리지 않게)
+                backoff = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.0)
+                await asyncio.sleep(max(retry_after, backoff))
+
+        self.stats['failures'] += 1
+        raise LLMError(error)
+
+    async def close(self):
+        await self.http.close()
+
+
+class DraftStore:
+    """blog_posts draft 저장 (SAVE_BATCH개씩 blog_posts.save_drafts 한 번)"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self._pending: List[Dict] = []
+        self.saved = 0
+
+    def add(self, keyword_id: int, title: str, content: str):
+        self._pending.append({'keyword_id': keyword_id, 'title': title, 'content': content})
+        if len(self._pending) >= SAVE_BATCH:
+            self.flush()
+
+    def flush(self):
+        """키워드의 기존 draft는 덮어쓰고, 없으면 새 draft 추가"""
+        if not self._pending:
+            return
+        blog_posts.save_drafts(self.conn, self._pending)
+        self.saved += len(self._pending)
+        self._pending.clear()
+
+
+async def dispatch(prompts: Iterable[Dict], client: LLMClient, store: DraftStore,
+                   workers: int = DEFAULT_CONCURRENCY) -> Dict:
+    """
+    프롬프트 결과(generate_full_blog_prompt + keyword_id)를 키워드 단위로 발송
+
+    키워드마다 제목 요청 → pick_title → 본문 요청 순서, 키워드끼리는 workers개 동시 처리.
+    큐 크기가 workers * 2로 제한되어 API가 느리면 프롬프트 생성도 같이 멈춘다.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=workers * 2)
+    failed = []
+
+    async def produce():
+        for prompt in prompts:
+            await queue.put(prompt)
+        for _ in range(workers):
+            await queue.put(None)
+
+    async def work():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            try:
+                titles = await client.complete(item['title_generation_prompt'])
+                title = pick_title(titles)
+                content = await client.complete(
+                    item['body_generation_prompt'] + BODY_TITLE_SUFFIX.format(title=title))
+            except LLMError as e:
+                failed.append((item['keyword'], str(e)))
+                continue
+            store.add(item['keyword_id'], title, content)
+
+    try:
+        await asyncio.gather(produce(), *(work() for _ in range(workers)))
+    finally:
+        # 예상 못 한 예외/중단이어도 이미 받은 draft는 저장
+        store.flush()
+    return {'saved': store.saved, 'failed': failed}
+
+
+def iter_jsonl(path: Path) -> Iterator[Dict]:
+    """integrated_blog_workflow.py --batch 결과 파일"""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method='inclusive')[int(pct) - 1]
+
+
+async def run_dispatch(prompts: Iterable[Dict], endpoint: str = DEFAULT_ENDPOINT,
+                       model: str = DEFAULT_MODEL, concurrency: int = DEFAULT_CONCURRENCY,
+                       rps: float = DEFAULT_RPS, retries: int = DEFAULT_RETRIES,
+                       timeout: float = DEFAULT_TIMEOUT, use_cache: bool = True,
+                       redo: bool = False) -> Dict:
+    """
+    발송 실행 + 통계 출력
+
+    redo가 아니면 포스팅 이력이 있는 키워드는 건너뜀
+    (DB에서 만드는 프롬프트는 iter_batch_prompts(exclude_posted=True)가 SQL에서 먼저 제외,
+    JSONL 등 외부 목록은 이력 키워드 ID 집합으로 한 번 더 거름)
+    """
+
+    print("=" * 80)
+    print("🤖 LLM 자동 발송 (제목 → 본문 → blog_posts)")
+    print("=" * 80)
+    print(f"\n   endpoint: {endpoint} / model: {model}")
+    print(f"   동시 요청: {concurrency} / 속도 제한: {rps:g} req/s / 재시도: {retries}회")
+
+    api_key = os.environ.get('LLM_API_KEY') or os.environ.get('OPENAI_API_KEY')
+    pool = keyword_db.get_pool()
+    cache = ResponseCache(Path(pool.db_path).parent / RESPONSE_CACHE_NAME) if use_cache else None
+    client = LLMClient(endpoint, model, api_key, concurrency, rps, retries, timeout,
+                       cache=cache)
+    conn = pool.acquire()
+    store = DraftStore(conn)
+
+    skipped = 0
+    if not redo:
+        existing = blog_posts.posted_keyword_ids(conn)
+
+        def without_existing(items):
+            nonlocal skipped
+            for item in items:
+                if item['keyword_id'] in existing:
+                    skipped += 1
+                    continue
+                yield item
+
+        prompts = without_existing(prompts)
+
+    started = time.perf_counter()
+    try:
+        result = await dispatch(prompts, client, store, workers=concurrency)
+    finally:
+        await client.close()
+        pool.release(conn)
+        if cache is not None:
+            cache.close()
+    elapsed = max(time.perf_counter() - started, 1e-9)
+
+    stats = {
+        **client.stats,
+        'saved': result['saved'],
+        'failed': len(result['failed']),
+        'skipped_existing': skipped,
+        'seconds': elapsed,
+        'keywords_per_second': result['saved'] / elapsed,
+        'latency_p50': _percentile(client.latencies, 50),
+        'latency_p99': _percentile(client.latencies, 99),
+    }
+
+    print(f"\n📊 결과 ({elapsed:.2f}초)")
+    print(f"   - draft 저장: {stats['saved']:,}개 ({stats['keywords_per_second']:.2f} 키워드/s)")
+    if skipped:
+        print(f"   - 기존 포스트 있음 (건너뜀): {skipped:,}개 (--redo로 다시 생성)")
+    print(f"   - API 요청: {stats['requests']:,}회 / 캐시 hit: {stats['cache_hits']:,}회")
+    print(f"   - 재시도: {stats['retries']:,}회 (429: {stats['throttled']:,}회)")
+    if client.latencies:
+        print(f"   - 응답 시간: p50 {stats['latency_p50'] * 1000:,.0f}ms"
+              f" / p99 {stats['latency_p99'] * 1000:,.0f}ms")
+    if result['failed']:
+        print(f"\n⚠️  실패 {len(result['failed']):,}개:")
+        for keyword, error in result['failed'][:10]:
+            print(f"   - {keyword}: {error}")
+
+    print(f"\n💾 DB 위치: {keyword_db.DB_PATH}\n")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM 자동 발송 (제목 → 본문 → blog_posts)")
+    parser.add_argument("--input", type=Path,
+                        help="integrated_blog_workflow.py --batch 결과 JSONL (없으면 DB에서 생성)")
+    parser.add_argument("--persona", nargs="+", type=persona_arg, help="페르소나 필터 (예: 3 또는 3-2)")
+    parser.add_argument("--min-volume", type=int, help="최소 월간 검색량")
+    parser.add_argument("--ids", type=int, nargs="+", help="키워드 ID 목록")
+    parser.add_argument("--limit", type=int, help="최대 키워드 수")
+    parser.add_argument("--endpoint", default=DEFAULT_ENDPOINT,
+                        help="OpenAI 호환 API 주소 (.../v1, 환경 변수 LLM_ENDPOINT)")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="모델 이름 (환경 변수 LLM_MODEL)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="동시 요청 수")
+    parser.add_argument("--rps", type=float, default=DEFAULT_RPS,
+                        help="초당 최대 요청 수 (0 = 제한 없음)")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES, help="요청별 재시도 횟수")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="요청 타임아웃 (초)")
+    parser.add_argument("--no-cache", action="store_true", help="응답 캐시 미사용")
+    parser.add_argument("--redo", action="store_true",
+                        help="이미 포스트가 있는 키워드도 다시 생성 (기존 draft 덮어씀)")
+    args = parser.parse_args()
+
+    if args.input:
+        prompts = itertools.islice(iter_jsonl(args.input), args.limit)
+    else:
+        persona_ids, sub_persona_ids = split_personas(args.persona)
+        prompts = IntegratedBlogWorkflow().iter_batch_prompts(
+            keyword_ids=args.ids,
+            persona_ids=persona_ids,
+            sub_persona_ids=sub_persona_ids,
+            min_volume=args.min_volume,
+            limit=args.limit,
+            exclude_posted=not args.redo,
+        )
+
+    asyncio.run(run_dispatch(
+        prompts,
+        endpoint=args.endpoint,
+        model=args.model,
+        concurrency=args.concurrency,
+        rps=args.rps,
+        retries=args.retries,
+        timeout=args.timeout,
+        use_cache=not args.no_cache,
+        redo=args.redo,
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+로컬 모의 LLM 서버 (OpenAI 호환 /v1/chat/completions)
+llm_dispatch.py의 처리량/백프레셔/재시도를 외부 API 없이 시험하기 위한 서버
+
+- 응답 지연: --latency 초 ± --jitter
+- 동시 처리 한도: --capacity 초과 요청은 429 + Retry-After (백프레셔)
+- 장애 주입: --error-rate 비율로 500 응답
+- GET /stats: 요청/거절/오류 수, 최대 동시 처리 수
+
+사용법:
+    python3 scripts/mock_llm_server.py --port 8800 --latency 0.2 --capacity 16
+    python3 scripts/llm_dispatch.py --endpoint http://127.0.0.1:8800/v1 --persona 3-2
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import time
+
+from async_http import BadRequest, HTTPError, read_request, write_response
+
+DEFAULT_PORT = 8800
+
+
+class MockLLMServer:
+    """모의 chat completions 서버"""
+
+    def __init__(self, latency: float = 0.2, jitter: float = 0.05, capacity: int = 16,
+                 error_rate: float = 0.0, retry_after: float = 0.1, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.in_flight = 0
+        self.stats = {'requests': 0, 'ok': 0, 'rejected': 0, 'errors': 0, 'max_in_flight': 0}
+
+    def completion(self, payload: dict) -> dict:
+        """프롬프트 해시로 만든 결정적 응답 (같은 요청 → 같은 내용)"""
+        prompt = payload['messages'][-1]['content']
+        digest = hashlib.sha1(prompt.encode('utf-8')).hexdigest()[:8]
+        titles = '\n'.join(f"{i}. [모의 제목 {i}] {digest}" for i in range(1, 4))
+        content = f"{titles}\n\n모의 본문 {digest} ({len(prompt):,}자 프롬프트에 대한 응답)"
+
+        return {
+            'id': f"mock-{digest}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': payload.get('model', 'mock'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop',
+            }],
+            'usage': {'prompt_tokens': len(prompt), 'completion_tokens': len(content),
+                      'total_tokens': len(prompt) + len(content)},
+        }
+
+    async def handle(self, method: str, target: str, body: bytes) -> tuple:
+        """요청 → (상태 코드, 응답 본문, 추가 헤더)"""
+        if method == 'GET' and target == '/stats':
+            return 200, {**self.stats, 'in_flight': self.in_flight}, {}
+        if method != 'POST' or not target.endswith('/chat/completions'):
+            return 404, {'error': {'message': f"{method} {target}"}}, {}
+
+        self.stats['requests'] += 1
+        if self.in_flight >= self.capacity:
+            self.stats['rejected'] += 1
+            return 429, {'error': {'message': 'capacity exceeded'}}, {
+                'Retry-After': f"{self.retry_after:g}"}
+
+        self.in_flight += 1
+        self.stats['max_in_flight'] = max(self.stats['max_in_flight'], self.in_flight)
+        try:
+            await asyncio.sleep(max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter)))
+            if self.random.random() < self.error_rate:
+                self.stats['errors'] += 1
+                return 500, {'error': {'message': 'injected failure'}}, {}
+            self.stats['ok'] += 1
+            return 200, self.completion(json.loads(body)), {}
+        finally:
+            self.in_flight -= 1
+
+    async def serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """keep-alive 커넥션 하나 처리"""
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except BadRequest as e:
+                    # 형식이 잘못된 요청: 400 후 연결 종료
+                    body = json.dumps({'error': {'message': str(e)}}, ensure_ascii=False).encode('utf-8')
+                    await write_response(writer, 400, body, {'Connection': 'close'})
+                    break
+                if request is None:
+                    break
+                method, target, _, body = request
+                status, payload, headers = await self.handle(method, target, body)
+                await write_response(
+                    writer, status, json.dumps(payload, ensure_ascii=False).encode('utf-8'), headers)
+        except (ConnectionError, HTTPError, ValueError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = '127.0.0.1', port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        """서버 시작 (port=0이면 빈 포트 자동 선택)"""
+        return await asyncio.start_server(self.serve_connection, host, port)
+
+
+async def _main(args):
+    server = MockLLMServer(args.latency, args.jitter, args.capacity, args.error_rate,
+                           args.retry_after, args.seed)
+    listener = await server.start(args.host, args.port)
+
+    print("=" * 80)
+    print("🧪 모의 LLM 서버 (OpenAI 호환)")
+    print("=" * 80)
+    print(f"\n   endpoint: http://{args.host}:{args.port}/v1")
+    print(f"   지연: {args.latency}초 ± {args.jitter} / 동시 처리 한도: {args.capacity}"
+          f" / 오류율: {args.error_rate:.0%}")
+    print(f"   통계: http://{args.host}:{args.port}/stats")
+    print("\n   Ctrl+C로 종료\n")
+
+    async with listener:
+        await listener.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로컬 모의 LLM 서버")
+    parser.add_argument("--host", default='127.0.0.1')
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency", type=float, default=0.2, help="응답 지연 (초)")
+    parser.add_argument("--jitter", type=float, default=0.05, help="지연 편차 (초)")
+    parser.add_argument("--capacity", type=int, default=16, help="동시 처리 한도 (초과 시 429)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 응답 비율 (0~1)")
+    parser.add_argument("--retry-after", type=float, default=0.1, help="429 Retry-After (초)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        print("\n👋 종료합니다.")
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+병렬 세부 페르소나 라벨링
+키워드를 청크로 나눠 프로세스 풀에서 라벨링 → 단일 writer가 배치로 DB 기록
+
+사용법:
+    python3 scripts/reclassify_keywords_subpersona.py --full --workers 4
+    python3 scripts/parallel_labeling.py --benchmark --size 500000
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Iterable, Iterator, List
+
+from reclassify_keywords_subpersona import (
+    PAIN_PATTERNS,
+    SubPersonaClassifier,
+    label_keywords,
+    write_labels_bulk,
+)
+
+# 워커에 한 번에 넘기는 키워드 수
+DEFAULT_CHUNK_SIZE = 20000
+
+# writer가 한 트랜잭션으로 기록하는 변경 행 수
+WRITE_BATCH_SIZE = 50000
+
+# 워커 프로세스별 분류기 (initializer에서 한 번만 컴파일)
+_worker_classifier = None
+
+
+def _init_worker(pain_patterns: list):
+    """워커 초기화: 패턴을 워커당 한 번만 전달받아 컴파일"""
+    global _worker_classifier
+    _worker_classifier = SubPersonaClassifier(pain_patterns)
+
+
+def _label_chunk(chunk: list) -> tuple:
+    """워커에서 청크 라벨링 → (처리 행 수, 변경분)"""
+    return len(chunk), label_keywords(chunk, _worker_classifier)
+
+
+def iter_chunks(rows: Iterable, chunk_size: int) -> Iterator[List[tuple]]:
+    """행을 chunk_size개씩 묶음 (sqlite3.Row는 pickle 불가 → tuple 변환)"""
+    chunk = []
+    for row in rows:
+        chunk.append(tuple(row))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def label_parallel(rows: Iterable, workers: int = 4, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                   pain_patterns: list = PAIN_PATTERNS) -> Iterator[tuple]:
+    """
+    청크 단위 병렬 라벨링
+
+    처리 중인 청크를 workers * 2개로 제한해 메모리를 일정하게 유지하고,
+    완료되는 순서대로 결과를 내보낸다 (writer는 순서와 무관).
+
+    Args:
+        rows: (keyword_id, keyword, persona_id, sub_persona_id, confidence_score) 행
+        workers: 프로세스 수 (1 이하면 현재 프로세스에서 순차 처리)
+
+    Yields:
+        (처리 행 수, 변경분 리스트)
+    """
+    if workers <= 1:
+        classifier = SubPersonaClassifier(pain_patterns)
+        for chunk in iter_chunks(rows, chunk_size):
+            yield len(chunk), label_keywords(chunk, classifier)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(pain_patterns,)) as executor:
+        pending = set()
+
+        for chunk in iter_chunks(rows, chunk_size):
+            pending.add(executor.submit(_label_chunk, chunk))
+
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def run_parallel_labeling(conn: sqlite3.Connection, rows: Iterable, workers: int = 4,
+                          chunk_size: int = DEFAULT_CHUNK_SIZE,
+                          write_batch_size: int = WRITE_BATCH_SIZE) -> tuple:
+    """
+    병렬 라벨링 + 단일 writer 배치 기록
+
+    Returns:
+        (처리 행 수, 변경 행 수)
+    """
+    total = 0
+    changed = 0
+    buffer = []
+
+    for processed, changes in label_parallel(rows, workers, chunk_size):
+        total += processed
+        buffer.extend(changes)
+
+        if len(buffer) >= write_batch_size:
+            write_labels_bulk(conn, buffer)
+            changed += len(buffer)
+            buffer = []
+
+    if buffer:
+        write_labels_bulk(conn, buffer)
+        changed += len(buffer)
+
+    return total, changed
+
+
+# ============================================================
+# 벤치마크
+# ============================================================
+
+# 합성 키워드 재료 (실제 네이버 연관키워드 분포를 흉내)
+_SYNTHETIC_HEADS = {
+    1: ['홈캠', '펫캠', '가정용CCTV', '무선홈캠', 'LG홈캠', '스마트홈캠', '실내카메라'],
+    2: ['CCTV설치', 'CCTV세트', '4채널CCTV', '8채널CCTV', 'DIY CCTV', '자가설치'],
+    3: ['캡스', '세콤', 'KT텔레캅', '에스원', 'ADT캡스', '뷰가드', '기가아이즈', 'KTCCTV'],
+    4: ['NVR', 'DVR', '매장CCTV', '사무실CCTV', '공장CCTV', 'IP카메라', '업소용CCTV'],
+    5: ['도로CCTV', '버스CCTV', '실시간CCTV', 'CCTV종류', 'CCTV법률', 'CCTV확인'],
+}
+_SYNTHETIC_TAILS = [
+    '', '', '', '추천', '가격', '비용', '설치', '후기', '비교', '순위', '견적',
+    '고객센터', '위약금', '해지', 'AS', '약정', '렌탈', '요금', '문의', '이전',
+]
+_SYNTHETIC_PERSONA_WEIGHTS = [253, 104, 283, 270, 782]
+
+
+def generate_synthetic_rows(size: int, seed: int = 42) -> List[tuple]:
+    """합성 키워드 행 (keyword_id, keyword, persona_id, None, None)"""
+    rng = random.Random(seed)
+    personas = rng.choices(range(1, 6), weights=_SYNTHETIC_PERSONA_WEIGHTS, k=size)
+
+    rows = []
+    for keyword_id, persona_id in enumerate(personas, 1):
+        keyword = rng.choice(_SYNTHETIC_HEADS[persona_id]) + rng.choice(_SYNTHETIC_TAILS)
+        # 공백으로 구분해 고유하게 (숫자를 바로 붙이면 as\b 같은 단어 경계 패턴이 깨짐)
+        rows.append((keyword_id, f"{keyword} {keyword_id}", persona_id, None, None))
+    return rows
+
+
+def _create_benchmark_db(path: Path, rows: List[tuple]) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("""
+        CREATE TABLE keywords_master (
+            keyword_id INTEGER PRIMARY KEY,
+            keyword VARCHAR(200) NOT NULL,
+            persona_id INTEGER,
+            sub_persona_id VARCHAR(10),
+            confidence_score FLOAT,
+            updated_at TIMESTAMP
+        )
+    """)
+    with conn:
+        conn.executemany("""
+            INSERT INTO keywords_master
+            (keyword_id, keyword, persona_id, sub_persona_id, confidence_score)
+            VALUES (?, ?, ?, ?, ?)
+        """, rows)
+    return conn
+
+
+def benchmark(size: int = 500000, worker_counts: tuple = (1, 2, 4, 8)):
+    """워커 수별 라벨링 + 기록 처리량 비교 (임시 DB 사용)"""
+
+    print("=" * 80)
+    print(f"병렬 라벨링 벤치마크 (합성 키워드 {size:,}개, CPU {os.cpu_count()}개)")
+    print("=" * 80)
+
+    rows = generate_synthetic_rows(size)
+
+    print(f"\n{'워커':>4} {'시간(초)':>10} {'rows/s':>12} {'변경':>10} {'속도 향상':>10}")
+    print("-" * 55)
+
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in worker_counts:
+            db_path = Path(tmp) / f"bench_{workers}.db"
+            conn = _create_benchmark_db(db_path, rows)
+
+            started = time.perf_counter()
+            total, changed = run_parallel_labeling(conn, rows, workers=workers)
+            elapsed = time.perf_counter() - started
+            conn.close()
+
+            baseline = baseline or elapsed
+            print(f"{workers:>4} {elapsed:>10.2f} {total / elapsed:>12,.0f} "
+                  f"{changed:>10,} {baseline / elapsed:>9.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="병렬 세부 페르소나 라벨링")
+    parser.add_argument("--benchmark", action="store_true", help="워커 수별 벤치마크 실행")
+    parser.add_argument("--size", type=int, default=500000, help="벤치마크 합성 키워드 수")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8],
+                        help="벤치마크할 워커 수 목록")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.size, tuple(args.workers))
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+포스팅 캘린더 스케줄러
+하루 N개 슬롯 + 세부 페르소나별 쿼터로 앞으로 몇 주의 blog_posts.target_date를 채움
+
+- 후보: 포스팅 이력이 없는 키워드 (keyword_db.SQL_NOT_POSTED), 저장된 우선순위
+  (keywords_master.posting_priority) 순 - 쿼리 한 번으로 읽고 세부 페르소나별 힙(heapq)에 담음
+  → heapify O(n) 후 필요한 슬롯 수만큼만 꺼냄 (후보 전체 정렬 없음)
+- 하루 배치 순서:
+  1. 쿼터를 지정한 세부 페르소나: 매일 정확히 쿼터만큼 (높은 점수부터)
+  2. 남은 슬롯: 우선순위 등급(CRITICAL → high → medium → low) 순으로 한 바퀴씩 돌며 1개씩
+     같은 등급 안에서는 전날 멈춘 다음 페르소나부터 (페르소나 로테이션)
+  → 쿼터가 없어도 3-2(CRITICAL)가 매일 첫 슬롯을 받음
+- 이미 목표일이 잡힌 포스트는 그날의 슬롯/쿼터에서 먼저 차감
+- 결과는 draft(제목/본문 없음) + target_date로 한 트랜잭션에 저장 (blog_posts.save_drafts)
+  원고는 llm_dispatch.py --ids ... --redo로 채우면 목표일이 유지됨
+- 5번 페르소나(해당없음)는 추천과 같이 제외 (쿼터에 적은 세부 페르소나는 포함)
+- 근접 중복 클러스터(keyword_similarity.py)가 있으면 클러스터당 대표 하나만,
+  클러스터 안에 이미 포스트가 있으면 대표도 제외
+
+사용법:
+    python3 scripts/posting_scheduler.py --per-day 3 --weeks 4 --dry-run
+    python3 scripts/posting_scheduler.py --per-day 4 --quota 3-2=2 --start 2025-12-01
+    python3 scripts/posting_scheduler.py --per-day 3 --replan   # 원고 없는 계획 draft를 지우고 다시 배치
+"""
+
+import argparse
+import heapq
+import json
+import sqlite3
+import time
+from collections import defaultdict, deque
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+import blog_posts
+import keyword_db
+from blog_automation_helper import POSTING_PRIORITY_SQL, BlogAutomationHelper
+
+DEFAULT_PER_DAY = 3
+DEFAULT_WEEKS = 4
+DEFAULT_MIN_VOLUME = 100
+
+# sub_personas.priority_level 순서 (목록에 없는 등급은 맨 뒤)
+PRIORITY_LEVELS = ('CRITICAL', 'high', 'medium', 'low')
+
+WEEKDAYS = '월화수목금토일'
+
+# 튜플 행으로 읽음 (Row 객체 생성 비용 없이 바로 힙 항목으로 변환)
+# 키워드 문자열은 배치된 슬롯만 나중에 조회 (후보 전체의 문자열 디코딩 비용 제거)
+# {priority}: 저장된 우선순위 컬럼, 없는 DB(upgrade_posting_priority.py 전)는 같은 식을 바로 계산
+SQL_CANDIDATES = f"""
+    SELECT k.sub_persona_id, {{priority}}, kt.search_volume_total, k.keyword_id
+    FROM keywords_master k
+    JOIN keyword_latest kt ON k.keyword_id = kt.keyword_id
+    WHERE kt.search_volume_total >= :min_volume
+    AND k.sub_persona_id IS NOT NULL
+    AND (k.persona_id != 5 OR k.sub_persona_id IN (SELECT value FROM json_each(:include)))
+    AND {keyword_db.SQL_NOT_POSTED}
+"""
+
+SQL_ONE_PER_CLUSTER = f"""
+    AND {keyword_db.SQL_CLUSTER_REPRESENTATIVE}
+    AND {keyword_db.SQL_CLUSTER_NOT_POSTED}
+"""
+
+SQL_KEYWORD_NAMES = """
+    SELECT keyword_id, keyword FROM keywords_master
+    WHERE keyword_id IN (SELECT value FROM json_each(?))
+"""
+
+# 기간 안에 이미 목표일이 잡힌 포스트 (날짜, 세부 페르소나별 수)
+SQL_BOOKED = """
+    SELECT bp.target_date, k.sub_persona_id, COUNT(*)
+    FROM blog_posts bp
+    JOIN keywords_master k ON bp.keyword_id = k.keyword_id
+    WHERE bp.target_date BETWEEN ? AND ?
+    GROUP BY bp.target_date, k.sub_persona_id
+"""
+
+# --replan: 아직 원고가 없는 계획 draft (시작일 이후) 삭제
+SQL_CLEAR_PLAN = """
+    DELETE FROM blog_posts
+    WHERE status = 'draft' AND content IS NULL
+    AND target_date >= ?
+"""
+
+
+def fetch_candidate_heaps(conn: sqlite3.Connection, min_volume: int = DEFAULT_MIN_VOLUME,
+                          include: Optional[List[str]] = None,
+                          one_per_cluster: bool = False,
+                          materialized: bool = True) -> Dict[str, list]:
+    """
+    포스팅 후보 → 세부 페르소나별 최소 힙
+
+    힙 항목: (-우선순위, -검색량, keyword_id) → heappop이 가장 높은 점수부터
+    (동점이면 검색량이 큰 키워드, 그다음 keyword_id 순으로 결과가 항상 같음)
+
+    Args:
+        min_volume: 최소 검색량
+        include: 5번 페르소나라도 후보에 넣을 세부 페르소나 ID
+        one_per_cluster: 근접 중복 클러스터당 대표 키워드만 (cluster_id 컬럼 필요)
+        materialized: posting_priority 컬럼 사용 (False면 원점수 계산 후 파이썬에서 반올림 - 같은 점수)
+    """
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    priority = "k.posting_priority" if materialized else POSTING_PRIORITY_SQL
+    sql = SQL_CANDIDATES.format(priority=priority) + (SQL_ONE_PER_CLUSTER if one_per_cluster else "")
+    cursor.execute(sql, {'min_volume': min_volume, 'include': json.dumps(include or [])})
+
+    heaps = defaultdict(list)
+    for sub_persona_id, priority, volume, keyword_id in cursor:
+        if not materialized:
+            priority = round(priority, 2)
+        heaps[sub_persona_id].append((-(priority or 0.0), -(volume or 0), keyword_id))
+    for heap in heaps.values():
+        heapq.heapify(heap)
+    return dict(heaps)
+
+
+def fetch_priority_levels(conn: sqlite3.Connection) -> Dict[str, str]:
+    """세부 페르소나 ID → priority_level"""
+    return {row['sub_persona_id']: row['priority_level']
+            for row in keyword_db.fetch_sub_personas(conn)}
+
+
+def fetch_booked(conn: sqlite3.Connection, start: date, end: date) -> Dict[str, Dict[str, int]]:
+    """기간 안에 이미 잡힌 포스트 수 {날짜: {세부 페르소나: 수}}"""
+    booked = defaultdict(dict)
+    for target_date, sub_persona_id, count in conn.execute(
+            SQL_BOOKED, (start.isoformat(), end.isoformat())):
+        booked[target_date][sub_persona_id] = count
+    return dict(booked)
+
+
+def _level_rank(level: Optional[str]) -> int:
+    upper = [name.upper() for name in PRIORITY_LEVELS]
+    return upper.index(level.upper()) if level and level.upper() in upper else len(PRIORITY_LEVELS)
+
+
+def plan_calendar(heaps: Dict[str, list], levels: Dict[str, str], start: date, days: int,
+                  per_day: int, quotas: Optional[Dict[str, int]] = None,
+                  booked: Optional[Dict[str, Dict[str, int]]] = None) -> List[Dict]:
+    """
+    슬롯 배치 (heaps는 꺼낸 만큼 줄어듦)
+
+    Args:
+        heaps: fetch_candidate_heaps() 결과
+        levels: 세부 페르소나 ID → priority_level
+        start: 첫 날짜
+        days: 일수
+        per_day: 하루 포스팅 수
+        quotas: 세부 페르소나별 하루 포스팅 수 (지정한 페르소나는 로테이션에서 빠짐)
+        booked: fetch_booked() 결과 (이미 잡힌 포스트만큼 슬롯 차감)
+
+    Returns:
+        [{'target_date', 'keyword_id', 'sub_persona_id', 'priority_score',
+          'search_volume_total'}, ...] 날짜 → 슬롯 순 (키워드 문자열은 fill_keywords)
+    """
+    quotas = {sub: count for sub, count in (quotas or {}).items() if count > 0}
+    booked = booked or {}
+    order = sorted(heaps, key=lambda sub: (_level_rank(levels.get(sub)), sub))
+
+    # 등급별 로테이션 (쿼터 페르소나 제외), 한 번 방문할 때마다 뒤로 돌림
+    rotations: Dict[int, deque] = {}
+    for sub in order:
+        if sub not in quotas:
+            rotations.setdefault(_level_rank(levels.get(sub)), deque()).append(sub)
+
+    slots = []
+
+    def take(day: str, sub: str):
+        priority, volume, keyword_id = heapq.heappop(heaps[sub])
+        slots.append({
+            'target_date': day,
+            'keyword_id': keyword_id,
+            'sub_persona_id': sub,
+            'priority_score': -priority,
+            'search_volume_total': -volume,
+        })
+
+    for offset in range(days):
+        day = (start + timedelta(days=offset)).isoformat()
+        taken = dict(booked.get(day, {}))
+        free = per_day - sum(taken.values())
+
+        # 1. 쿼터
+        for sub in order:
+            if sub in quotas:
+                for _ in range(min(quotas[sub] - taken.get(sub, 0), free, len(heaps[sub]))):
+                    take(day, sub)
+                    free -= 1
+
+        # 2. 등급 순 로테이션 (한 바퀴에 페르소나당 1개)
+        while free > 0:
+            progressed = False
+            for rank in sorted(rotations):
+                rotation = rotations[rank]
+                for _ in range(len(rotation)):
+                    if free == 0:
+                        break
+                    sub = rotation[0]
+                    rotation.rotate(-1)
+                    if heaps[sub]:
+                        take(day, sub)
+                        free -= 1
+                        progressed = True
+            if not progressed:
+                break
+
+    return slots
+
+
+def fill_keywords(conn: sqlite3.Connection, slots: List[Dict]) -> List[Dict]:
+    """배치된 슬롯에 키워드 문자열 추가 (쿼리 한 번)"""
+    names = dict(conn.execute(SQL_KEYWORD_NAMES, (
+        json.dumps([slot['keyword_id'] for slot in slots]),)).fetchall())
+    for slot in slots:
+        slot['keyword'] = names.get(slot['keyword_id'], '')
+    return slots
+
+
+def save_calendar(conn: sqlite3.Connection, slots: List[Dict]) -> int:
+    """계획을 draft + target_date로 저장 (한 트랜잭션), 저장한 수 반환"""
+    result = blog_posts.save_drafts(conn, [
+        {'keyword_id': slot['keyword_id'], 'target_date': slot['target_date']}
+        for slot in slots
+    ], replace_existing=False)
+    return result['inserted']
+
+
+def _parse_quotas(items: List[str]) -> Dict[str, int]:
+    quotas = {}
+    for item in items or []:
+        sub, sep, count = item.partition('=')
+        if not sep or not count.strip().isdigit():
+            raise SystemExit(f"❌ 쿼터 형식: 세부페르소나=하루개수 (예: 3-2=2), 입력: {item}")
+        quotas[sub.strip()] = int(count)
+    return quotas
+
+
+def _print_calendar(slots: List[Dict], booked: Dict[str, Dict[str, int]]):
+    by_day = defaultdict(list)
+    for slot in slots:
+        by_day[slot['target_date']].append(slot)
+
+    for day in sorted(set(by_day) | set(booked)):
+        weekday = WEEKDAYS[date.fromisoformat(day).weekday()]
+        existing = sum(booked.get(day, {}).values())
+        note = f"  (기존 {existing}개)" if existing else ""
+        print(f"\n📅 {day} ({weekday}){note}")
+        for slot in by_day.get(day, []):
+            print(f"   {slot['sub_persona_id']:<5} {slot['keyword']:<30} "
+                  f"{slot['search_volume_total']:>8,}회  {slot['priority_score']:>5.1f}점")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="포스팅 캘린더 스케줄러")
+    parser.add_argument("--per-day", type=int, default=DEFAULT_PER_DAY, help="하루 포스팅 수")
+    parser.add_argument("--quota", nargs="+", metavar="SUB=N",
+                        help="세부 페르소나별 하루 포스팅 수 (예: 3-2=2 1-1=1)")
+    parser.add_argument("--weeks", type=int, default=DEFAULT_WEEKS, help="계획 기간 (주)")
+    parser.add_argument("--start", type=date.fromisoformat,
+                        help="시작일 YYYY-MM-DD (기본: 내일)")
+    parser.add_argument("--min-volume", type=int, default=DEFAULT_MIN_VOLUME, help="최소 검색량")
+    parser.add_argument("--replan", action="store_true",
+                        help="시작일 이후 원고 없는 계획 draft를 지우고 다시 배치")
+    parser.add_argument("--dry-run", action="store_true", help="저장하지 않고 계획만 출력")
+    args = parser.parse_args()
+
+    quotas = _parse_quotas(args.quota)
+    if sum(quotas.values()) > args.per_day:
+        raise SystemExit(f"❌ 쿼터 합계({sum(quotas.values())})가 하루 포스팅 수({args.per_day})보다 큽니다")
+
+    start = args.start or date.today() + timedelta(days=1)
+    days = args.weeks * 7
+    end = start + timedelta(days=days - 1)
+
+    print("=" * 80)
+    print("🗓️  포스팅 캘린더 스케줄러")
+    print("=" * 80)
+    print(f"\n   기간: {start} ~ {end} ({args.weeks}주) / 하루 {args.per_day}개")
+    if quotas:
+        print("   쿼터: " + ", ".join(f"{sub} {count}개/일" for sub, count in quotas.items()))
+
+    keyword_db.prepare_for_write()
+    helper = BlogAutomationHelper()
+    materialized = helper.has_materialized_priority
+    if materialized:
+        refreshed = helper.refresh_posting_priority()
+    else:
+        refreshed = 0
+        print("   ℹ️  posting_priority 컬럼 없음 → 우선순위를 조회 시 계산 (upgrade_posting_priority.py 적용 시 더 빠름)")
+    conn = helper.conn
+
+    try:
+        started = time.perf_counter()
+        if args.replan:
+            # 커밋은 save_calendar와 함께 (삭제 + 새 계획이 한 트랜잭션, --dry-run이면 롤백)
+            cleared = conn.execute(SQL_CLEAR_PLAN, (start.isoformat(),)).rowcount
+            print(f"   ♻️  계획 draft 삭제: {cleared:,}개")
+
+        heaps = fetch_candidate_heaps(conn, args.min_volume, list(quotas),
+                                      one_per_cluster=helper.has_keyword_clusters,
+                                      materialized=materialized)
+        candidates = sum(len(heap) for heap in heaps.values())
+        booked = fetch_booked(conn, start, end)
+        slots = plan_calendar(heaps, fetch_priority_levels(conn), start, days,
+                              args.per_day, quotas, booked)
+        fill_keywords(conn, slots)
+        elapsed = time.perf_counter() - started
+
+        _print_calendar(slots, booked)
+
+        per_sub = defaultdict(int)
+        for slot in slots:
+            per_sub[slot['sub_persona_id']] += 1
+        print("\n" + "=" * 80)
+        print(f"📊 후보 {candidates:,}개 → 배치 {len(slots):,}개 ({elapsed * 1000:.0f}ms"
+              f", 우선순위 갱신 {refreshed:,}개)")
+        print("   " + " / ".join(f"{sub} {count}개" for sub, count in sorted(per_sub.items())))
+        empty = sum(max(0, args.per_day - sum(booked.get(
+            (start + timedelta(days=offset)).isoformat(), {}).values())) for offset in range(days)) - len(slots)
+        if empty > 0:
+            print(f"   ⚠️  후보가 부족해 비어 있는 슬롯: {empty:,}개")
+
+        if args.dry_run:
+            conn.rollback()
+            print("\n🔍 --dry-run: 저장하지 않았습니다")
+        else:
+            saved = save_calendar(conn, slots)
+            conn.commit()
+            print(f"\n💾 blog_posts draft + target_date 저장: {saved:,}개")
+            print("   원고 생성: python3 scripts/llm_dispatch.py --ids <keyword_id ...> --redo")
+    finally:
+        helper.close()
+
+    print(f"\n💾 DB 위치: {keyword_db.DB_PATH}\n")
+
+
+if __name__ == "__main__":
+    main()
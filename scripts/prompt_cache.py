@@ -0,0 +1,148 @@
+"""
+프롬프트 렌더링 결과 캐시 (내용 주소 방식)
+키 = 컨텍스트 행(get_keyword_full_context 결과 등) + 템플릿 버전의 해시
+
+- 대상(키워드)마다 한 행만 유지: 해시가 같으면 저장된 결과를 그대로 반환(hit),
+  다르면 새로 렌더링해 덮어씀(miss) → 캐시 크기는 키워드 수에 비례
+- 템플릿 파일을 고치면 버전(내용 해시)이 바뀌어 해당 템플릿을 쓰는 결과만 다시 생성
+- miss 결과는 모아서 한 트랜잭션으로 저장 (hit만 있으면 디스크 쓰기 없음)
+- 저장 위치: 키워드 DB와 같은 폴더의 prompt_cache.db (키워드 DB와 분리)
+
+사용법:
+    cache = PromptCache()
+    result, hit = cache.get_or_render('full_blog', keyword, context, versions, render)
+    cache.flush()
+    print(cache.stats)
+"""
+
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import keyword_db
+
+# 키워드 DB와 같은 폴더에 만드는 캐시 파일 (이름이 keyword_db.CACHE_DB_SUFFIX로 끝나 샤드 탐색에서 제외)
+CACHE_DB_NAME = "prompt_cache.db"
+
+# 결과 형식(딕셔너리 키 등)을 바꾸면 올려서 기존 캐시를 무효화
+CACHE_FORMAT = 1
+
+# miss 결과를 모아 한 번에 저장하는 개수
+FLUSH_BATCH = 500
+
+SQL_CREATE = """
+    CREATE TABLE IF NOT EXISTS prompt_cache (
+        namespace VARCHAR(50) NOT NULL,
+        entry_key VARCHAR(300) NOT NULL,
+        content_hash CHAR(64) NOT NULL,
+        result TEXT NOT NULL,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (namespace, entry_key)
+    )
+"""
+
+SQL_GET = """
+    SELECT content_hash, result FROM prompt_cache
+    WHERE namespace = ? AND entry_key = ?
+"""
+
+SQL_PUT = """
+    INSERT OR REPLACE INTO prompt_cache (namespace, entry_key, content_hash, result)
+    VALUES (?, ?, ?, ?)
+"""
+
+
+def cache_db_path(keyword_db_path: Optional[Path] = None) -> Path:
+    """키워드 DB → 옆 폴더의 프롬프트 캐시 DB (기본: 호출 시점의 keyword_db.DB_PATH)"""
+    return Path(keyword_db_path or keyword_db.DB_PATH).parent / CACHE_DB_NAME
+
+
+def content_hash(namespace: str, fields: Dict[str, Any], versions: Tuple[str, ...]) -> str:
+    """컨텍스트 행 + 템플릿 버전 → sha256 (키 순서와 무관)"""
+    payload = json.dumps(
+        [CACHE_FORMAT, namespace, fields, list(versions)],
+        sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class PromptCache:
+    """렌더링 결과 캐시 (hit/miss 카운터 포함)"""
+
+    def __init__(self, db_path: Optional[Path] = None, enabled: bool = True):
+        """
+        Args:
+            db_path: 캐시 DB 파일 (기본: cache_db_path())
+            enabled: False면 항상 새로 렌더링 (카운터는 miss로 집계, DB 미사용)
+        """
+        self.db_path = Path(db_path) if db_path else cache_db_path()
+        self.enabled = enabled
+        self.stats = {'hits': 0, 'misses': 0}
+        self._pending: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        self._pool = None
+        self.conn: Optional[sqlite3.Connection] = None
+
+        if enabled:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._pool = keyword_db.get_pool(self.db_path)
+            self.conn = self._pool.acquire()
+            self.conn.execute(SQL_CREATE)
+            self.conn.commit()
+
+    def get_or_render(self, namespace: str, entry_key: str, fields: Dict[str, Any],
+                      versions: Tuple[str, ...], render: Callable[[], Dict]) -> Tuple[Dict, bool]:
+        """
+        캐시된 결과 또는 render() 결과
+
+        Args:
+            namespace: 결과 종류 ('full_blog', 'generator' 등)
+            entry_key: 대상 식별자 (키워드 등, 대상마다 한 행)
+            fields: 렌더링 입력 (컨텍스트 행)
+            versions: 렌더링에 쓰인 템플릿/변수 파일 버전
+            render: miss일 때 호출 (JSON으로 저장 가능한 값 반환)
+
+        Returns:
+            (결과, hit 여부) - 결과는 호출마다 새 객체
+        """
+        if not self.enabled:
+            self.stats['misses'] += 1
+            return render(), False
+
+        digest = content_hash(namespace, fields, versions)
+        cached = self._pending.get((namespace, entry_key))
+        if cached is None:
+            cached = self.conn.execute(SQL_GET, (namespace, entry_key)).fetchone()
+
+        if cached is not None and cached[0] == digest:
+            self.stats['hits'] += 1
+            return json.loads(cached[1]), True
+
+        self.stats['misses'] += 1
+        result = render()
+        self._pending[(namespace, entry_key)] = (digest, json.dumps(result, ensure_ascii=False))
+        if len(self._pending) >= FLUSH_BATCH:
+            self.flush()
+        return result, False
+
+    def flush(self):
+        """모아둔 miss 결과 저장 (한 트랜잭션)"""
+        if not self._pending:
+            return
+        with self.conn:
+            self.conn.executemany(SQL_PUT, [
+                (namespace, entry_key, digest, result)
+                for (namespace, entry_key), (digest, result) in self._pending.items()
+            ])
+        self._pending.clear()
+
+    def close(self):
+        """남은 결과 저장 후 커넥션 반납"""
+        if self.conn is not None:
+            self.flush()
+            self._pool.release(self.conn)
+            self.conn = None
+
+    def __del__(self):
+        self.close()
@@ -0,0 +1,159 @@
+"""
+프롬프트 템플릿 레지스트리
+data/templates/prompts/{종류}/{이름}.txt → 한 번 컴파일 후 캐시
+
+- 종류: title (카피라이터 제목), body (블로그 본문), generator (원고 생성기)
+- 이름: sub_persona_id (예: 3-2.txt), 없으면 default.txt
+- 페르소나별 변수: persona_psychology.json, content_strategies.json
+- 파일의 mtime/크기가 바뀌면 다시 컴파일 (CHECK_INTERVAL초마다 확인)
+  → 카피라이터가 코드 수정 없이 문구를 편집할 수 있음
+- 치환 문법은 str.format과 같음: {keyword}, {volume:,}
+- 파일마다 내용 해시(version)를 제공 → 렌더링 결과 캐시 키 (prompt_cache.py)
+"""
+
+import hashlib
+import json
+import string
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "data" / "templates" / "prompts"
+
+DEFAULT_NAME = 'default'
+
+# 파일 변경 확인 주기 (초) - 렌더링마다 stat하지 않음
+CHECK_INTERVAL = 1.0
+
+# 페르소나별 변수에 해당 sub_persona_id가 없을 때 쓰는 값 (기타/일반)
+FALLBACK_SUB_PERSONA = '5-1'
+
+_formatter = string.Formatter()
+
+
+class CompiledTemplate:
+    """
+    파싱이 끝난 템플릿
+
+    불러올 때 string.Formatter로 한 번 파싱한 조각 목록을 캐시하고, 렌더링은 조각을 이어 붙인다.
+    필드 조회/변환/서식은 str.format과 같은 순서로 처리 ({a[b]}, {x!r}, 중첩 spec {v:{w}} 포함).
+    괄호 짝/변환 문자 오류는 렌더링 전, 템플릿을 불러올 때 ValueError로 알린다.
+    """
+
+    __slots__ = ('source', '_segments')
+
+    def __init__(self, source: str):
+        self.source = source
+        self._segments = self._parse(source)
+
+    @staticmethod
+    def _parse(source: str) -> List[tuple]:
+        """(고정 문구, 필드, 단순 이름 여부, 변환, spec, 중첩 spec 조각) 목록"""
+        segments = []
+        for literal, field, spec, conversion in _formatter.parse(source):
+            if field is None:
+                segments.append((literal, None, False, None, '', None))
+                continue
+            if conversion not in (None, 'r', 's', 'a'):
+                raise ValueError(f"알 수 없는 변환 '!{conversion}': {{{field}!{conversion}}}")
+            spec = spec or ''
+            nested = CompiledTemplate._parse(spec) if '{' in spec else None
+            segments.append((literal, field, field.isidentifier(), conversion, spec, nested))
+        return segments
+
+    @staticmethod
+    def _render(segments: List[tuple], fields: Dict[str, Any]) -> str:
+        parts = []
+        append = parts.append
+        for literal, field, simple, conversion, spec, nested in segments:
+            if literal:
+                append(literal)
+            if field is None:
+                continue
+            value = fields[field] if simple else _formatter.get_field(field, (), fields)[0]
+            if conversion:
+                value = _formatter.convert_field(value, conversion)
+            if nested is not None:
+                spec = CompiledTemplate._render(nested, fields)
+            append(format(value, spec))
+        return ''.join(parts)
+
+    def render(self, fields: Dict[str, Any]) -> str:
+        return self._render(self._segments, fields)
+
+
+class TemplateRegistry:
+    """템플릿/변수 파일 캐시 (파일 변경 시 자동 갱신)"""
+
+    def __init__(self, template_dir: Path = TEMPLATE_DIR, check_interval: float = CHECK_INTERVAL):
+        self.template_dir = Path(template_dir)
+        self.check_interval = check_interval
+        # 조회 키 → [확인 시각, 경로, mtime_ns, 크기, 컴파일 결과, 내용 해시]
+        self._cache: Dict[tuple, list] = {}
+
+    def _lookup(self, key: tuple, candidates: Callable[[], List[Path]],
+                compile_source: Callable[[str], Any]) -> list:
+        """
+        candidates() 중 처음 존재하는 파일을 컴파일해 캐시
+
+        check_interval 안에서는 파일 시스템을 보지 않고 캐시를 그대로 쓴다.
+        """
+        now = time.monotonic()
+        entry = self._cache.get(key)
+        if entry and now - entry[0] < self.check_interval:
+            return entry
+
+        paths = candidates()
+        for path in paths:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+
+            if not (entry and entry[1] == path
+                    and entry[2] == stat.st_mtime_ns and entry[3] == stat.st_size):
+                source = path.read_text(encoding='utf-8')
+                version = hashlib.sha1(source.encode('utf-8')).hexdigest()[:12]
+                entry = [now, path, stat.st_mtime_ns, stat.st_size, compile_source(source), version]
+                self._cache[key] = entry
+            entry[0] = now
+            return entry
+
+        raise FileNotFoundError(f"템플릿이 없습니다: {', '.join(str(p) for p in paths)}")
+
+    def _template_entry(self, kind: str, name: str) -> list:
+        return self._lookup(
+            ('template', kind, name),
+            lambda: [self.template_dir / kind / f"{name}.txt",
+                     self.template_dir / kind / f"{DEFAULT_NAME}.txt"],
+            CompiledTemplate,
+        )
+
+    def _vars_entry(self, table: str) -> list:
+        return self._lookup(('vars', table), lambda: [self.template_dir / f"{table}.json"],
+                            json.loads)
+
+    def template(self, kind: str, name: str = DEFAULT_NAME) -> CompiledTemplate:
+        """{kind}/{name}.txt 템플릿 (없으면 {kind}/default.txt)"""
+        return self._template_entry(kind, name)[4]
+
+    def template_version(self, kind: str, name: str = DEFAULT_NAME) -> str:
+        """template(kind, name)이 실제로 읽은 파일의 내용 해시"""
+        return self._template_entry(kind, name)[5]
+
+    def vars_version(self, table: str) -> str:
+        """{table}.json 내용 해시"""
+        return self._vars_entry(table)[5]
+
+    def render(self, kind: str, name: str, fields: Dict[str, Any]) -> str:
+        """템플릿 렌더링"""
+        return self.template(kind, name).render(fields)
+
+    def persona_vars(self, table: str, sub_persona_id: str) -> Dict[str, Any]:
+        """{table}.json에서 세부 페르소나별 변수 (없으면 FALLBACK_SUB_PERSONA 값)"""
+        values = self._vars_entry(table)[4]
+        return values.get(sub_persona_id, values[FALLBACK_SUB_PERSONA])
+
+
+# 공용 레지스트리 (프로세스당 한 번 컴파일)
+REGISTRY = TemplateRegistry()
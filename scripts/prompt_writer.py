@@ -0,0 +1,216 @@
+"""
+프롬프트 파일 병렬 저장
+렌더러(메인 스레드) → 제한 큐 → writer 스레드 풀 → 임시 파일 + 원자적 rename
+
+- 큐 크기 제한: 렌더링이 디스크보다 빠르면 submit()이 대기 (메모리 일정)
+- 원자적 저장: 같은 폴더의 임시 파일에 쓴 뒤 os.replace (중단돼도 반쯤 쓴 파일 없음)
+- fsync 묶음 처리: 파일마다 fsync → rename 하지 않고 fsync_batch개씩 모아
+  fsync → rename → 폴더 fsync 한 번
+- 변경 없음 건너뛰기: submit(..., if_changed=True)면 기존 파일과 내용이 같을 때 쓰지 않음
+  (프롬프트 캐시 hit 결과용 - 캐시 miss는 비교 없이 바로 저장)
+
+사용법:
+    with PromptFileWriter() as writer:
+        for path, text in rendered:
+            writer.submit(path, text)
+    print(writer.stats)
+"""
+
+import itertools
+import os
+import queue
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from instrumentation import timed
+
+# writer 스레드 수 (파일 I/O 대기 중에는 GIL이 풀려 렌더링과 겹쳐 실행됨)
+DEFAULT_WORKERS = 4
+
+# 대기 중인 파일 최대 개수
+DEFAULT_QUEUE_SIZE = 256
+
+# fsync + rename을 한 번에 처리하는 파일 수 (스레드별)
+DEFAULT_FSYNC_BATCH = 64
+
+_STOP = object()
+
+# open()과 같은 기본 권한 (os.open에서 umask가 적용됨)
+_FILE_MODE = 0o666
+
+# 파일 내용만 디스크에 반영 (메타데이터는 폴더 fsync로 처리)
+_fdatasync = getattr(os, 'fdatasync', os.fsync)
+
+
+class PromptFileWriter:
+    """제한 큐 + writer 스레드 풀 기반 파일 저장기"""
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, queue_size: int = DEFAULT_QUEUE_SIZE,
+                 fsync_batch: int = DEFAULT_FSYNC_BATCH, durable: bool = True):
+        """
+        Args:
+            workers: writer 스레드 수
+            queue_size: 대기 큐 크기 (가득 차면 submit이 대기)
+            fsync_batch: 스레드별로 모아서 fsync하는 파일 수
+            durable: False면 fsync 생략 (rename은 유지)
+        """
+        self.fsync_batch = max(1, fsync_batch)
+        self.durable = durable
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._errors: List[BaseException] = []
+        self._sequence = itertools.count()
+        self.stats = {'files': 0, 'bytes': 0, 'fsync_batches': 0, 'unchanged': 0}
+        self._closed = False
+
+        self._threads = [
+            threading.Thread(target=self._run, name=f"prompt-writer-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, path: Path, text: str, if_changed: bool = False):
+        """
+        파일 저장 요청 (큐가 가득 차면 대기)
+
+        if_changed: 기존 파일과 내용이 같으면 쓰지 않음 (writer 스레드에서 비교)
+        """
+        if self._errors:
+            raise self._errors[0]
+        self._queue.put((Path(path), text.encode('utf-8'), if_changed))
+
+    def close(self):
+        """남은 파일을 모두 저장하고 스레드 종료 (저장 오류가 있으면 다시 발생, 두 번째 호출부터는 무시)"""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        if self._errors:
+            raise self._errors[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _run(self):
+        pending = []
+        while True:
+            # 큐가 비면 모아둔 파일을 먼저 확정 (마지막 묶음이 오래 대기하지 않도록)
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                self._flush(pending)
+                item = self._queue.get()
+
+            if item is _STOP:
+                self._flush(pending)
+                return
+
+            path, data, if_changed = item
+            try:
+                if if_changed and _same_content(path, data):
+                    with self._lock:
+                        self.stats['unchanged'] += 1
+                    continue
+                pending.append(self._write_temp(path, data))
+            except BaseException as e:
+                self._fail(e)
+
+            if len(pending) >= self.fsync_batch:
+                self._flush(pending)
+
+    @timed('io.write_temp')
+    def _write_temp(self, path: Path, data: bytes) -> tuple:
+        """같은 폴더의 임시 파일에 쓰기 → (fd, 임시 경로, 최종 경로, 크기)"""
+        # 일련번호로 이름이 겹치지 않으므로 mkstemp의 무작위 이름 생성/재시도가 필요 없음
+        tmp_path = path.parent / f".{path.name}.{os.getpid()}.{next(self._sequence)}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, _FILE_MODE)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        except BaseException:
+            os.close(fd)
+            os.unlink(tmp_path)
+            raise
+        return fd, tmp_path, path, len(data)
+
+    @timed('io.fsync_rename')
+    def _flush(self, pending: list):
+        """모아둔 임시 파일 fsync → rename → 폴더 fsync (폴더당 한 번)"""
+        if not pending:
+            return
+
+        directories = set()
+        files = 0
+        written = 0
+        for fd, tmp_path, path, size in pending:
+            try:
+                try:
+                    if self.durable:
+                        _fdatasync(fd)
+                finally:
+                    os.close(fd)
+                os.replace(tmp_path, path)
+            except BaseException as e:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                self._fail(e)
+                continue
+            directories.add(path.parent)
+            files += 1
+            written += size
+        pending.clear()
+
+        if self.durable:
+            for directory in directories:
+                _fsync_directory(directory)
+
+        with self._lock:
+            self.stats['files'] += files
+            self.stats['bytes'] += written
+            self.stats['fsync_batches'] += 1
+
+    def _fail(self, error: BaseException):
+        with self._lock:
+            self._errors.append(error)
+
+
+def _same_content(path: Path, data: bytes) -> bool:
+    """기존 파일 내용이 data와 같은지 (크기가 다르면 읽지 않음)"""
+    try:
+        if path.stat().st_size != len(data):
+            return False
+        return path.read_bytes() == data
+    except OSError:
+        return False
+
+
+def _fsync_directory(directory: Path):
+    """rename 결과(디렉터리 엔트리)를 디스크에 반영 (지원하지 않는 OS는 무시)"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_files(files: Dict[Path, str], workers: Optional[int] = None,
+                if_changed: bool = False) -> Dict:
+    """파일 몇 개를 원자적으로 저장 (인터랙티브 저장용)"""
+    with PromptFileWriter(workers=workers or min(len(files), DEFAULT_WORKERS)) as writer:
+        for path, text in files.items():
+            writer.submit(path, text, if_changed=if_changed)
+    return writer.stats
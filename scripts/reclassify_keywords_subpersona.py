@@ -4,11 +4,99 @@
 특히 3-2 (이탈/고통) 고객을 정밀하게 식별
 """
 
-import sqlite3
-from pathlib import Path
+import argparse
+import hashlib
 import re
+import sqlite3
+import time
+
+from blog_automation_helper import refresh_posting_priority
+from instrumentation import stage
+from keyword_db import DB_PATH, connect, prepare_for_write
+
+# 3-2: 이탈/고통 단계 키워드 패턴 (위약금 해방 타겟)
+PAIN_PATTERNS = [
+    r'위약금', r'해지', r'철거', r'고객센터', r'as\b', r'수리',
+    r'약정', r'기간', r'만료', r'이전', r'불만', r'문의',
+    r'출동', r'해약', r'해제', r'취소', r'환불',
+    r'비용문의', r'요금문의', r'렌탈', r'렌트',
+    r'변경', r'교체', r'철수', r'반납'
+]
+
+# 3번 외 페르소나는 단순 매핑
+SUB_PERSONA_MAPPING = {
+    1: '1-1',
+    2: '2-1',
+    4: '4-1',
+    5: '5-1'
+}
+
+
+class SubPersonaClassifier:
+    """
+    세부 페르소나 분류기
+
+    pain_patterns 전체를 하나의 alternation 정규식으로 한 번만 컴파일해
+    키워드당 정규식 스캔을 1회로 줄인다. 각 패턴은 이름 있는 그룹
+    (p0, p1, ...)으로 감싸 어떤 패턴이 매칭됐는지 알 수 있다.
+
+    alternation은 "어느 패턴이든 매칭되면 3-2"라는 기존 판정과 동일하며
+    (as\b 같은 단어 경계 패턴도 그대로 사용), 여러 패턴이 매칭될 때는
+    키워드에서 가장 앞에 나타난 패턴이 보고된다.
+    """
+
+    def __init__(self, pain_patterns: list = PAIN_PATTERNS):
+        self.pain_patterns = list(pain_patterns)
+        self._pain_regex = re.compile('|'.join(
+            f'(?P<p{i}>{pattern})' for i, pattern in enumerate(self.pain_patterns)
+        ))
+
+    @property
+    def signature(self) -> str:
+        """3-2 패턴 집합 해시 (증분 재분류에서 패턴 변경 감지용)"""
+        return hashlib.sha1('\n'.join(self.pain_patterns).encode('utf-8')).hexdigest()
+
+    def match_pain_pattern(self, keyword: str) -> str:
+        """매칭된 3-2 패턴 (없으면 None)"""
+        match = self._pain_regex.search(keyword.lower())
+        if not match:
+            return None
+        return self.pain_patterns[int(match.lastgroup[1:])]
+
+    def classify(self, keyword: str, parent_persona_id: int) -> tuple:
+        """
+        세부 페르소나 분류
+
+        Returns:
+            (sub_persona_id, confidence_score, matched_pattern)
+        """
+        # 🔥 핵심: 3번 페르소나 분리 (진입 vs 이탈)
+        if parent_persona_id == 3:
+            pattern = self.match_pain_pattern(keyword)
+            if pattern is not None:
+                return ('3-2', 0.9, pattern)  # 높은 신뢰도
 
-DB_PATH = Path("/home/tlswk/careon/data/customers/cctv/keyword/keyword_persona.db")
+            # 3-1: 진입/비교 단계 (기본값)
+            return ('3-1', 0.7, None)
+
+        return (SUB_PERSONA_MAPPING.get(parent_persona_id, '5-1'), 0.8, None)
+
+    def classify_batch(self, keywords) -> list:
+        """
+        키워드 일괄 분류
+
+        Args:
+            keywords: (keyword, parent_persona_id) 튜플의 iterable
+
+        Returns:
+            입력 순서대로 (sub_persona_id, confidence_score, matched_pattern) 리스트
+        """
+        classify = self.classify
+        return [classify(keyword, parent_persona_id) for keyword, parent_persona_id in keywords]
+
+
+# 기본 분류기 (모듈 로드 시 한 번 컴파일)
+CLASSIFIER = SubPersonaClassifier()
 
 
 def auto_label_sub_persona(keyword: str, parent_persona_id: int) -> tuple:
@@ -18,92 +106,233 @@ def auto_label_sub_persona(keyword: str, parent_persona_id: int) -> tuple:
     Returns:
         (sub_persona_id, confidence_score)
     """
+    sub_persona_id, confidence, _ = CLASSIFIER.classify(keyword, parent_persona_id)
+    return (sub_persona_id, confidence)
+
+
+def label_keywords(rows, classifier: SubPersonaClassifier = None) -> list:
+    """
+    키워드 일괄 라벨링 (메모리 내 처리, DB 쓰기 없음)
+
+    Args:
+        rows: (keyword_id, keyword, persona_id, sub_persona_id, confidence_score, ...) 행
+            (select_keywords_to_relabel은 워터마크용 updated_at을 뒤에 붙임)
+        classifier: 사용할 분류기 (기본: 모듈 분류기)
+
+    Returns:
+        라벨이 바뀐 키워드의 (sub_persona_id, confidence_score, keyword_id) 리스트
+        (executemany 파라미터 순서)
+    """
+    classifier = classifier or CLASSIFIER
+    changes = []
+    labels = classifier.classify_batch((row[1], row[2]) for row in rows)
+
+    for row, (sub_persona_id, confidence, _) in zip(rows, labels):
+        keyword_id, old_sub_persona_id, old_confidence = row[0], row[3], row[4]
+
+        # (sub_persona_id, confidence_score)가 같으면 건너뜀 → updated_at 보존
+        if (old_sub_persona_id, old_confidence) != (sub_persona_id, confidence):
+            changes.append((sub_persona_id, confidence, keyword_id))
+
+    return changes
+
+
+def write_labels_bulk(conn: sqlite3.Connection, changes: list):
+    """라벨 변경분을 단일 트랜잭션 + executemany로 기록"""
+    with conn:
+        conn.executemany("""
+            UPDATE keywords_master
+            SET sub_persona_id = ?,
+                confidence_score = ?,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE keyword_id = ?
+        """, changes)
+
+
+def load_reclassify_state(conn: sqlite3.Connection) -> dict:
+    """마지막 재분류 워터마크 조회 (없으면 빈 dict)"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS reclassify_state (
+            state_key VARCHAR(50) PRIMARY KEY,
+            state_value TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    rows = conn.execute("SELECT state_key, state_value FROM reclassify_state").fetchall()
+    return {row['state_key']: row['state_value'] for row in rows}
+
+
+def relabel_watermark(rows) -> tuple:
+    """
+    조회한 대상 행 → (최대 keyword_id, 최대 updated_at) (라벨링 전에 계산)
+
+    조회 이후 다른 커넥션이 추가/수정한 키워드는 워터마크에 포함되지 않아 다음 실행 대상으로 남음
+    """
+    max_keyword_id = max((row[0] for row in rows), default=None)
+    max_updated_at = max((row[5] for row in rows if row[5] is not None), default=None)
+    return max_keyword_id, max_updated_at
 
-    keyword_lower = keyword.lower()
-
-    # 🔥 핵심: 3번 페르소나 분리 (진입 vs 이탈)
-    if parent_persona_id == 3:
-        # 3-2: 이탈/고통 단계 키워드 패턴 (위약금 해방 타겟)
-        pain_patterns = [
-            r'위약금', r'해지', r'철거', r'고객센터', r'as\b', r'수리',
-            r'약정', r'기간', r'만료', r'이전', r'불만', r'문의',
-            r'출동', r'해약', r'해제', r'취소', r'환불',
-            r'비용문의', r'요금문의', r'렌탈', r'렌트',
-            r'변경', r'교체', r'철수', r'반납'
-        ]
-
-        for pattern in pain_patterns:
-            if re.search(pattern, keyword_lower):
-                return ('3-2', 0.9)  # 높은 신뢰도
-
-        # 3-1: 진입/비교 단계 (기본값)
-        return ('3-1', 0.7)
-
-    # 나머지 페르소나는 단순 매핑
-    mapping = {
-        1: '1-1',
-        2: '2-1',
-        4: '4-1',
-        5: '5-1'
+
+def save_reclassify_state(conn: sqlite3.Connection, watermark: tuple):
+    """
+    재분류 워터마크 저장 (이번 실행의 라벨 기록이 커밋된 뒤 호출)
+
+    - max_keyword_id / max_updated_at: 이번 실행이 조회한 행 기준 (relabel_watermark, 이전 값보다 작아지지 않음)
+      다음 실행은 updated_at이 이 값 이상(>=)인 키워드를 대상으로 함
+      → 같은 초에 수정된 행을 놓치지 않음 (이번 실행이 쓴 행을 다시 읽어도 라벨이 같으면 쓰지 않음)
+    - pain_patterns_hash / mapping_hash: 분류 규칙 변경 감지용
+    """
+    previous = load_reclassify_state(conn)
+    max_keyword_id, max_updated_at = watermark
+    max_keyword_id = max(max_keyword_id or 0, int(previous.get('max_keyword_id') or 0))
+    max_updated_at = max(max_updated_at or '', previous.get('max_updated_at') or '')
+
+    state = {
+        'max_keyword_id': str(max_keyword_id),
+        'max_updated_at': max_updated_at,
+        'pain_patterns_hash': CLASSIFIER.signature,
+        'mapping_hash': _mapping_signature(),
     }
 
-    return (mapping.get(parent_persona_id, '5-1'), 0.8)
+    with conn:
+        conn.executemany("""
+            INSERT OR REPLACE INTO reclassify_state (state_key, state_value, updated_at)
+            VALUES (?, ?, CURRENT_TIMESTAMP)
+        """, list(state.items()))
+
+
+def _mapping_signature() -> str:
+    return hashlib.sha1(repr(sorted(SUB_PERSONA_MAPPING.items())).encode('utf-8')).hexdigest()
 
 
-def reclassify_all_keywords():
-    """모든 키워드를 세부 페르소나로 재분류"""
+def select_keywords_to_relabel(conn: sqlite3.Connection, full: bool = False) -> tuple:
+    """
+    재분류 대상 키워드 조회
+
+    증분 모드에서는 워터마크 이후 추가(keyword_id 증가)되거나
+    수정(updated_at 갱신)된 키워드만 조회한다. 3-2 패턴이 바뀌었으면
+    영향을 받는 3번 페르소나 키워드 전체를 함께 조회하고,
+    워터마크가 없거나 매핑이 바뀌었으면 전체를 조회한다.
+
+    Returns:
+        (키워드 행 리스트, 대상 설명)
+    """
+    state = load_reclassify_state(conn)
+
+    base_query = """
+        SELECT keyword_id, keyword, persona_id, sub_persona_id, confidence_score, updated_at
+        FROM keywords_master
+    """
+
+    if full or 'max_updated_at' not in state or state.get('mapping_hash') != _mapping_signature():
+        reason = "전체 (--full)" if full else "전체 (워터마크 없음 또는 매핑 변경)"
+        return conn.execute(base_query).fetchall(), reason
+
+    conditions = ["keyword_id > ?", "updated_at >= ?"]
+    params = [int(state['max_keyword_id']), state['max_updated_at']]
+    reason = "증분 (신규/수정 키워드)"
+
+    if state.get('pain_patterns_hash') != CLASSIFIER.signature:
+        conditions.append("persona_id = 3")
+        reason = "증분 (신규/수정 키워드 + 3-2 패턴 변경으로 3번 페르소나 전체)"
+
+    query = base_query + " WHERE " + " OR ".join(conditions)
+    return conn.execute(query, params).fetchall(), reason
+
+
+def reclassify_all_keywords(bulk: bool = True, full: bool = False, workers: int = 1):
+    """
+    키워드를 세부 페르소나로 재분류
+
+    Args:
+        bulk: True면 메모리에서 전체 라벨링 후 변경분만 한 트랜잭션으로 기록,
+              False면 기존 방식 (키워드마다 UPDATE, 항상 전체 대상)
+        full: True면 워터마크를 무시하고 전체 키워드 재분류
+        workers: 2 이상이면 프로세스 풀 병렬 라벨링 (bulk 모드 전용)
+    """
 
     print("=" * 80)
     print("키워드 세부 페르소나 재분류")
     print("=" * 80)
 
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    prepare_for_write()
+    conn = connect()
     cursor = conn.cursor()
 
-    # 전체 키워드 조회
-    cursor.execute("""
-        SELECT keyword_id, keyword, persona_id
-        FROM keywords_master
-    """)
-
-    keywords = cursor.fetchall()
+    # 재분류 대상 조회 (bulk 모드는 기본 증분)
+    with stage('reclassify.select') as selected:
+        keywords, scope = select_keywords_to_relabel(conn, full=full or not bulk)
+        selected.add(len(keywords))
+    watermark = relabel_watermark(keywords)
     total = len(keywords)
 
-    print(f"\n📊 전체 키워드 수: {total:,}개")
+    print(f"\n📊 재분류 대상: {total:,}개 - {scope}")
     print(f"⏳ 재분류 시작...\n")
 
-    # 재분류 실행
-    updated = 0
-    sub_persona_stats = {}
+    started = time.perf_counter()
 
-    for row in keywords:
-        keyword_id = row['keyword_id']
-        keyword = row['keyword']
-        parent_persona = row['persona_id']
+    if bulk and workers > 1:
+        # 순환 import 방지 (parallel_labeling이 이 모듈의 분류기를 사용)
+        from parallel_labeling import run_parallel_labeling
 
-        # 세부 페르소나 자동 라벨링
-        sub_persona_id, confidence = auto_label_sub_persona(keyword, parent_persona)
+        with stage('reclassify.parallel', total):
+            _, changed = run_parallel_labeling(conn, keywords, workers=workers)
+        finished = time.perf_counter()
 
-        # DB 업데이트
-        cursor.execute("""
-            UPDATE keywords_master
-            SET sub_persona_id = ?,
-                confidence_score = ?,
-                updated_at = CURRENT_TIMESTAMP
-            WHERE keyword_id = ?
-        """, (sub_persona_id, confidence, keyword_id))
+        elapsed = max(finished - started, 1e-9)
+        print(f"   병렬 라벨링 + 기록: {elapsed:.3f}초 ({workers}개 프로세스)")
+        print(f"   처리량: {total / elapsed:,.0f} rows/s")
+        print(f"\n✅ 재분류 완료: {total:,}개 중 {changed:,}개 변경 "
+              f"({total - changed:,}개 변경 없음)")
+
+        save_reclassify_state(conn, watermark)
+    elif bulk:
+        with stage('reclassify.label', total):
+            changes = label_keywords(keywords)
+        labeled_at = time.perf_counter()
+
+        with stage('reclassify.write', len(changes)):
+            write_labels_bulk(conn, changes)
+        finished = time.perf_counter()
+
+        elapsed = max(finished - started, 1e-9)
+        print(f"   라벨링: {labeled_at - started:.3f}초 / 기록: {finished - labeled_at:.3f}초")
+        print(f"   처리량: {total / elapsed:,.0f} rows/s")
+        print(f"\n✅ 재분류 완료: {total:,}개 중 {len(changes):,}개 변경 "
+              f"({total - len(changes):,}개 변경 없음)")
+
+        save_reclassify_state(conn, watermark)
+    else:
+        updated = 0
+
+        for row in keywords:
+            sub_persona_id, confidence = auto_label_sub_persona(row['keyword'], row['persona_id'])
+
+            cursor.execute("""
+                UPDATE keywords_master
+                SET sub_persona_id = ?,
+                    confidence_score = ?,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE keyword_id = ?
+            """, (sub_persona_id, confidence, row['keyword_id']))
+
+            updated += 1
+
+            if updated % 100 == 0:
+                print(f"   진행: {updated}/{total} ({updated/total*100:.1f}%)")
 
-        # 통계
-        sub_persona_stats[sub_persona_id] = sub_persona_stats.get(sub_persona_id, 0) + 1
-        updated += 1
+        conn.commit()
 
-        if updated % 100 == 0:
-            print(f"   진행: {updated}/{total} ({updated/total*100:.1f}%)")
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        print(f"   처리량: {total / elapsed:,.0f} rows/s")
+        print(f"\n✅ 재분류 완료: {updated:,}개")
 
-    conn.commit()
+        save_reclassify_state(conn, watermark)
 
-    print(f"\n✅ 재분류 완료: {updated:,}개")
+    # 신뢰도가 바뀐 키워드의 저장 우선순위 재계산 (추천 조회가 쓰기 없이 읽도록)
+    refreshed = refresh_posting_priority(conn)
+    if refreshed:
+        print(f"   우선순위 재계산: {refreshed:,}개")
 
     # 세부 페르소나별 통계
     print("\n" + "=" * 80)
@@ -131,7 +360,7 @@ def reclassify_all_keywords():
     cursor.execute("""
         SELECT k.keyword, kt.search_volume_total
         FROM keywords_master k
-        LEFT JOIN keyword_timeseries kt ON k.keyword_id = kt.keyword_id
+        LEFT JOIN keyword_latest kt ON k.keyword_id = kt.keyword_id
         WHERE k.sub_persona_id = '3-2'
         ORDER BY kt.search_volume_total DESC
         LIMIT 20
@@ -155,7 +384,7 @@ def reclassify_all_keywords():
     cursor.execute("""
         SELECT k.keyword, kt.search_volume_total
         FROM keywords_master k
-        LEFT JOIN keyword_timeseries kt ON k.keyword_id = kt.keyword_id
+        LEFT JOIN keyword_latest kt ON k.keyword_id = kt.keyword_id
         WHERE k.sub_persona_id = '3-1'
         ORDER BY kt.search_volume_total DESC
         LIMIT 20
@@ -178,4 +407,13 @@ def reclassify_all_keywords():
 
 
 if __name__ == "__main__":
-    reclassify_all_keywords()
+    parser = argparse.ArgumentParser(description="키워드 세부 페르소나 재분류")
+    parser.add_argument("--row-by-row", action="store_true",
+                        help="기존 방식: 키워드마다 UPDATE (변경 없는 행도 updated_at 갱신)")
+    parser.add_argument("--full", action="store_true",
+                        help="워터마크를 무시하고 전체 키워드 재분류")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="병렬 라벨링 프로세스 수 (대량 재분류용)")
+    args = parser.parse_args()
+
+    reclassify_all_keywords(bulk=not args.row_by_row, full=args.full, workers=args.workers)
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+조회 경로별 커버링 인덱스 추가
+세부 페르소나/페르소나별 키워드 조회와 검색량 TOP 조회가
+테이블 본문을 읽지 않고 인덱스만으로 끝나도록 인덱스를 만든다.
+
+1. 인덱스 생성 전 실행 계획(EXPLAIN QUERY PLAN) + 실행 시간 측정
+2. 커버링 인덱스 생성 + ANALYZE (플래너 통계 갱신)
+3. 실행 계획에서 새 인덱스 사용 여부 검증 + 전후 시간 비교 리포트
+
+사용법:
+    python3 scripts/upgrade_indexes.py
+    python3 scripts/upgrade_indexes.py --reset --report index_report.json
+"""
+
+import argparse
+import json
+import sqlite3
+import statistics
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import keyword_db
+from keyword_db import DB_PATH, connect
+
+# 인덱스 이름 → DDL
+COVERING_INDEXES = {
+    # 세부 페르소나 필터 → keyword_id로 시계열 조인 (keyword/confidence까지 포함)
+    'idx_km_sub_persona_cover': """
+        CREATE INDEX IF NOT EXISTS idx_km_sub_persona_cover
+        ON keywords_master(sub_persona_id, keyword_id, keyword, confidence_score)
+    """,
+    # 키워드별 시계열을 날짜순으로 읽을 때 검색 지표까지 인덱스에서 읽음
+    # (analyze_trends.py 윈도우, keyword_latest 트리거의 최신 행 재조회)
+    'idx_ts_keyword_cover': """
+        CREATE INDEX IF NOT EXISTS idx_ts_keyword_cover
+        ON keyword_timeseries(keyword_id, record_date,
+                              search_volume_total, competition_level, avg_ad_count)
+    """,
+    # 검색량 내림차순 TOP N: 정렬 없이 인덱스 순서대로 LIMIT까지만 읽음
+    # (조회 스크립트는 keyword_latest와 조인 - upgrade_latest_snapshot.py)
+    'idx_latest_volume_cover': """
+        CREATE INDEX IF NOT EXISTS idx_latest_volume_cover
+        ON keyword_latest(search_volume_total DESC, keyword_id,
+                          competition_level, avg_ad_count)
+    """,
+}
+
+# 조회 경로가 keyword_latest로 옮겨져 더 이상 쓰이지 않는 인덱스
+OBSOLETE_INDEXES = ['idx_ts_volume_cover']
+
+# 측정 반복 횟수 (중앙값 사용)
+REPEAT = 20
+
+
+def hot_queries(conn: sqlite3.Connection) -> Dict[str, List[tuple]]:
+    """
+    측정 대상 쿼리 → [(SQL, 파라미터), ...]
+
+    각 항목은 해당 메서드가 한 번 실행될 때 DB에 보내는 쿼리 묶음
+    """
+    sub_persona_ids = [row['sub_persona_id'] for row in keyword_db.fetch_sub_personas(conn)]
+    persona_ids = [row[0] for row in conn.execute(
+        "SELECT persona_id FROM customer_personas ORDER BY persona_id")]
+
+    return {
+        # interactive_blog_generator.get_keywords_by_sub_persona (세부 페르소나 전체)
+        'get_keywords_by_sub_persona': [
+            (keyword_db.SQL_KEYWORDS_BY_SUB_PERSONA, (sub_persona_id, 1, 10))
+            for sub_persona_id in sub_persona_ids
+        ],
+        # blog_automation_helper.get_top_keywords_by_volume (전체 + 페르소나별)
+        'get_top_keywords_by_volume': [(keyword_db.SQL_TOP_KEYWORDS, (20,))] + [
+            (keyword_db.SQL_TOP_KEYWORDS_BY_PERSONA, (persona_id, 20))
+            for persona_id in persona_ids
+        ],
+        # integrated_blog_workflow.run_interactive_workflow (목록 + 세부 페르소나별 키워드)
+        'run_interactive_workflow': [(keyword_db.SQL_SUB_PERSONAS, ())] + [
+            (keyword_db.SQL_KEYWORDS_BY_SUB_PERSONA, (sub_persona_id, 0, 10))
+            for sub_persona_id in sub_persona_ids
+        ],
+    }
+
+
+# 쿼리 묶음별로 실행 계획에 나와야 하는 인덱스 (하나 이상)
+# 세부 페르소나 조회는 데이터 분포에 따라 플래너가 고른다
+# - 키워드가 적은 세부 페르소나: idx_km_sub_persona_cover로 거른 뒤 정렬
+# - 키워드가 많은 세부 페르소나: idx_latest_volume_cover를 순서대로 읽다 LIMIT에서 중단
+EXPECTED_INDEXES = {
+    'get_keywords_by_sub_persona': ['idx_km_sub_persona_cover', 'idx_latest_volume_cover'],
+    'get_top_keywords_by_volume': ['idx_latest_volume_cover'],
+    'run_interactive_workflow': ['idx_km_sub_persona_cover', 'idx_latest_volume_cover'],
+}
+
+# 인덱스 없이 전체를 읽는 계획 (검증 실패)
+FULL_SCAN_MARKERS = ('SCAN k', 'SCAN kt')
+
+
+def query_plan(conn: sqlite3.Connection, sql: str, params: tuple) -> List[str]:
+    """EXPLAIN QUERY PLAN의 detail 컬럼 목록"""
+    return [row['detail'] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def measure(conn: sqlite3.Connection, queries: List[tuple], repeat: int = REPEAT) -> float:
+    """쿼리 묶음 1회 실행 시간 중앙값 (ms)"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for sql, params in queries:
+            conn.execute(sql, params).fetchall()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def snapshot(conn: sqlite3.Connection, repeat: int = REPEAT) -> Dict[str, Dict]:
+    """쿼리 묶음별 실행 계획 + 시간"""
+    result = {}
+    for name, queries in hot_queries(conn).items():
+        plans = []
+        for sql, params in queries:
+            for detail in query_plan(conn, sql, params):
+                if detail not in plans:
+                    plans.append(detail)
+        result[name] = {'plan': plans, 'ms': measure(conn, queries, repeat)}
+    return result
+
+
+def redundant_indexes(conn: sqlite3.Connection) -> List[tuple]:
+    """다른 인덱스의 앞부분 컬럼과 완전히 겹치는 인덱스 (삭제 후보, 자동 삭제하지 않음)"""
+    columns = {}
+    for table in ('keywords_master', 'keyword_timeseries', 'keyword_latest'):
+        for index in conn.execute(f"PRAGMA index_list({table})").fetchall():
+            columns[index['name']] = (table, [
+                col['name'] for col in conn.execute(f"PRAGMA index_info({index['name']})")
+            ])
+
+    found = []
+    for name, (table, cols) in columns.items():
+        if name.startswith('sqlite_autoindex'):
+            continue
+        for other, (other_table, other_cols) in columns.items():
+            if other != name and other_table == table and other_cols[:len(cols)] == cols:
+                found.append((name, other))
+                break
+    return found
+
+
+def upgrade_indexes(db_path: Path = DB_PATH, reset: bool = False, report_path: Path = None,
+                    repeat: int = REPEAT) -> Dict:
+    """인덱스 생성 + 검증 + 전후 비교"""
+
+    print("=" * 80)
+    print("⚡ 조회 경로별 커버링 인덱스 추가")
+    print("=" * 80)
+
+    # keyword_latest가 없는 DB는 connect()가 안내 메시지와 함께 실패 (upgrade_latest_snapshot.py 먼저)
+    conn = connect(db_path)
+
+    keyword_count = conn.execute("SELECT COUNT(*) FROM keywords_master").fetchone()[0]
+    print(f"\n📊 키워드 {keyword_count:,}개 / 측정 {repeat}회 중앙값")
+
+    if reset:
+        for name in COVERING_INDEXES:
+            conn.execute(f"DROP INDEX IF EXISTS {name}")
+        conn.commit()
+        print("   ℹ️  기존 커버링 인덱스 삭제 후 측정 (--reset)")
+
+    # Step 1: 생성 전
+    print("\n📋 Step 1: 인덱스 생성 전 측정...")
+    before = snapshot(conn, repeat)
+
+    # Step 2: 생성 + 통계
+    print("\n📋 Step 2: 커버링 인덱스 생성...")
+    for name, ddl in COVERING_INDEXES.items():
+        started = time.perf_counter()
+        conn.execute(ddl)
+        print(f"   ✅ {name} ({time.perf_counter() - started:.2f}초)")
+    for name in OBSOLETE_INDEXES:
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+    conn.execute("ANALYZE")
+    conn.commit()
+    print("   ✅ ANALYZE (플래너 통계 갱신)")
+
+    # Step 3: 생성 후 + 검증
+    print("\n📋 Step 3: 실행 계획 검증 (EXPLAIN QUERY PLAN)...")
+    after = snapshot(conn, repeat)
+
+    verified = True
+    for name, expected in EXPECTED_INDEXES.items():
+        plan_text = '\n'.join(after[name]['plan'])
+        used = [index for index in expected if index in plan_text]
+        full_scans = [
+            detail for detail in after[name]['plan']
+            if detail.startswith(FULL_SCAN_MARKERS) and 'COVERING INDEX' not in detail
+        ]
+        if not used or full_scans:
+            verified = False
+            print(f"   ❌ {name}: 커버링 인덱스 미사용")
+        else:
+            print(f"   ✅ {name}: {', '.join(used)}")
+        for detail in after[name]['plan']:
+            print(f"      └ {detail}")
+
+    for name, other in redundant_indexes(conn):
+        print(f"   ℹ️  {name}은(는) {other}와 앞부분 컬럼이 같아 중복입니다 (삭제 후보)")
+
+    conn.close()
+
+    # 리포트
+    print("\n" + "=" * 80)
+    print("📊 전후 비교 (쿼리 묶음 1회 실행, ms)")
+    print("=" * 80)
+    print(f"\n{'쿼리':<32} {'생성 전':>10} {'생성 후':>10} {'개선':>8}")
+    print("-" * 64)
+
+    report = {
+        'db_path': str(db_path),
+        'keyword_count': keyword_count,
+        'repeat': repeat,
+        'verified': verified,
+        'queries': {},
+    }
+    for name in before:
+        before_ms = before[name]['ms']
+        after_ms = after[name]['ms']
+        speedup = before_ms / after_ms if after_ms else 0.0
+        print(f"{name:<32} {before_ms:>10.3f} {after_ms:>10.3f} {speedup:>7.1f}x")
+        report['queries'][name] = {
+            'before_ms': round(before_ms, 3),
+            'after_ms': round(after_ms, 3),
+            'speedup': round(speedup, 2),
+            'plan_before': before[name]['plan'],
+            'plan_after': after[name]['plan'],
+        }
+
+    if report_path:
+        report_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"\n📝 리포트 저장: {report_path}")
+
+    print("\n" + "=" * 80)
+    print("✅ 인덱스 추가 완료!" if verified else "⚠️  일부 쿼리가 새 인덱스를 사용하지 않습니다")
+    print("=" * 80)
+    print(f"\n💾 DB 위치: {db_path}\n")
+
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="조회 경로별 커버링 인덱스 추가")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="대상 DB 파일")
+    parser.add_argument("--reset", action="store_true",
+                        help="커버링 인덱스를 지우고 생성 전 시간부터 다시 측정")
+    parser.add_argument("--report", type=Path, help="전후 비교 리포트(JSON) 저장 경로")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="측정 반복 횟수")
+    args = parser.parse_args()
+
+    upgrade_indexes(args.db, reset=args.reset, report_path=args.report, repeat=args.repeat)
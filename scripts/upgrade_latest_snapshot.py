@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+키워드별 최신 검색 지표 테이블 추가
+keyword_latest = keyword_timeseries에서 키워드마다 가장 최근 record_date 한 행
+
+keyword_timeseries에 날짜별 스냅샷이 쌓이면 keyword_id 조인이 날짜 수만큼
+행을 불려 순위가 틀어지므로, 조회 스크립트는 모두 keyword_latest와 조인한다.
+트리거가 시계열 INSERT/UPDATE/DELETE 시 해당 키워드만 갱신 (증분 유지).
+
+실행 순서: upgrade_template_mapping.py → 이 스크립트 → upgrade_posting_priority.py
+"""
+
+from keyword_db import (DB_PATH, LATEST_TRIGGERS, SQL_CREATE_LATEST, connect,
+                        rebuild_latest_snapshot)
+
+print("=" * 80)
+print("🗂️  키워드별 최신 검색 지표 테이블 추가 (keyword_latest)")
+print("=" * 80)
+
+conn = connect(check_schema=False)
+cursor = conn.cursor()
+
+# Step 1: 테이블 생성 (keyword_id = rowid → 조인은 PK 조회 한 번)
+# 쓰기 스크립트도 keyword_latest가 없으면 1~3단계를 수행 (keyword_db.prepare_for_write, 이 스크립트는 재구성용)
+print("\n📋 Step 1: keyword_latest 테이블 생성...")
+
+cursor.execute(SQL_CREATE_LATEST)
+print("   ✅ keyword_latest")
+
+# Step 2: 증분 유지 트리거 (INSERT는 최신일 때만 교체, UPDATE/DELETE는 시계열에서 다시 읽음)
+print("\n📋 Step 2: 증분 유지 트리거 생성...")
+
+for name, ddl in LATEST_TRIGGERS.items():
+    cursor.execute(ddl)
+    print(f"   ✅ {name}")
+
+# Step 3: 전체 재구성 (키워드별 최신 record_date 한 행)
+print("\n📋 Step 3: 최신 스냅샷 채우기...")
+
+rebuild_latest_snapshot(conn)
+conn.commit()
+
+latest_count = cursor.execute("SELECT COUNT(*) FROM keyword_latest").fetchone()[0]
+timeseries_count = cursor.execute("SELECT COUNT(*) FROM keyword_timeseries").fetchone()[0]
+print(f"   ✅ 시계열 {timeseries_count:,}행 → 키워드 {latest_count:,}개")
+
+# Step 4: 검증
+print("\n" + "=" * 80)
+print("✅ 최신 스냅샷 테이블 추가 완료! 날짜별 분포 검증")
+print("=" * 80 + "\n")
+
+cursor.execute("""
+    SELECT record_date, COUNT(*) AS cnt
+    FROM keyword_latest
+    GROUP BY record_date
+    ORDER BY record_date DESC
+    LIMIT 5
+""")
+for row in cursor.fetchall():
+    print(f"   {row['record_date']}  {row['cnt']:>8,}개")
+
+conn.close()
+
+print(f"\n💾 DB 위치: {DB_PATH}\n")
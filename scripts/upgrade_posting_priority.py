@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+포스팅 우선순위 저장 컬럼 추가
+keywords_master.posting_priority 컬럼 + 인덱스 + 변경 감지 트리거
+(변경된 키워드만 다시 계산하는 증분 갱신)
+"""
+
+import sqlite3
+
+from blog_automation_helper import (POSTING_PRIORITY_TRIGGERS, SQL_ADD_POSTING_PRIORITY,
+                                    SQL_CREATE_POSTING_PRIORITY_INDEX, BlogAutomationHelper)
+from keyword_db import DB_PATH, connect, ensure_latest_snapshot
+
+
+print("=" * 80)
+print("📈 포스팅 우선순위 저장 컬럼 추가 (Materialized Posting Priority)")
+print("=" * 80)
+
+# 우선순위 계산이 keyword_latest와 조인 → 업그레이드 전 DB면 먼저 생성
+conn = connect(check_schema=False)
+ensure_latest_snapshot(conn)
+cursor = conn.cursor()
+
+# Step 1: 컬럼 추가
+print("\n📋 Step 1: posting_priority 컬럼 추가...")
+
+try:
+    cursor.execute(SQL_ADD_POSTING_PRIORITY)
+    print("   ✅ posting_priority 컬럼 추가 완료")
+except sqlite3.OperationalError as e:
+    if "duplicate column" in str(e).lower():
+        print("   ℹ️  posting_priority 컬럼이 이미 존재합니다")
+    else:
+        raise
+
+# Step 2: 인덱스 생성 (ORDER BY posting_priority DESC LIMIT + 미계산(NULL) 조회)
+print("\n📋 Step 2: 인덱스 생성...")
+
+cursor.execute(SQL_CREATE_POSTING_PRIORITY_INDEX)
+print("   ✅ idx_posting_priority")
+
+# Step 3: 변경 감지 트리거 (posting_priority = NULL 은 "재계산 필요" 표시)
+print("\n📋 Step 3: 변경 감지 트리거 생성...")
+
+for name, ddl in POSTING_PRIORITY_TRIGGERS.items():
+    cursor.execute(ddl)
+    print(f"   ✅ {name}")
+
+conn.commit()
+conn.close()
+
+# Step 4: 전체 우선순위 계산
+print("\n📋 Step 4: 전체 키워드 우선순위 계산...")
+
+helper = BlogAutomationHelper()
+updated = helper.refresh_posting_priority(full=True)
+print(f"   ✅ {updated:,}개 키워드 우선순위 저장 완료")
+
+# Step 5: 검증
+print("\n" + "=" * 80)
+print("✅ 포스팅 우선순위 저장 완료! 추천 TOP 5 검증")
+print("=" * 80 + "\n")
+
+for kw in helper.get_recommended_keywords_for_posting(limit=5):
+    print(f"   {kw['keyword']:<25} {kw['search_volume_total']:>10,}회  {kw['priority_score']:>6.1f}점")
+
+print(f"\n💾 DB 위치: {DB_PATH}\n")
@@ -5,15 +5,16 @@
 """
 
 import sqlite3
-from pathlib import Path
 
-DB_PATH = Path("/home/tlswk/careon/data/customers/cctv/keyword/keyword_persona.db")
+from keyword_db import DB_PATH, connect
+
 
 print("=" * 80)
 print("🎯 템플릿 매핑 시스템 추가 (Customer Journey Mapping)")
 print("=" * 80)
 
-conn = sqlite3.connect(DB_PATH)
+# keyword_latest 추가(upgrade_latest_snapshot.py) 전 단계 → 스키마 확인 없이 열기
+conn = connect(check_schema=False)
 cursor = conn.cursor()
 
 # Step 1: 컬럼 추가
@@ -140,6 +141,8 @@ cursor.execute("""
     FROM keywords_master k
     JOIN sub_personas sp ON k.sub_persona_id = sp.sub_persona_id
     LEFT JOIN keyword_timeseries kt ON k.keyword_id = kt.keyword_id
+        AND kt.record_date = (SELECT MAX(record_date) FROM keyword_timeseries
+                              WHERE keyword_id = k.keyword_id)
     WHERE k.sub_persona_id = '3-2'
     ORDER BY kt.search_volume_total DESC
     LIMIT 5
@@ -5,15 +5,16 @@
 """
 
 import sqlite3
-from pathlib import Path
 
-DB_PATH = Path("/home/tlswk/careon/data/customers/cctv/keyword/keyword_persona.db")
+from keyword_db import DB_PATH, connect
+
 
 print("=" * 80)
 print("세부 페르소나 체계 도입 (Sub-persona Upgrade)")
 print("=" * 80)
 
-conn = sqlite3.connect(DB_PATH)
+# keyword_latest 추가(upgrade_latest_snapshot.py) 전 단계 → 스키마 확인 없이 열기
+conn = connect(check_schema=False)
 cursor = conn.cursor()
 
 # Step 1: 컬럼 추가
@@ -0,0 +1,143 @@
+"""
+네이버 키워드 엑셀 파싱 결과 캐시
+엑셀 1개 → 컬럼형 NumPy .npz 1개 (파일 내용 해시 기준)
+
+같은 data/row 파일을 스키마/라벨링 규칙 변경 때마다 다시 적재하므로,
+순수 파이썬 xlsx 파싱은 파일당 한 번만 하고 이후에는 .npz를 읽는다.
+
+- 캐시 키: 파일 내용 SHA-256 + 파서 버전
+- 해시 인덱스: (경로, mtime, 크기)가 같으면 파일을 다시 해시하지 않음
+- numpy가 없으면 캐시 없이 동작 (available() == False)
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # numpy 미설치 환경에서는 캐시 비활성화
+    np = None
+
+import keyword_db
+
+# 데이터 루트(KEYWORD_DATA_ROOT) 아래 공용 캐시 디렉터리
+CACHE_DIR = keyword_db.DATA_ROOT / "cache" / "naver_xlsx"
+
+# 적재 레코드 컬럼 (import_naver_keywords.to_record 결과)
+STR_COLUMNS = ('keyword', 'competition_level')
+INT_COLUMNS = ('search_volume_pc', 'search_volume_mobile', 'search_volume_total', 'avg_ad_count')
+FLOAT_COLUMNS = ('avg_click_pc', 'avg_click_mobile', 'avg_ctr_pc', 'avg_ctr_mobile')
+
+_INDEX_FILE = 'index.json'
+
+
+def available() -> bool:
+    """캐시 사용 가능 여부 (numpy 설치 여부)"""
+    return np is not None
+
+
+def _load_index(cache_dir: Path) -> Dict:
+    try:
+        return json.loads((cache_dir / _INDEX_FILE).read_text(encoding='utf-8'))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _atomic_write(path: Path, write):
+    """임시 파일에 쓴 뒤 rename (중단돼도 깨진 캐시가 남지 않음)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix='.tmp_')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def file_digest(path: Path, cache_dir: Path = CACHE_DIR) -> str:
+    """
+    파일 내용 SHA-256
+
+    (mtime, 크기)가 인덱스와 같으면 저장된 해시를 재사용한다.
+    """
+    stat = path.stat()
+    key = str(path.resolve())
+    index = _load_index(cache_dir)
+
+    entry = index.get(key)
+    if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+        return entry['sha256']
+
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            sha.update(block)
+    digest = sha.hexdigest()
+
+    index[key] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'sha256': digest}
+    payload = json.dumps(index, ensure_ascii=False, indent=1).encode('utf-8')
+    _atomic_write(cache_dir / _INDEX_FILE, lambda f: f.write(payload))
+
+    return digest
+
+
+def _cache_path(path: Path, parser_version: str, cache_dir: Path) -> Path:
+    return cache_dir / f"{file_digest(path, cache_dir)}_{parser_version}.npz"
+
+
+def load(path: Path, parser_version: str, cache_dir: Path = CACHE_DIR) -> Optional[tuple]:
+    """
+    캐시된 파싱 결과 조회
+
+    Returns:
+        (레코드 iterator, 건너뛴 행 수) 또는 None (캐시 없음)
+    """
+    if not available():
+        return None
+
+    cache_path = _cache_path(path, parser_version, cache_dir)
+    if not cache_path.exists():
+        return None
+
+    with np.load(cache_path, allow_pickle=False) as data:
+        columns = {name: data[name].tolist() for name in STR_COLUMNS + INT_COLUMNS + FLOAT_COLUMNS}
+        skipped = int(data['skipped'])
+
+    return _iter_records(columns), skipped
+
+
+def _iter_records(columns: Dict[str, list]) -> Iterator[Dict]:
+    names = list(columns)
+    for values in zip(*columns.values()):
+        record = dict(zip(names, values))
+        record['competition_level'] = record['competition_level'] or None
+        yield record
+
+
+def save(path: Path, parser_version: str, records: List[Dict], skipped: int = 0,
+         cache_dir: Path = CACHE_DIR):
+    """파싱 결과를 컬럼형 .npz로 저장"""
+    if not available():
+        return
+
+    arrays = {
+        name: np.array([record[name] or '' for record in records], dtype=str)
+        for name in STR_COLUMNS
+    }
+    arrays.update({
+        name: np.array([record[name] for record in records], dtype=np.int64)
+        for name in INT_COLUMNS
+    })
+    arrays.update({
+        name: np.array([record[name] for record in records], dtype=np.float64)
+        for name in FLOAT_COLUMNS
+    })
+    arrays['skipped'] = np.array(skipped, dtype=np.int64)
+
+    _atomic_write(_cache_path(path, parser_version, cache_dir), lambda f: np.savez(f, **arrays))